@@ -0,0 +1,102 @@
+# api/fields.py
+
+"""
+Related fields that resolve a whole ``many=True`` payload in one query per
+model.
+
+DRF's related fields look up every incoming value on its own, so validating
+N rows costs N queries per related field. ``BatchedListSerializer`` collects
+the values of the batched fields across all rows first and loads them with
+one ``IN`` query per model and lookup; fields that share both (say
+``assigned_to`` and ``requested_by``, both users by username) share that
+query and its results. The fields then resolve from the loaded objects.
+Outside a batch (or for a value the batch did not find) they behave exactly
+like the DRF fields they extend, including the error messages.
+"""
+
+from collections import defaultdict
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework import serializers
+
+
+class BatchedRelatedFieldMixin:
+    lookup_field = "pk"
+
+    _resolved = None
+
+    def to_internal_value(self, data):
+        if self._resolved is not None:
+            obj = self._resolved.get(str(data))
+            if obj is not None:
+                return obj
+        return super().to_internal_value(data)
+
+    def batch_key(self):
+        """Fields with equal keys are resolved by the same query."""
+        queryset = self.get_queryset()
+        return queryset.model, self.lookup_field, str(queryset.query)
+
+    def set_batch(self, resolved) -> None:
+        self._resolved = resolved
+
+
+class BatchedPrimaryKeyRelatedField(
+    BatchedRelatedFieldMixin, serializers.PrimaryKeyRelatedField
+):
+    pass
+
+
+class BatchedSlugRelatedField(BatchedRelatedFieldMixin, serializers.SlugRelatedField):
+    @property
+    def lookup_field(self):
+        return self.slug_field
+
+
+class BatchedListSerializer(serializers.ListSerializer):
+    """Primes the child's batched related fields before validating the rows."""
+
+    def batched_fields(self):
+        return [
+            field
+            for field in self.child.fields.values()
+            if isinstance(field, BatchedRelatedFieldMixin) and not field.read_only
+        ]
+
+    def to_internal_value(self, data):
+        fields = self.batched_fields() if isinstance(data, list) else []
+        rows = [row for row in data if isinstance(row, dict)] if fields else []
+        groups = defaultdict(list)
+        for field in fields:
+            groups[field.batch_key()].append(field)
+        for group in groups.values():
+            resolved = _resolve(group, rows)
+            for field in group:
+                field.set_batch(resolved)
+        try:
+            return super().to_internal_value(data)
+        finally:
+            for field in fields:
+                field.set_batch(None)
+
+
+def _resolve(fields, rows):
+    """
+    ``{str(lookup value): obj}`` for every value the rows give ``fields``,
+    loaded with one query; ``None`` if a value is malformed, so each row
+    reports its own error.
+    """
+    values = {
+        str(row[field.field_name])
+        for field in fields
+        for row in rows
+        if row.get(field.field_name) not in (None, "")
+    }
+    if not values:
+        return {}
+    field = fields[0]
+    try:
+        objs = field.get_queryset().filter(**{f"{field.lookup_field}__in": values})
+        return {str(getattr(obj, field.lookup_field)): obj for obj in objs}
+    except (TypeError, ValueError, DjangoValidationError):
+        return None
@@ -0,0 +1,142 @@
+# api/management/commands/benchmark_json.py
+
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from io import BytesIO
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api import renderers
+from api.parsers import ORJSONParser
+
+
+def _rows(count, native):
+    """
+    Rows shaped like the ``/api/assets/`` payload, nested applications
+    included. With ``native`` the dates, datetimes and decimals are left as
+    Python objects for the encoder, otherwise they are strings, as the
+    serializers return them.
+    """
+    start = datetime(2025, 1, 1, 8, 30, tzinfo=dt_timezone.utc)
+    applications = [
+        {
+            "id": i,
+            "name": name,
+            "version": f"{i}.0",
+            "slug": f"{name.lower()}-{i}",
+            "display_name": f"{name} {i}.0",
+        }
+        for i, name in enumerate(["Docker", "Grafana", "Pi-hole", "Nginx"], 1)
+    ]
+    rows = []
+    for i in range(count):
+        when = start + timedelta(minutes=i, microseconds=i % 1000)
+        purchased = date(2020, 1, 1) + timedelta(days=i % 1826)
+        values = {
+            "purchase_date": purchased,
+            "warranty_expires": purchased + timedelta(days=730),
+            "next_due_at": when + timedelta(days=7),
+            "last_activity_at": when - timedelta(hours=3),
+            "created": when - timedelta(days=90),
+            "updated": when,
+            "cost": Decimal(f"{i % 500}.{i % 100:02d}"),
+        }
+        if not native:
+            values = {
+                name: str(value) if isinstance(value, Decimal) else value.isoformat()
+                for name, value in values.items()
+            }
+        rows.append(
+            {
+                "id": i + 1,
+                "workspace": "home-lab",
+                "project": None if i % 3 else 7,
+                "name": f"Pi-{i:05d}",
+                "kind": "PI",
+                "kind_display": "Raspberry Pi",
+                "form_factor": 2,
+                "os": 3,
+                "applications": applications[: i % 5],
+                "location": "Rack 2 – shelf 3",
+                "notes": "",
+                "open_workorder_count": i % 4,
+                **values,
+            }
+        )
+    return rows
+
+
+def _best(func, repeat):
+    best, result = None, None
+    for _ in range(repeat):
+        began = perf_counter()
+        result = func()
+        elapsed = perf_counter() - began
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare DRF's JSONRenderer/JSONParser with the orjson-backed ones on "
+        "a synthetic asset export (no database access)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10_000)
+        parser.add_argument(
+            "--native",
+            action="store_true",
+            help="Leave dates, datetimes and decimals to the encoder",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=3, help="Runs per path; the best counts"
+        )
+
+    def handle(self, *args, **options):
+        if renderers.orjson is None:
+            raise CommandError("orjson is not installed; nothing to compare.")
+        data = {
+            "count": options["rows"],
+            "results": _rows(options["rows"], options["native"]),
+        }
+        repeat = options["repeat"]
+
+        timings, outputs = {}, {}
+        for name, renderer in (
+            ("JSONRenderer", JSONRenderer()),
+            ("ORJSONRenderer", renderers.ORJSONRenderer()),
+        ):
+            timings[name], outputs[name] = _best(
+                lambda: renderer.render(data, "application/json"), repeat
+            )
+            self.stdout.write(
+                f"{name:>16}: {timings[name]:8.3f}s  {len(outputs[name])} bytes"
+            )
+        if outputs["JSONRenderer"] != outputs["ORJSONRenderer"]:
+            raise CommandError("The renderers' output differs.")
+
+        body = outputs["JSONRenderer"]
+        for name, parser in (
+            ("JSONParser", JSONParser()),
+            ("ORJSONParser", ORJSONParser()),
+        ):
+            timings[name], outputs[name] = _best(
+                lambda: parser.parse(BytesIO(body), "application/json"), repeat
+            )
+            self.stdout.write(f"{name:>16}: {timings[name]:8.3f}s")
+        if outputs["JSONParser"] != outputs["ORJSONParser"]:
+            raise CommandError("The parsers' output differs.")
+
+        render = timings["JSONRenderer"] / max(timings["ORJSONRenderer"], 1e-9)
+        parse = timings["JSONParser"] / max(timings["ORJSONParser"], 1e-9)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{options['rows']} rows: rendering {render:.1f}x faster, "
+                f"parsing {parse:.1f}x faster, identical output"
+            )
+        )
@@ -0,0 +1,125 @@
+# api/management/commands/benchmark_serializers.py
+
+from datetime import timedelta
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from api.values import (ActivityInstanceValuesSerializer,
+                        AssetValuesSerializer, WorkOrderValuesSerializer)
+from api.views import ActivityInstanceViewSet, AssetViewSet, WorkOrderViewSet
+from assets.models import Application, Asset
+from core.models import Workspace
+from work.models import ActivityInstance, MaintenanceTask, WorkOrder
+
+PATHS = (
+    ("assets", AssetViewSet, AssetValuesSerializer),
+    ("work-orders", WorkOrderViewSet, WorkOrderValuesSerializer),
+    ("activities", ActivityInstanceViewSet, ActivityInstanceValuesSerializer),
+)
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the ModelSerializer and the values() list serializers on a "
+        "synthetic workspace; the rows are created in a transaction that is "
+        "rolled back"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=5_000)
+        parser.add_argument(
+            "--repeat", type=int, default=3, help="Runs per path; the best counts"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                workspace = self._populate(options["rows"])
+                for name, viewset, values_class in PATHS:
+                    self._compare(name, viewset, values_class, workspace, options)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _populate(self, count):
+        now = timezone.now()
+        workspace = Workspace.objects.create(
+            name="Serializer benchmark",
+            slug=f"serializer-benchmark-{int(now.timestamp())}",
+        )
+        apps = Application.objects.bulk_create(
+            Application(name=f"App {i}", version="1.0", slug=f"{workspace.slug}-{i}")
+            for i in range(4)
+        )
+        task = MaintenanceTask.objects.create(
+            workspace=workspace, name="Patch OS", cadence="monthly"
+        )
+        assets = Asset.objects.bulk_create(
+            Asset(workspace=workspace, name=f"Pi-{i:05d}", kind="PI")
+            for i in range(count)
+        )
+        Asset.applications.through.objects.bulk_create(
+            Asset.applications.through(asset_id=asset.pk, application_id=app.pk)
+            for i, asset in enumerate(assets)
+            for app in apps[: i % 5]
+        )
+        WorkOrder.objects.bulk_create(
+            WorkOrder(
+                workspace=workspace,
+                asset=asset,
+                task=task,
+                due=now + timedelta(days=i % 30),
+            )
+            for i, asset in enumerate(assets)
+        )
+        ActivityInstance.objects.bulk_create(
+            ActivityInstance(
+                workspace=workspace,
+                asset=asset,
+                kind="checked",
+                occurred_at=now - timedelta(minutes=i),
+            )
+            for i, asset in enumerate(assets)
+        )
+        return workspace
+
+    def _compare(self, name, viewset, values_class, workspace, options):
+        queryset = viewset.queryset.filter(workspace=workspace)
+        serializer_class = viewset.serializer_class
+
+        def model_path():
+            return serializer_class(queryset.all(), many=True).data
+
+        def values_path():
+            serializer = values_class()
+            return serializer.to_representation(serializer.values(queryset.all()))
+
+        timings, results = {}, {}
+        for path, func in (("ModelSerializer", model_path), ("values()", values_path)):
+            best = None
+            for _ in range(options["repeat"]):
+                began = perf_counter()
+                results[path] = func()
+                elapsed = perf_counter() - began
+                best = elapsed if best is None else min(best, elapsed)
+            timings[path] = best
+            rate = len(results[path]) / max(best, 1e-9)
+            self.stdout.write(
+                f"{name:>12} {path:>16}: {best:8.3f}s  {rate:10.0f} rows/s"
+            )
+
+        if results["ModelSerializer"] != results["values()"]:
+            raise CommandError(f"{name}: the serializers' output differs.")
+        speedup = timings["ModelSerializer"] / max(timings["values()"], 1e-9)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{name}: {len(results['values()'])} rows, {speedup:.1f}x faster"
+            )
+        )
@@ -0,0 +1,264 @@
+# api/pagination.py
+
+import json
+from base64 import b64decode, b64encode
+from collections import namedtuple
+from functools import cached_property
+from hashlib import md5
+from urllib import parse
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet, ValidationError
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connections
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+Cursor = namedtuple("Cursor", ["reverse", "value", "pk"])
+
+
+def planner_estimate(queryset):
+    """The row count PostgreSQL's planner expects ``queryset`` to return."""
+    plan = json.loads(queryset.explain(format="json"))
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class _LookAheadPage(Page):
+    def __init__(self, object_list, number, paginator, more):
+        super().__init__(object_list, number, paginator)
+        self.more = more
+
+    def has_next(self):
+        return self.more
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    ``Paginator`` whose ``count`` avoids a ``COUNT(*)`` over large querysets
+    (``API_COUNT_ESTIMATE_THRESHOLD`` rows or more):
+
+    - on PostgreSQL it is the planner's estimate (``EXPLAIN``), and an exact
+      count when that is below the threshold;
+    - elsewhere it is an exact count, kept in the cache for
+      ``API_COUNT_CACHE_TIMEOUT`` seconds when above the threshold.
+
+    ``count_is_estimate`` is true for an estimate or a cached count. Pages
+    then do not trust the count: each one reads a row past its end to know
+    whether there is a next page, and the last page corrects the count.
+    """
+
+    @property
+    def count(self):
+        return self._count[0]
+
+    @property
+    def count_is_estimate(self):
+        return self._count[1]
+
+    @cached_property
+    def _count(self):
+        """``(count, count_is_estimate)``."""
+        threshold = settings.API_COUNT_ESTIMATE_THRESHOLD
+        queryset = self.object_list
+        if threshold <= 0 or not isinstance(queryset, QuerySet):
+            return super().count, False
+        queryset = queryset.order_by()
+        try:
+            sql, params = queryset.query.sql_with_params()
+        except EmptyResultSet:
+            return 0, False
+        if connections[queryset.db].vendor == "postgresql":
+            estimate = planner_estimate(queryset)
+            if estimate >= threshold:
+                return estimate, True
+            return queryset.count(), False
+
+        digest = md5(
+            repr((queryset.db, sql, params)).encode(), usedforsecurity=False
+        ).hexdigest()
+        key = f"api:count:{digest}"
+        count = cache.get(key)
+        if count is not None:
+            return count, True
+        count = queryset.count()
+        if count >= threshold and settings.API_COUNT_CACHE_TIMEOUT > 0:
+            cache.set(key, count, settings.API_COUNT_CACHE_TIMEOUT)
+        return count, False
+
+    def validate_number(self, number):
+        if not self.count_is_estimate:
+            return super().validate_number(number)
+        # Past an estimate, any page may exist until it is found empty.
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages["invalid_page"])
+        if number < 1:
+            raise EmptyPage(self.error_messages["min_page"])
+        return number
+
+    def page(self, number):
+        if not self.count_is_estimate:
+            return super().page(number)
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom : bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage(self.error_messages["no_results"])
+        more = len(rows) > self.per_page
+        if not more:
+            # The last page: the count is known now.
+            self._count = (bottom + len(rows), False)
+        return _LookAheadPage(rows[: self.per_page], number, self, more)
+
+
+class EstimatedCountPagination(PageNumberPagination):
+    """
+    Page-number pagination with ``EstimatedCountPaginator``, so large lists
+    do not pay a full ``COUNT(*)`` on every page. The response says whether
+    ``count`` is exact with ``count_is_estimate``.
+    """
+
+    django_paginator_class = EstimatedCountPaginator
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "count": self.page.paginator.count,
+                "count_is_estimate": self.page.paginator.count_is_estimate,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count_is_estimate"] = {
+            "type": "boolean",
+            "example": False,
+        }
+        return response_schema
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Keyset ("seek") pagination on ``ordering = ("<field>", "id")``.
+
+    DRF's ``CursorPagination`` keys on the first field only and skips ties
+    with an OFFSET, which degrades when many rows share a value (the
+    generator creates one WorkOrder per asset with the same ``due``). Here the
+    cursor holds the full ``(value, id)`` position of the boundary row, so
+    every page is one range scan on the matching index however deep the
+    client pages, and there is no ``COUNT(*)``.
+
+    The ordering is fixed: the ``ordering`` query parameter is ignored.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        return tuple(self.ordering)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.field = queryset.model._meta.get_field(self.ordering[0].lstrip("-"))
+        self.cursor = self.decode_cursor(request)
+
+        reverse = self.cursor is not None and self.cursor.reverse
+        ordering = self._ordering(reverse)
+        queryset = queryset.order_by(*ordering)
+        if self.cursor is not None:
+            queryset = queryset.filter(self._seek(ordering[0], self.cursor))
+
+        rows = list(queryset[: self.page_size + 1])
+        self.page = rows[: self.page_size]
+        more = len(rows) > self.page_size
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, more
+        else:
+            self.has_next = more
+            self.has_previous = self.cursor is not None and bool(self.page)
+
+        self.display_page_controls = self.has_next or self.has_previous
+        return self.page
+
+    def _ordering(self, reverse):
+        if not reverse:
+            return tuple(self.ordering)
+        return tuple(
+            name[1:] if name.startswith("-") else f"-{name}" for name in self.ordering
+        )
+
+    def _seek(self, order, cursor):
+        """
+        Rows strictly after ``cursor`` in ``order``. For a descending order
+        this is ``field <= v AND (field < v OR id < pk)``: the redundant
+        first term gives the database a range bound on the indexed column.
+        """
+        op = "lt" if order.startswith("-") else "gt"
+        field = self.field.name
+        return Q(**{f"{field}__{op}e": cursor.value}) & (
+            Q(**{f"{field}__{op}": cursor.value}) | Q(**{f"pk__{op}": cursor.pk})
+        )
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            # Stepped back past the first row: "next" is the first page.
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            querystring = b64decode(encoded.encode("ascii")).decode("ascii")
+            tokens = dict(parse.parse_qsl(querystring, keep_blank_values=True))
+            value = self.field.to_python(tokens["v"])
+            pk = int(tokens["i"])
+        except (KeyError, TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        if value is None:
+            raise NotFound(self.invalid_cursor_message)
+        return Cursor(reverse=tokens.get("r") == "1", value=value, pk=pk)
+
+    def encode_cursor(self, instance, reverse):
+        if isinstance(instance, dict):
+            # A values() row (see api.values).
+            value, pk = instance[self.field.attname], instance["id"]
+            value = "" if value is None else value.isoformat()
+        else:
+            value, pk = self.field.value_to_string(instance), instance.pk
+        tokens = {"v": value, "i": pk}
+        if reverse:
+            tokens["r"] = "1"
+        querystring = parse.urlencode(tokens)
+        encoded = b64encode(querystring.encode("ascii")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+
+class WorkOrderCursorPagination(KeysetPagination):
+    ordering = ("-due", "-id")
+
+
+class ActivityInstanceCursorPagination(KeysetPagination):
+    ordering = ("-occurred_at", "-id")
+
+
+class ChangeFeedPagination(KeysetPagination):
+    """Oldest change first, so rows changed while paging come up again later."""
+
+    ordering = ("updated", "id")
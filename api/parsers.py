@@ -0,0 +1,33 @@
+# api/parsers.py
+
+from io import BytesIO
+
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+class ORJSONParser(JSONParser):
+    """
+    ``JSONParser`` backed by orjson, for large bodies such as bulk writes.
+
+    A body orjson rejects (malformed JSON, integers beyond 64 bits) is
+    parsed again by ``JSONParser``, so errors and edge cases come out
+    exactly as before. Without orjson, or for a charset other than UTF-8,
+    this is ``JSONParser``.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace("-", "") != "utf8":
+            return super().parse(stream, media_type, parser_context)
+        body = stream.read()
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return super().parse(BytesIO(body), media_type, parser_context)
@@ -2,7 +2,7 @@
 
 from rest_framework import permissions
 
-from core.models import Membership
+from .roles import get_roles
 
 
 class IsAuthenticatedReadOnlyOrManager(permissions.BasePermission):
@@ -26,7 +26,7 @@ class IsAuthenticatedReadOnlyOrManager(permissions.BasePermission):
 
         # For any write at all (including POST),
         # require staff or maintenance_manager.
-        return user.is_staff or self._in_maintenance_manager_group(user)
+        return user.is_staff or get_roles(request).is_maintenance_manager
 
     def has_object_permission(self, request, view, obj):
         user = request.user
@@ -39,7 +39,8 @@ class IsAuthenticatedReadOnlyOrManager(permissions.BasePermission):
             return True
 
         # Staff or maintenance_manager can always write
-        if user.is_staff or self._in_maintenance_manager_group(user):
+        roles = get_roles(request)
+        if user.is_staff or roles.is_maintenance_manager:
             return True
 
         # OPTIONAL object-level: require manager/admin role in the workspace
@@ -48,15 +49,7 @@ class IsAuthenticatedReadOnlyOrManager(permissions.BasePermission):
             # If we cannot resolve workspace, default to deny for non-staff
             return False
 
-        return Membership.objects.filter(
-            user=user,
-            workspace=workspace,
-            role__in=["manager", "admin"],
-        ).exists()
-
-    @staticmethod
-    def _in_maintenance_manager_group(user):
-        return user.groups.filter(name="maintenance_manager").exists()
+        return roles.can_write(workspace.pk)
 
     @staticmethod
     def _get_workspace_from_obj(obj):
@@ -0,0 +1,96 @@
+# api/planning.py
+
+"""
+What a serializer's output reads from the database, so querysets can load
+exactly that: the ``only()`` columns, the ``select_related()`` joins and the
+``prefetch_related()`` lookups.
+
+Used by the sparse fieldsets (``?fields=``/``?expand=``, see
+``api.views.SparseFieldsetMixin``) and by ``api.values`` for the related
+objects it loads.
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+
+class QueryPlan:
+    """
+    ``columns`` is ``None`` when a field reads something other than a model
+    column or relation (a method field, ``__str__``); the row is then loaded
+    whole.
+    """
+
+    __slots__ = ("columns", "joins", "prefetches")
+
+    def __init__(self):
+        self.columns = set()
+        self.joins = set()
+        self.prefetches = set()
+
+    def apply(self, queryset, extra_columns=()):
+        queryset = queryset.select_related(None).prefetch_related(None)
+        if self.joins:
+            queryset = queryset.select_related(*sorted(self.joins))
+        if self.prefetches:
+            queryset = queryset.prefetch_related(*sorted(self.prefetches))
+        if self.columns is not None:
+            queryset = queryset.only(*sorted(self.columns | set(extra_columns)))
+        return queryset
+
+
+def _is_column(model, name):
+    try:
+        return model._meta.get_field(name).concrete
+    except FieldDoesNotExist:
+        return False
+
+
+def query_plan(serializer, prefix=""):
+    """
+    The plan of ``serializer``'s readable fields. Nested serializers add
+    their relation and its own joins and prefetches; their columns are not
+    restricted.
+    """
+    plan = QueryPlan()
+    model = serializer.Meta.model
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        source = field.source.replace(".", "__")
+        path = f"{prefix}{source}"
+        if isinstance(field, serializers.ListSerializer):
+            plan.prefetches.add(path)
+            _merge_relations(
+                plan, query_plan(field.child, f"{path}__"), as_prefetch=True
+            )
+            continue
+        if isinstance(field, serializers.BaseSerializer):
+            plan.joins.add(path)
+            _merge_relations(plan, query_plan(field, f"{path}__"))
+        elif isinstance(field, serializers.SlugRelatedField):
+            plan.joins.add(path)
+            _add_column(plan, f"{path}__{field.slug_field}")
+        elif isinstance(field, serializers.RelatedField):
+            pass
+        elif source.startswith("get_") and source.endswith("_display"):
+            path = f"{prefix}{source[len('get_') : -len('_display')]}"
+        elif not _is_column(model, source):
+            plan.columns = None
+            continue
+        _add_column(plan, path)
+    return plan
+
+
+def _add_column(plan, name):
+    if plan.columns is not None:
+        plan.columns.add(name)
+
+
+def _merge_relations(plan, nested, as_prefetch=False):
+    """Follow the relations of a nested serializer from ``plan``."""
+    if as_prefetch:
+        plan.prefetches |= nested.joins | nested.prefetches
+    else:
+        plan.joins |= nested.joins
+        plan.prefetches |= nested.prefetches
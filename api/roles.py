@@ -0,0 +1,87 @@
+# api/roles.py
+
+"""
+Role resolution for the API: a user's auth groups and workspace memberships.
+
+``get_roles(request)`` loads them once per request (two small queries) and is
+shared by ``IsAuthenticatedReadOnlyOrManager`` and the workspace-scoped
+viewsets. With ``API_ROLES_CACHE_TIMEOUT`` > 0 the roles are also kept in the
+default cache (Redis in production) across requests; ``api.signals`` drops a
+user's entry whenever their memberships or groups change, both at once and
+when the change commits, so a concurrent request cannot keep the old roles.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from core.models import Membership
+
+MAINTENANCE_MANAGER_GROUP = "maintenance_manager"
+# Workspace roles allowed to write objects of their workspace.
+WRITE_ROLES = ("manager", "admin")
+
+
+class UserRoles:
+    """Group names and ``{workspace_id: role}`` of one user."""
+
+    __slots__ = ("groups", "workspaces")
+
+    def __init__(self, groups=(), workspaces=()):
+        self.groups = frozenset(groups)
+        self.workspaces = dict(workspaces)
+
+    @property
+    def is_maintenance_manager(self) -> bool:
+        return MAINTENANCE_MANAGER_GROUP in self.groups
+
+    @property
+    def workspace_ids(self) -> list:
+        return sorted(self.workspaces)
+
+    def can_write(self, workspace_id) -> bool:
+        return self.workspaces.get(workspace_id) in WRITE_ROLES
+
+
+def cache_key(user_id) -> str:
+    return f"api:roles:{user_id}"
+
+
+def load_roles(user) -> UserRoles:
+    """Read the roles of ``user`` from the database."""
+    return UserRoles(
+        user.groups.values_list("name", flat=True),
+        Membership.objects.filter(user=user).values_list("workspace_id", "role"),
+    )
+
+
+def _cached_roles(user) -> UserRoles:
+    timeout = settings.API_ROLES_CACHE_TIMEOUT
+    if timeout <= 0:
+        return load_roles(user)
+    key = cache_key(user.pk)
+    roles = cache.get(key)
+    if roles is None:
+        roles = load_roles(user)
+        cache.set(key, roles, timeout)
+    return roles
+
+
+def get_roles(request) -> UserRoles:
+    """Roles of the authenticated ``request.user``, memoized on the request."""
+    roles = getattr(request, "_user_roles", None)
+    if roles is None:
+        roles = request._user_roles = _cached_roles(request.user)
+    return roles
+
+
+def invalidate_roles(user_ids) -> None:
+    """
+    Drop the cached roles of ``user_ids`` now and again once the transaction
+    commits: a request that loads the old roles in between would otherwise
+    cache them until ``API_ROLES_CACHE_TIMEOUT``.
+    """
+    keys = [cache_key(pk) for pk in set(user_ids) if pk is not None]
+    if keys:
+        cache.delete_many(keys)
+        transaction.on_commit(lambda: cache.delete_many(keys))
@@ -1,15 +1,44 @@
 # api/serializers.py
 
+from functools import cached_property
+
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
+from rest_framework.validators import UniqueTogetherValidator
 
 from assets.models import OS, Application, Asset, FormFactor, Project
 from core.models import Membership, Workspace
 from work.models import ActivityInstance, MaintenanceTask, WorkOrder
 
+from .fields import (BatchedListSerializer, BatchedPrimaryKeyRelatedField,
+                     BatchedSlugRelatedField)
+
 User = get_user_model()
 
 
+class SparseFieldsMixin:
+    """
+    Sparse fieldset keyword arguments (``?fields=``/``?expand=``, see
+    ``api.views.SparseFieldsetMixin``):
+
+    - ``fields``: the names to keep; the others are dropped;
+    - ``expand``: names from ``expandable_fields`` to render as the related
+      object, with the given serializer, instead of its id; they are kept
+      whatever ``fields`` says. Expanded fields are read-only, so this is for
+      reads only.
+    """
+
+    expandable_fields = {}
+
+    def __init__(self, *args, fields=None, expand=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        for name in expand:
+            self.fields[name] = self.expandable_fields[name](read_only=True)
+        if fields is not None:
+            for name in set(self.fields) - set(fields) - set(expand):
+                del self.fields[name]
+
+
 # ---------- Core ----------
 
 
@@ -67,7 +96,13 @@ class ProjectSerializer(serializers.ModelSerializer):
         fields = ["id", "workspace", "name", "description", "slug"]
 
 
-class AssetSerializer(serializers.ModelSerializer):
+class AssetSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        "os": OSSerializer,
+        "form_factor": FormFactorSerializer,
+        "project": ProjectSerializer,
+    }
+
     workspace = serializers.SlugRelatedField(
         slug_field="slug", queryset=Workspace.objects.all()
     )
@@ -106,13 +141,122 @@ class AssetSerializer(serializers.ModelSerializer):
             "purchase_date",
             "warranty_expires",
             "notes",
+            "next_due_at",
+            "open_workorder_count",
+            "last_activity_at",
+            "created",
+            "updated",
+        ]
+
+
+# ---------- Bulk ----------
+
+
+class BulkListSerializer(BatchedListSerializer):
+    """
+    ``many=True`` writes in one statement: ``create`` uses ``bulk_create``;
+    ``update`` takes the existing objects as ``instance`` and rows that carry
+    the ``id`` they change, and uses ``bulk_update`` on the union of the
+    changed fields. Callers wrap ``save()`` in a transaction.
+
+    On create, the child's unique-together checks (one query per row) are
+    replaced by one query per constraint over the whole payload, which also
+    catches duplicates within the payload.
+    """
+
+    def to_internal_value(self, data):
+        self.deferred_unique = []
+        if self.instance is None:
+            validators = self.child.validators
+            self.deferred_unique = [
+                v
+                for v in validators
+                if isinstance(v, UniqueTogetherValidator) and v.condition is None
+            ]
+            self.child.validators = [
+                v for v in validators if v not in self.deferred_unique
+            ]
+        return super().to_internal_value(data)
+
+    def validate(self, attrs):
+        errors = {}
+        for validator in self.deferred_unique:
+            message = validator.message.format(field_names=", ".join(validator.fields))
+            for index in self._unique_conflicts(validator, attrs):
+                errors[index] = {"non_field_errors": [message]}
+        if errors:
+            raise serializers.ValidationError(errors, code="unique")
+        return attrs
+
+    def _unique_conflicts(self, validator, rows):
+        """Indexes of rows that clash with the database or an earlier row."""
+        sources = [self.child.fields[name].source for name in validator.fields]
+        keys = [
+            tuple(getattr(row.get(s), "pk", row.get(s)) for s in sources)
+            for row in rows
         ]
+        lookups = {
+            f"{source}__in": {key[i] for key in keys}
+            for i, source in enumerate(sources)
+        }
+        seen = set(validator.queryset.filter(**lookups).values_list(*sources))
+        conflicts = []
+        for index, key in enumerate(keys):
+            if None in key:
+                continue
+            if key in seen:
+                conflicts.append(index)
+            seen.add(key)
+        return conflicts
+
+    def run_child_validation(self, data):
+        if self.instance is None:
+            return super().run_child_validation(data)
+        key = str(data.get("id")) if isinstance(data, dict) else None
+        instance = self.instance_map.get(key)
+        if instance is None:
+            raise serializers.ValidationError({"id": ["Unknown or missing id."]})
+        self.child.instance = instance
+        self.child.initial_data = data
+        try:
+            return super().run_child_validation(data)
+        finally:
+            self.child.instance = None
+
+    @cached_property
+    def instance_map(self):
+        return {str(obj.pk): obj for obj in self.instance}
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        return model.objects.bulk_create([model(**attrs) for attrs in validated_data])
+
+    def update(self, instance, validated_data):
+        # save() runs only when every row validated, so rows and
+        # validated_data line up one to one.
+        objs, fields = {}, set()
+        for row, attrs in zip(self.initial_data, validated_data):
+            obj = self.instance_map[str(row["id"])]
+            for name, value in attrs.items():
+                setattr(obj, name, value)
+            objs[obj.pk] = obj
+            fields.update(attrs)
+        if fields:
+            model = self.child.Meta.model
+            # bulk_update() skips auto_now; stamp those fields like save() does.
+            for field in model._meta.concrete_fields:
+                if getattr(field, "auto_now", False):
+                    for obj in objs.values():
+                        field.pre_save(obj, add=False)
+                    fields.add(field.name)
+            model.objects.bulk_update(objs.values(), sorted(fields))
+        return list(objs.values())
 
 
 # ---------- Work ----------
 
 
-class MaintenanceTaskSerializer(serializers.ModelSerializer):
+class MaintenanceTaskSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     workspace = serializers.SlugRelatedField(
         slug_field="slug", queryset=Workspace.objects.all()
     )
@@ -126,20 +270,24 @@ class MaintenanceTaskSerializer(serializers.ModelSerializer):
             "cadence",
             "description",
             "threshold_json",
+            "created",
+            "updated",
         ]
 
 
-class WorkOrderSerializer(serializers.ModelSerializer):
-    workspace = serializers.SlugRelatedField(
+class WorkOrderSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    workspace = BatchedSlugRelatedField(
         slug_field="slug", queryset=Workspace.objects.all()
     )
-    assigned_to = serializers.SlugRelatedField(
+    asset = BatchedPrimaryKeyRelatedField(queryset=Asset.objects.all())
+    task = BatchedPrimaryKeyRelatedField(queryset=MaintenanceTask.objects.all())
+    assigned_to = BatchedSlugRelatedField(
         slug_field="username",
         queryset=User.objects.all(),
         allow_null=True,
         required=False,
     )
-    requested_by = serializers.SlugRelatedField(
+    requested_by = BatchedSlugRelatedField(
         slug_field="username",
         queryset=User.objects.all(),
         allow_null=True,
@@ -148,6 +296,7 @@ class WorkOrderSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = WorkOrder
+        list_serializer_class = BulkListSerializer
         fields = [
             "id",
             "workspace",
@@ -157,14 +306,20 @@ class WorkOrderSerializer(serializers.ModelSerializer):
             "status",
             "assigned_to",
             "requested_by",
+            "created",
+            "updated",
         ]
 
 
-class ActivityInstanceSerializer(serializers.ModelSerializer):
-    workspace = serializers.SlugRelatedField(
+class ActivityInstanceSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    workspace = BatchedSlugRelatedField(
         slug_field="slug", queryset=Workspace.objects.all()
     )
-    performed_by = serializers.SlugRelatedField(
+    work_order = BatchedPrimaryKeyRelatedField(
+        queryset=WorkOrder.objects.all(), allow_null=True, required=False
+    )
+    asset = BatchedPrimaryKeyRelatedField(queryset=Asset.objects.all())
+    performed_by = BatchedSlugRelatedField(
         slug_field="username",
         queryset=User.objects.all(),
         allow_null=True,
@@ -173,6 +328,7 @@ class ActivityInstanceSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = ActivityInstance
+        list_serializer_class = BulkListSerializer
         fields = [
             "id",
             "workspace",
@@ -182,4 +338,6 @@ class ActivityInstanceSerializer(serializers.ModelSerializer):
             "note",
             "occurred_at",
             "performed_by",
+            "created",
+            "updated",
         ]
@@ -0,0 +1,85 @@
+# api/signals.py
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete, pre_save)
+
+from core.models import Membership
+
+from .roles import invalidate_roles
+
+
+def remember_previous_user(sender, instance, raw=False, **kwargs) -> None:
+    """
+    Before an existing Membership is saved, note the user it belonged to, so
+    moving it to another user also drops the old user's cached roles.
+    """
+    if raw or instance.pk is None:
+        return
+    instance._previous_user_id = (
+        sender.objects.filter(pk=instance.pk).values_list("user_id", flat=True).first()
+    )
+
+
+def invalidate_membership_roles(sender, instance, **kwargs) -> None:
+    previous = getattr(instance, "_previous_user_id", None)
+    invalidate_roles({instance.user_id, previous})
+
+
+def invalidate_group_roles(sender, instance, created=False, **kwargs) -> None:
+    """A renamed or deleted Group changes the roles of all its members."""
+    if created:
+        return
+    invalidate_roles(instance.user_set.values_list("pk", flat=True))
+
+
+def invalidate_user_group_roles(
+    sender, instance, action, reverse, pk_set, **kwargs
+) -> None:
+    """
+    ``user.groups`` changed. From the user side ``instance`` is the user; from
+    the group side (``reverse``) ``pk_set`` holds the user ids, except for a
+    clear, where the members are read before they are removed.
+    """
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if not reverse:
+        invalidate_roles({instance.pk})
+    elif action == "pre_clear":
+        invalidate_roles(instance.user_set.values_list("pk", flat=True))
+    else:
+        invalidate_roles(pk_set)
+
+
+def connect_signals():
+    pre_save.connect(
+        remember_previous_user,
+        sender=Membership,
+        dispatch_uid="membership_remember_previous_user",
+    )
+    post_save.connect(
+        invalidate_membership_roles,
+        sender=Membership,
+        dispatch_uid="membership_invalidate_roles_on_save",
+    )
+    post_delete.connect(
+        invalidate_membership_roles,
+        sender=Membership,
+        dispatch_uid="membership_invalidate_roles_on_delete",
+    )
+    post_save.connect(
+        invalidate_group_roles,
+        sender=Group,
+        dispatch_uid="group_invalidate_roles_on_save",
+    )
+    pre_delete.connect(
+        invalidate_group_roles,
+        sender=Group,
+        dispatch_uid="group_invalidate_roles_on_delete",
+    )
+    m2m_changed.connect(
+        invalidate_user_group_roles,
+        sender=get_user_model().groups.through,
+        dispatch_uid="user_groups_invalidate_roles",
+    )
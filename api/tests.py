@@ -1,18 +1,48 @@
 # api/tests.py
 
-from datetime import timedelta
+import csv
+import json
+from collections import Counter
+from datetime import date, datetime, time, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from io import BytesIO, StringIO
+from unittest import skipIf, skipUnless
+from unittest.mock import ANY
+from urllib.parse import quote
+from uuid import UUID
+from zoneinfo import ZoneInfo
 
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
-from django.test import TestCase
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.core.paginator import EmptyPage
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
+from django.utils.translation import gettext_lazy
 from rest_framework import status
-from rest_framework.test import APIClient
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient, APIRequestFactory
 
 from assets.models import OS, Application, Asset, FormFactor, Project
-from core.models import Membership, Workspace
+from core.models import Membership, Tombstone, Workspace
 from work.models import ActivityInstance, MaintenanceTask, WorkOrder
 
+from . import renderers, roles
+from .pagination import EstimatedCountPaginator
+from .parsers import ORJSONParser
+from .renderers import ORJSONRenderer
+from .serializers import AssetSerializer, OSSerializer
+from .values import ValuesSerializer
+from .views import (ActivityInstanceViewSet, AssetViewSet, WorkOrderViewSet,
+                    WorkspaceViewSet)
+
 User = get_user_model()
 
 
@@ -187,6 +217,30 @@ class AssetAPITest(APITestSetup):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(response.data["name"], "New Asset")
 
+    def test_asset_exposes_read_only_work_rollups(self):
+        """Assets carry rollups of their work orders that clients cannot set."""
+        task = MaintenanceTask.objects.create(
+            workspace=self.workspace1, name="Patch", cadence="monthly"
+        )
+        due = timezone.now() + timedelta(days=2)
+        WorkOrder.objects.create(
+            workspace=self.workspace1, asset=self.asset, task=task, due=due
+        )
+
+        self.client.force_authenticate(user=self.viewer_user)
+        response = self.client.get("/api/assets/?open_workorder_count__gte=1")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["open_workorder_count"], 1)
+        self.assertIsNotNone(response.data["results"][0]["next_due_at"])
+
+        self.client.force_authenticate(user=self.manager_user)
+        response = self.client.patch(
+            f"/api/assets/{self.asset.id}/", {"open_workorder_count": 99}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["open_workorder_count"], 1)
+
 
 class WorkOrderAPITest(APITestSetup):
     """Tests for WorkOrder API endpoints."""
@@ -253,6 +307,54 @@ class WorkOrderAPITest(APITestSetup):
             response.data["results"][0]["due"], response.data["results"][1]["due"]
         )
 
+    def _walk(self, url):
+        """Follow ``next`` links from ``url``; returns the ids page by page."""
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", response.data)
+            pages.append([row["id"] for row in response.data["results"]])
+            url = response.data["next"]
+        return pages, response
+
+    def test_cursor_pagination_walks_ties_in_due_id_order(self):
+        """Cursor pages follow (-due, -id) even when many rows share a due."""
+        due = self.work_order.due
+        for i in range(44):
+            asset = Asset.objects.create(
+                workspace=self.workspace1, name=f"Pi-{i:03d}", kind="PI"
+            )
+            WorkOrder.objects.create(
+                workspace=self.workspace1,
+                asset=asset,
+                task=self.task,
+                due=due if i % 2 else due - timedelta(days=i),
+            )
+        expected = list(
+            WorkOrder.objects.order_by("-due", "-id").values_list("id", flat=True)
+        )
+        self.client.force_authenticate(user=self.viewer_user)
+
+        pages, last = self._walk("/api/work-orders/?pagination=cursor&ordering=status")
+
+        self.assertEqual([len(page) for page in pages], [20, 20, 5])
+        self.assertEqual(sum(pages, []), expected)
+        previous = self.client.get(last.data["previous"])
+        self.assertEqual([r["id"] for r in previous.data["results"]], pages[1])
+        first = self.client.get(previous.data["previous"])
+        self.assertEqual([r["id"] for r in first.data["results"]], pages[0])
+        self.assertIsNone(first.data["previous"])
+
+    def test_cursor_pagination_is_opt_in_and_rejects_bad_cursors(self):
+        """Page numbers stay the default; a malformed cursor is a 404."""
+        self.client.force_authenticate(user=self.viewer_user)
+        response = self.client.get("/api/work-orders/")
+        self.assertEqual(response.data["count"], 1)
+
+        response = self.client.get("/api/work-orders/?cursor=bm9wZQ==")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
 
 class ActivityInstanceAPITest(APITestSetup):
     """Tests for ActivityInstance API endpoints."""
@@ -311,6 +413,25 @@ class ActivityInstanceAPITest(APITestSetup):
             response.data["results"][1]["occurred_at"],
         )
 
+    def test_activities_cursor_pagination(self):
+        """Activities page by (-occurred_at, -id) with ?pagination=cursor."""
+        for days in range(25):
+            ActivityInstance.objects.create(
+                workspace=self.workspace1,
+                asset=self.asset,
+                kind="patched",
+                occurred_at=self.activity.occurred_at - timedelta(days=days % 3),
+            )
+        self.client.force_authenticate(user=self.viewer_user)
+
+        first = self.client.get("/api/activities/?pagination=cursor")
+        second = self.client.get(first.data["next"])
+
+        ids = [r["id"] for r in first.data["results"] + second.data["results"]]
+        expected = ActivityInstance.objects.order_by("-occurred_at", "-id")
+        self.assertEqual(ids, list(expected.values_list("id", flat=True)))
+        self.assertIsNone(second.data["next"])
+
 
 class ThrottlingTest(APITestSetup):
     """Tests for API throttling."""
@@ -334,3 +455,1163 @@ class PermissionsTest(APITestSetup):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         # Should return empty results
         self.assertEqual(len(response.data["results"]), 0)
+
+
+class MembershipScopingTest(APITestSetup):
+    """Membership scoping filters by a workspace-id subquery, not a JOIN."""
+
+    def _scoped_queryset(self, viewset_class):
+        request = APIRequestFactory().get("/")
+        request.user = self.viewer_user
+        queryset = viewset_class(request=request).get_queryset()
+        return queryset.order_by(*viewset_class.ordering)
+
+    def test_list_endpoints_issue_no_distinct(self):
+        """Scoped list endpoints never need SELECT DISTINCT."""
+        self.client.force_authenticate(user=self.viewer_user)
+        for url in ("/api/workspaces/", "/api/assets/", "/api/work-orders/"):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            for query in ctx.captured_queries:
+                self.assertNotIn("DISTINCT", query["sql"])
+
+    def test_scoped_plans_skip_memberships_and_distinct(self):
+        """Plans filter on the workspace ids alone and never sort for DISTINCT."""
+        if connection.vendor != "sqlite":
+            self.skipTest("query plans checked on SQLite only")
+        for viewset_class in (AssetViewSet, WorkOrderViewSet, WorkspaceViewSet):
+            plan = self._scoped_queryset(viewset_class).explain()
+            self.assertNotIn("DISTINCT", plan)
+            self.assertNotIn("core_membership", plan)
+
+    def test_membership_in_several_workspaces_lists_each_row_once(self):
+        """Being a member of two workspaces does not duplicate rows."""
+        Membership.objects.create(
+            user=self.viewer_user, workspace=self.workspace2, role="viewer"
+        )
+        for workspace in (self.workspace1, self.workspace2):
+            Asset.objects.create(workspace=workspace, name="Pi", kind="PI")
+        self.client.force_authenticate(user=self.viewer_user)
+
+        response = self.client.get("/api/assets/")
+
+        self.assertEqual(response.data["count"], 2)
+        workspaces = self.client.get("/api/workspaces/")
+        self.assertEqual(workspaces.data["count"], 2)
+
+
+class RoleResolutionTest(APITestSetup):
+    """Groups and memberships are loaded once per request and cached."""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.asset = Asset.objects.create(
+            workspace=self.workspace1, name="Pi-001", kind="PI"
+        )
+
+    def _role_queries(self, method, url, **kwargs):
+        with CaptureQueriesContext(connection) as ctx:
+            response = getattr(self.client, method)(url, **kwargs)
+        sql = [query["sql"] for query in ctx.captured_queries]
+        groups = sum('"auth_group"' in q for q in sql)
+        memberships = sum('"core_membership"' in q for q in sql)
+        return response, groups, memberships
+
+    def test_write_resolves_roles_once_per_request(self):
+        """Permission checks and scoping share one groups/memberships load."""
+        self.client.force_authenticate(user=self.manager_user)
+
+        response, groups, memberships = self._role_queries(
+            "patch", f"/api/assets/{self.asset.id}/", data={"notes": "x"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((groups, memberships), (1, 1))
+
+    @override_settings(API_ROLES_CACHE_TIMEOUT=300)
+    def test_roles_are_cached_until_memberships_change(self):
+        """A new membership is visible on the very next request."""
+        self.client.force_authenticate(user=self.viewer_user)
+        self._role_queries("get", "/api/workspaces/")
+
+        response, groups, memberships = self._role_queries("get", "/api/workspaces/")
+        self.assertEqual((groups, memberships), (0, 0))
+        self.assertEqual(response.data["count"], 1)
+
+        Membership.objects.create(
+            user=self.viewer_user, workspace=self.workspace2, role="viewer"
+        )
+        response, _, memberships = self._role_queries("get", "/api/workspaces/")
+        self.assertEqual(memberships, 1)
+        self.assertEqual(response.data["count"], 2)
+
+        Membership.objects.filter(user=self.viewer_user).delete()
+        response = self.client.get("/api/workspaces/")
+        self.assertEqual(response.data["count"], 0)
+
+    @override_settings(API_ROLES_CACHE_TIMEOUT=300)
+    def test_roles_loaded_before_the_commit_are_dropped_by_it(self):
+        """Roles cached by a concurrent request mid-transaction do not survive."""
+        self.client.force_authenticate(user=self.viewer_user)
+        self.client.get("/api/workspaces/")
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            Membership.objects.filter(user=self.viewer_user).delete()
+            # A concurrent request still sees the old rows and re-caches them.
+            cache.set(
+                roles.cache_key(self.viewer_user.pk),
+                roles.UserRoles(workspaces=[(self.workspace1.pk, "viewer")]),
+            )
+
+        self.assertEqual(len(callbacks), 1)
+        response = self.client.get("/api/workspaces/")
+        self.assertEqual(response.data["count"], 0)
+
+    @override_settings(API_ROLES_CACHE_TIMEOUT=300)
+    def test_group_changes_invalidate_cached_roles(self):
+        """Group membership changes from either side revoke write access."""
+        self.client.force_authenticate(user=self.manager_user)
+        url = f"/api/assets/{self.asset.id}/"
+        self.assertEqual(self.client.patch(url, {"notes": "a"}).status_code, 200)
+
+        self.manager_user.groups.remove(self.maintenance_manager_group)
+        self.assertEqual(self.client.patch(url, {"notes": "b"}).status_code, 403)
+
+        self.maintenance_manager_group.user_set.add(self.manager_user)
+        self.assertEqual(self.client.patch(url, {"notes": "c"}).status_code, 200)
+
+        self.maintenance_manager_group.user_set.clear()
+        self.assertEqual(self.client.patch(url, {"notes": "d"}).status_code, 403)
+
+
+class BulkWriteTest(APITestSetup):
+    """Bulk endpoints validate every row, then write in one transaction."""
+
+    def setUp(self):
+        super().setUp()
+        self.assets = [
+            Asset.objects.create(workspace=self.workspace1, name=f"Pi-{i}", kind="PI")
+            for i in range(3)
+        ]
+        self.task = MaintenanceTask.objects.create(
+            workspace=self.workspace1, name="Patch OS", cadence="monthly"
+        )
+        self.now = timezone.now()
+        self.client.force_authenticate(user=self.manager_user)
+
+    def _activities(self, n):
+        return [
+            {
+                "workspace": "ws1",
+                "asset": self.assets[i % 3].id,
+                "kind": "patched",
+                "occurred_at": (self.now - timedelta(minutes=i)).isoformat(),
+                "performed_by": "manager_user",
+            }
+            for i in range(n)
+        ]
+
+    def _orders(self, n):
+        return WorkOrder.objects.bulk_create(
+            WorkOrder(
+                workspace=self.workspace1,
+                asset=self.assets[i % 3],
+                task=self.task,
+                due=self.now + timedelta(days=i),
+            )
+            for i in range(n)
+        )
+
+    def test_bulk_create_activities_costs_the_same_for_any_row_count(self):
+        """Query count does not grow with the number of rows."""
+        counts = []
+        for n in (3, 30):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.post(
+                    "/api/activities/bulk/", self._activities(n), format="json"
+                )
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            self.assertEqual(len(response.data), n)
+            counts.append(len(ctx.captured_queries))
+
+        self.assertEqual(counts[0], counts[1])
+        self.assertEqual(ActivityInstance.objects.count(), 33)
+        self.assets[0].refresh_from_db()
+        self.assertEqual(self.assets[0].last_activity_at, self.now)
+
+    def test_bulk_create_is_all_or_nothing(self):
+        """One invalid row rejects the whole batch, keyed by row index."""
+        rows = self._activities(3)
+        rows[1]["kind"] = "nope"
+        rows[2]["performed_by"] = "nobody"
+
+        response = self.client.post("/api/activities/bulk/", rows, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(response.data), {1, 2})
+        self.assertIn("kind", response.data[1])
+        self.assertIn("performed_by", response.data[2])
+        self.assertFalse(ActivityInstance.objects.exists())
+
+    def test_bulk_update_work_orders(self):
+        """PATCH applies partial updates by id and refreshes asset rollups."""
+        orders = self._orders(6)
+        rows = [{"id": order.id, "status": "done"} for order in orders[:5]]
+        rows[0]["assigned_to"] = "viewer_user"
+
+        response = self.client.patch("/api/work-orders/bulk/", rows, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(WorkOrder.objects.filter(status="done").count(), 5)
+        orders[0].refresh_from_db()
+        self.assertEqual(orders[0].assigned_to, self.viewer_user)
+        open_counts = Asset.objects.order_by("id").values_list(
+            "open_workorder_count", flat=True
+        )
+        self.assertEqual(list(open_counts), [0, 0, 1])
+
+    def test_bulk_update_needs_visible_ids(self):
+        """Unknown ids and rows of other workspaces are a 404; nothing changes."""
+        order = self._orders(1)[0]
+        other = WorkOrder.objects.create(
+            workspace=self.workspace2,
+            asset=Asset.objects.create(workspace=self.workspace2, name="x", kind="PI"),
+            task=MaintenanceTask.objects.create(
+                workspace=self.workspace2, name="Patch OS", cadence="monthly"
+            ),
+            due=self.now,
+        )
+        rows = [{"id": order.id, "status": "done"}, {"id": other.id, "status": "done"}]
+
+        response = self.client.patch("/api/work-orders/bulk/", rows, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(WorkOrder.objects.filter(status="done").exists())
+
+    def test_bulk_delete(self):
+        """DELETE removes the listed ids."""
+        orders = self._orders(4)
+        ids = [order.id for order in orders[:3]]
+
+        response = self.client.delete(
+            "/api/work-orders/bulk/", {"ids": ids}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(
+            list(WorkOrder.objects.values_list("id", flat=True)), [orders[3].id]
+        )
+
+    def test_bulk_delete_refreshes_rollups_once(self):
+        """The query count does not grow with the number of ids."""
+        for n in (3, 30):
+            ids = [order.id for order in self._orders(n)]
+            with self.assertNumQueries(10):
+                response = self.client.delete(
+                    "/api/work-orders/bulk/", {"ids": ids}, format="json"
+                )
+            self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(
+            sorted(Asset.objects.values_list("open_workorder_count", flat=True)),
+            [0, 0, 0],
+        )
+
+    def test_viewer_cannot_bulk_write(self):
+        """Bulk writes need the same rights as single writes."""
+        self.client.force_authenticate(user=self.viewer_user)
+
+        response = self.client.post(
+            "/api/activities/bulk/", self._activities(2), format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def _new_orders(self, n):
+        users = ["manager_user", "viewer_user", "staff_user"]
+        return [
+            {
+                "workspace": "ws1",
+                "asset": self.assets[i % 3].id,
+                "task": self.task.id,
+                "due": (self.now + timedelta(days=i)).isoformat(),
+                "assigned_to": users[i % 3],
+                "requested_by": users[(i + 1) % 3],
+            }
+            for i in range(n)
+        ]
+
+    def test_bulk_create_resolves_each_related_model_once(self):
+        """Users, assets, tasks and workspaces cost one query each."""
+        counts = []
+        for n in (3, 30):
+            WorkOrder.objects.all().delete()
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.post(
+                    "/api/work-orders/bulk/", self._new_orders(n), format="json"
+                )
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            sql = [query["sql"] for query in ctx.captured_queries]
+            lookups = Counter(
+                q.split(" FROM ")[1].split()[0].strip('"')
+                for q in sql
+                if q.startswith("SELECT") and " IN (" in q
+            )
+            counts.append(len(sql))
+
+        self.assertEqual(counts[0], counts[1])
+        for table in ("accounts_customuser", "assets_asset", "work_maintenancetask"):
+            self.assertEqual(lookups[table], 1, table)
+        order = WorkOrder.objects.get(due=self.now + timedelta(days=1))
+        self.assertEqual(order.assigned_to, self.viewer_user)
+        self.assertEqual(order.requested_by, self.staff_user)
+
+    def test_bulk_create_checks_uniqueness_across_the_payload(self):
+        """Rows clashing with the database or an earlier row are rejected."""
+        existing = self._orders(1)[0]
+        rows = self._new_orders(4)[1:]
+        rows[1].update(asset=rows[0]["asset"], due=rows[0]["due"])
+        rows[2].update(asset=existing.asset_id, due=existing.due.isoformat())
+
+        response = self.client.post("/api/work-orders/bulk/", rows, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(response.data), {1, 2})
+        self.assertIn("must make a unique set", str(response.data[1]))
+        self.assertEqual(WorkOrder.objects.count(), 1)
+
+
+class ExportTest(APITestSetup):
+    """Exports stream every visible, filtered row as NDJSON or CSV."""
+
+    def setUp(self):
+        super().setUp()
+        self.app = Application.objects.create(name="Docker", version="24", slug="d")
+        for i in range(5):
+            asset = Asset.objects.create(
+                workspace=self.workspace1, name=f"Pi-{i}", kind="PI"
+            )
+            asset.applications.add(self.app)
+        Asset.objects.create(workspace=self.workspace2, name="Other", kind="PI")
+        self.client.force_authenticate(user=self.viewer_user)
+
+    def _lines(self, response):
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode().splitlines()
+
+    @override_settings(API_EXPORT_CHUNK_SIZE=2)
+    def test_ndjson_export_streams_scoped_rows_in_chunks(self):
+        """One JSON line per asset, prefetching applications per chunk."""
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/api/assets/export/?format=ndjson")
+            lines = self._lines(response)
+
+        self.assertEqual(
+            response["Content-Type"], "application/x-ndjson; charset=utf-8"
+        )
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual([row["name"] for row in rows], [f"Pi-{i}" for i in range(5)])
+        self.assertEqual(rows[0]["applications"][0]["slug"], "d")
+        prefetches = [
+            q for q in ctx.captured_queries if '"assets_application"' in q["sql"]
+        ]
+        self.assertEqual(len(prefetches), 3)
+
+    def test_csv_export_honours_filters(self):
+        """CSV has a header of the readable fields and respects the filterset."""
+        response = self.client.get(
+            "/api/assets/export/?format=csv&name__icontains=pi-3"
+        )
+
+        rows = list(csv.reader(self._lines(response)))
+        self.assertEqual(
+            response["Content-Disposition"], 'attachment; filename="asset.csv"'
+        )
+        self.assertEqual(rows[0][:3], ["id", "workspace", "project"])
+        self.assertNotIn("application_ids", rows[0])
+        self.assertEqual(len(rows), 2)
+        record = dict(zip(rows[0], rows[1]))
+        self.assertEqual(record["name"], "Pi-3")
+        self.assertEqual(record["project"], "")
+        self.assertEqual(json.loads(record["applications"])[0]["slug"], "d")
+
+    def test_work_order_export(self):
+        """Work orders export with their list filters."""
+        task = MaintenanceTask.objects.create(
+            workspace=self.workspace1, name="Patch OS", cadence="monthly"
+        )
+        for i, asset in enumerate(Asset.objects.filter(workspace=self.workspace1)):
+            WorkOrder.objects.create(
+                workspace=self.workspace1,
+                asset=asset,
+                task=task,
+                due=timezone.now() + timedelta(days=i),
+                status="done" if i % 2 else "open",
+            )
+
+        response = self.client.get("/api/work-orders/export/?status=open")
+
+        rows = [json.loads(line) for line in self._lines(response)]
+        self.assertEqual(len(rows), 3)
+        self.assertEqual({row["status"] for row in rows}, {"open"})
+
+    def test_export_requires_authentication(self):
+        """Anonymous exports get an error body in the requested format."""
+        self.client.force_authenticate(user=None)
+
+        response = self.client.get("/api/activities/export/?format=csv")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertTrue(response.content.startswith(b"detail\r\n"))
+
+
+class ChangeFeedTest(APITestSetup):
+    """``changes/`` lists rows updated since a timestamp, oldest first."""
+
+    def setUp(self):
+        super().setUp()
+        self.asset = Asset.objects.create(
+            workspace=self.workspace1, name="Pi-001", kind="PI"
+        )
+        self.task = MaintenanceTask.objects.create(
+            workspace=self.workspace1, name="Patch OS", cadence="monthly"
+        )
+        self.t0 = timezone.now() - timedelta(days=1)
+        self.orders = WorkOrder.objects.bulk_create(
+            WorkOrder(
+                workspace=self.workspace1,
+                asset=self.asset,
+                task=self.task,
+                due=self.t0 + timedelta(days=i),
+            )
+            for i in range(25)
+        )
+        # Pin the timestamps: order i changed i minutes after t0.
+        for i, order in enumerate(self.orders):
+            WorkOrder.objects.filter(pk=order.pk).update(
+                updated=self.t0 + timedelta(minutes=i)
+            )
+        self.client.force_authenticate(user=self.viewer_user)
+
+    def _since(self, minutes):
+        return quote((self.t0 + timedelta(minutes=minutes)).isoformat())
+
+    def test_changes_pages_through_rows_updated_since(self):
+        """Rows with updated >= since come back in (updated, id) order."""
+        url = f"/api/work-orders/changes/?updated_since={self._since(3)}"
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids += [row["id"] for row in response.data["results"]]
+            url = response.data["next"]
+
+        self.assertEqual(ids, [order.id for order in self.orders[3:]])
+
+    def test_saving_moves_a_row_to_the_end_of_the_feed(self):
+        """A save stamps ``updated``, so the change shows up in the feed."""
+        first = self.orders[0]
+        first.status = "done"
+        first.save()
+
+        response = self.client.get(
+            f"/api/work-orders/changes/?updated_since={self._since(20)}"
+        )
+
+        ids = [row["id"] for row in response.data["results"]]
+        self.assertEqual(ids[-1], first.id)
+        self.assertEqual(len(ids), 6)
+        self.assertIn("updated", response.data["results"][-1])
+
+    def test_bulk_patch_stamps_updated(self):
+        """bulk_update() does not run auto_now; the bulk endpoint stamps it."""
+        self.client.force_authenticate(user=self.manager_user)
+        rows = [{"id": order.id, "status": "done"} for order in self.orders[:2]]
+        self.client.patch("/api/work-orders/bulk/", rows, format="json")
+
+        response = self.client.get(f"/api/work-orders/?updated_since={self._since(60)}")
+
+        ids = {row["id"] for row in response.data["results"]}
+        self.assertEqual(ids, {self.orders[0].id, self.orders[1].id})
+
+    def test_asset_and_task_feeds(self):
+        """Assets and maintenance tasks expose the same feed."""
+        MaintenanceTask.objects.update(updated=self.t0)
+        for url in ("/api/assets/changes/", "/api/maintenance-tasks/changes/"):
+            response = self.client.get(f"{url}?updated_since={self._since(0)}")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(response.data["results"]), 1)
+
+        response = self.client.get(
+            f"/api/maintenance-tasks/?updated_since={self._since(1)}"
+        )
+        self.assertEqual(response.data["count"], 0)
+
+    def test_last_page_lists_deletions_since(self):
+        """Ids deleted since ``updated_since`` come with the last page only."""
+        gone = [self.orders[24].id, self.orders[0].id]
+        self.orders[24].delete()
+        WorkOrder.objects.filter(pk=self.orders[0].id).delete()
+        Tombstone.objects.create(
+            model="work.workorder", object_id=999, workspace_id=self.workspace2.id
+        )
+
+        url = f"/api/work-orders/changes/?updated_since={self._since(3)}"
+        pages = []
+        while url:
+            response = self.client.get(url)
+            pages.append(response.data["deleted"])
+            url = response.data["next"]
+
+        self.assertEqual(pages, [[]] * (len(pages) - 1) + [gone])
+
+    def test_updated_since_before_retention_is_gone(self):
+        """Tombstones are pruned, so a sync that old must start over."""
+        since = quote((timezone.now() - timedelta(days=400)).isoformat())
+
+        response = self.client.get(f"/api/work-orders/changes/?updated_since={since}")
+
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+
+
+class ConditionalGetTest(APITestSetup):
+    """Lists and details answer If-None-Match/If-Modified-Since with a 304."""
+
+    url = "/api/work-orders/?status=open"
+
+    def setUp(self):
+        super().setUp()
+        self.asset = Asset.objects.create(
+            workspace=self.workspace1, name="Pi-001", kind="PI"
+        )
+        self.task = MaintenanceTask.objects.create(
+            workspace=self.workspace1, name="Patch OS", cadence="monthly"
+        )
+        now = timezone.now()
+        self.orders = [
+            WorkOrder.objects.create(
+                workspace=self.workspace1,
+                asset=self.asset,
+                task=self.task,
+                due=now + timedelta(days=i),
+            )
+            for i in range(3)
+        ]
+        self.client.force_authenticate(user=self.viewer_user)
+
+    def _etag(self, url=None):
+        response = self.client.get(url or self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response["ETag"]
+
+    def test_repeat_poll_is_not_modified_without_reading_the_rows(self):
+        """A matching ETag gets a 304 from the workspace versions alone."""
+        etag = self._etag()
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+        self.assertFalse(
+            [q for q in ctx.captured_queries if "work_workorder" in q["sql"]]
+        )
+
+    def test_list_pages_read_only_the_page(self):
+        """No aggregate on plain requests, and no ETag on cursor pages."""
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url)
+        self.assertEqual(
+            sum("work_workorder" in q["sql"] for q in ctx.captured_queries), 2
+        )
+        self.assertFalse([q for q in ctx.captured_queries if "MAX(" in q["sql"]])
+
+        response = self.client.get(self.url + "&pagination=cursor")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.has_header("ETag"))
+
+    def test_etag_changes_with_saves_deletes_and_params(self):
+        etag = self._etag()
+
+        self.orders[0].due += timedelta(hours=1)
+        self.orders[0].save()
+        after_save = self._etag()
+        self.orders[1].delete()
+        after_delete = self._etag()
+        other_page = self._etag(self.url + "&ordering=-due")
+
+        self.assertEqual(len({etag, after_save, after_delete, other_page}), 4)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_writes_in_other_workspaces_keep_the_etag(self):
+        etag = self._etag()
+        Asset.objects.create(workspace=self.workspace2, name="Srv-1", kind="SRV")
+
+        self.assertEqual(self._etag(), etag)
+
+    def test_etag_follows_the_usernames_it_shows(self):
+        self.orders[0].assigned_to = self.manager_user
+        self.orders[0].save()
+        etag = self._etag()
+
+        self.manager_user.last_login = timezone.now()
+        self.manager_user.save(update_fields=["last_login"])
+        self.assertEqual(self._etag(), etag)
+
+        self.manager_user.username = "manager-renamed"
+        self.manager_user.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(
+            "manager-renamed", [row["assigned_to"] for row in response.data["results"]]
+        )
+
+        etag = response["ETag"]
+        self.manager_user.delete()
+        self.assertNotEqual(self._etag(), etag)
+
+    def test_etag_is_per_user(self):
+        etag = self._etag()
+        self.client.force_authenticate(user=self.manager_user)
+
+        self.assertNotEqual(self._etag(), etag)
+
+    def test_detail_if_modified_since(self):
+        url = f"/api/work-orders/{self.orders[0].id}/"
+        response = self.client.get(url)
+        last_modified = response["Last-Modified"]
+
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH='"stale"')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["id"], self.orders[0].id)
+
+
+@override_settings(API_RESPONSE_CACHE_TIMEOUT=60)
+class ResponseCacheTest(APITestSetup):
+    """List pages are cached per role set until their workspace changes."""
+
+    url = "/api/work-orders/?status=open&ordering=due"
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.asset = Asset.objects.create(
+            workspace=self.workspace1, name="Pi-001", kind="PI"
+        )
+        self.task = MaintenanceTask.objects.create(
+            workspace=self.workspace1, name="Patch OS", cadence="monthly"
+        )
+        self.order = WorkOrder.objects.create(
+            workspace=self.workspace1,
+            asset=self.asset,
+            task=self.task,
+            due=timezone.now(),
+        )
+        self.client.force_authenticate(user=self.viewer_user)
+
+    def _get(self, url=None):
+        """The response and the number of queries that read work orders."""
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url or self.url)
+        reads = [q for q in ctx.captured_queries if "work_workorder" in q["sql"]]
+        return response, len(reads)
+
+    def _ids(self, response):
+        return [row["id"] for row in json.loads(response.content)["results"]]
+
+    def test_repeat_request_is_served_from_the_cache(self):
+        first, reads = self._get()
+        self.assertGreater(reads, 0)
+
+        # Same parameters in another order.
+        second, reads = self._get("/api/work-orders/?ordering=due&status=open")
+
+        self.assertEqual(reads, 0)
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second["ETag"], first["ETag"])
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_users_with_the_same_roles_share_entries(self):
+        self._get()
+        other = User.objects.create_user(username="viewer2", password="x")
+        Membership.objects.create(user=other, workspace=self.workspace1, role="viewer")
+        self.client.force_authenticate(user=other)
+        self.assertEqual(self._get()[1], 0)
+
+        self.client.force_authenticate(user=self.manager_user)
+        self.assertGreater(self._get()[1], 0)
+
+    def test_writes_in_the_workspace_invalidate(self):
+        self._get()
+        self.order.status = "done"
+        self.order.save()
+
+        response, reads = self._get()
+
+        self.assertGreater(reads, 0)
+        self.assertEqual(self._ids(response), [])
+
+    def test_bulk_writes_invalidate(self):
+        self._get()
+        self.client.force_authenticate(user=self.manager_user)
+        self.client.patch(
+            "/api/work-orders/bulk/",
+            [{"id": self.order.id, "status": "done"}],
+            format="json",
+        )
+        self.client.force_authenticate(user=self.viewer_user)
+
+        response, reads = self._get()
+
+        self.assertGreater(reads, 0)
+        self.assertEqual(self._ids(response), [])
+
+    def test_writes_in_other_workspaces_keep_the_entry(self):
+        self._get()
+        MaintenanceTask.objects.create(
+            workspace=self.workspace2, name="Patch OS", cadence="monthly"
+        )
+
+        self.assertEqual(self._get()[1], 0)
+
+    def test_browsable_api_pages_are_not_shared(self):
+        """They hold the user's name and CSRF token."""
+        url = "/api/work-orders/?format=api"
+        self.client.get(url)
+        other = User.objects.create_user(username="viewer2", password="x")
+        Membership.objects.create(user=other, workspace=self.workspace1, role="viewer")
+        self.client.force_authenticate(user=other)
+
+        response, reads = self._get(url)
+
+        self.assertGreater(reads, 0)
+        self.assertContains(response, "viewer2")
+        self.assertNotContains(response, self.viewer_user.username)
+
+    def test_entries_are_per_host_and_scheme(self):
+        """Pages hold absolute links, so another origin gets its own entry."""
+        self._get()
+
+        with CaptureQueriesContext(connection) as ctx:
+            other_host = self.client.get(self.url, HTTP_HOST="localhost")
+            https = self.client.get(self.url, secure=True)
+
+        self.assertEqual(
+            sum("work_workorder" in q["sql"] for q in ctx.captured_queries), 4
+        )
+        self.assertEqual(other_host.status_code, status.HTTP_200_OK)
+        self.assertEqual(https.status_code, status.HTTP_200_OK)
+
+
+@skipIf(renderers.orjson is None, "orjson is not installed")
+class ORJSONTest(APITestSetup):
+    """The orjson renderer and parser match DRF's byte for byte."""
+
+    def assertSameJSON(self, data, media_type="application/json"):
+        expected = JSONRenderer().render(data, media_type)
+        self.assertEqual(ORJSONRenderer().render(data, media_type), expected)
+
+    def test_dates_and_datetimes(self):
+        utc = dt_timezone.utc
+        london = ZoneInfo("Europe/London")
+        self.assertSameJSON(
+            {
+                "utc": datetime(2025, 1, 15, 10, 0, tzinfo=utc),
+                "micro": datetime(2025, 1, 15, 10, 0, 0, 120, tzinfo=utc),
+                "winter": datetime(2025, 1, 15, 10, 0, tzinfo=london),
+                "summer": datetime(2025, 7, 15, 10, 0, tzinfo=london),
+                "offset": datetime(
+                    2025, 1, 15, tzinfo=dt_timezone(-timedelta(hours=5, minutes=30))
+                ),
+                "naive": datetime(2025, 1, 15, 10, 0),
+                "date": date(2025, 1, 15),
+                "time": time(10, 0, 5, 7),
+                "now": timezone.now(),
+            }
+        )
+
+    def test_decimals(self):
+        values = ["12.50", "0", "-3.1", "0.00001", "1E+20", "123456789.987654321"]
+        self.assertSameJSON([Decimal(value) for value in values])
+        with self.assertRaises(ValueError):
+            ORJSONRenderer().render([Decimal("NaN")])
+
+    def test_non_finite_floats_fail_like_the_stock_renderer(self):
+        for value in (float("nan"), float("inf"), -float("inf")):
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                ORJSONRenderer().render({"rows": [{"load": value, "os": None}]})
+        self.assertSameJSON({"load": 0.5, "os": None})
+
+    def test_other_values(self):
+        self.assertSameJSON(
+            {
+                "text": 'Rack 2 – shelf 3 \u2028 \u2029 "quoted" \\',
+                "lazy": gettext_lazy("Maintenance"),
+                "uuid": UUID("12345678-1234-5678-1234-567812345678"),
+                "errors": {0: {"kind": ["Bad"]}, 3: {}},
+                "big": 2**70,
+                "nested": [(1, 2.5, None, True)],
+            }
+        )
+        self.assertSameJSON({"a": [1, 2]}, "application/json; indent=4")
+        self.assertEqual(ORJSONRenderer().render(None), b"")
+
+    def test_api_responses_are_rendered_with_orjson(self):
+        app = Application.objects.create(name="Docker", version="27", slug="docker")
+        asset = Asset.objects.create(
+            workspace=self.workspace1,
+            name="Pi-001",
+            kind="PI",
+            purchase_date=date(2024, 2, 29),
+        )
+        asset.applications.add(app)
+        self.client.force_authenticate(user=self.viewer_user)
+
+        response = self.client.get("/api/assets/")
+
+        self.assertIsInstance(response.accepted_renderer, ORJSONRenderer)
+        self.assertEqual(response.content, JSONRenderer().render(response.data))
+
+    def test_parser_matches_json_parser(self):
+        body = json.dumps(
+            {"id": 1, "big": 2**70, "price": 1.5, "name": "Pi – 1", "rows": [None]}
+        ).encode()
+        self.assertEqual(
+            ORJSONParser().parse(BytesIO(body)), JSONParser().parse(BytesIO(body))
+        )
+        for bad in (b"{", b'{"a": NaN}', b"\xef\xbb\xbf{}"):
+            with self.assertRaises(ParseError) as expected:
+                JSONParser().parse(BytesIO(bad))
+            with self.assertRaises(ParseError) as actual:
+                ORJSONParser().parse(BytesIO(bad))
+            self.assertEqual(str(actual.exception), str(expected.exception))
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command(
+            "benchmark_json", "--rows=200", "--repeat=1", "--native", stdout=out
+        )
+        self.assertIn("identical output", out.getvalue())
+
+
+class ValuesSerializerTest(APITestSetup):
+    """The values() list serializers reproduce the ModelSerializers' items."""
+
+    def setUp(self):
+        super().setUp()
+        apps = [
+            Application.objects.create(name="Docker", version="27", slug="docker"),
+            Application.objects.create(name="Pi-hole", slug="pi-hole"),
+        ]
+        os_ = OS.objects.create(name="Debian", version="12", slug="debian-12")
+        project = Project.objects.create(
+            workspace=self.workspace1, name="Homelab", slug="homelab"
+        )
+        self.assets = [
+            Asset.objects.create(
+                workspace=self.workspace1,
+                name="Pi-001",
+                kind="PI",
+                os=os_,
+                project=project,
+                purchase_date=date(2024, 2, 29),
+            ),
+            Asset.objects.create(workspace=self.workspace1, name="Srv-1", kind="SRV"),
+            Asset.objects.create(workspace=self.workspace2, name="Lap-1", kind="LAP"),
+        ]
+        self.assets[0].applications.set(apps)
+        self.assets[2].applications.set(apps[1:])
+        task = MaintenanceTask.objects.create(
+            workspace=self.workspace1, name="Patch OS", cadence="monthly"
+        )
+        now = timezone.now().replace(microsecond=123456)
+        order = WorkOrder.objects.create(
+            workspace=self.workspace1,
+            asset=self.assets[0],
+            task=task,
+            due=now,
+            assigned_to=self.manager_user,
+        )
+        WorkOrder.objects.create(
+            workspace=self.workspace1, asset=self.assets[1], task=task, due=now
+        )
+        ActivityInstance.objects.create(
+            workspace=self.workspace1,
+            asset=self.assets[0],
+            work_order=order,
+            kind="patched",
+            occurred_at=now,
+            performed_by=self.manager_user,
+            note="Rebooted – fine",
+        )
+        ActivityInstance.objects.create(
+            workspace=self.workspace1,
+            asset=self.assets[1],
+            kind="checked",
+            occurred_at=now - timedelta(days=1),
+        )
+
+    def test_items_match_the_model_serializers(self):
+        for viewset in (AssetViewSet, WorkOrderViewSet, ActivityInstanceViewSet):
+            with self.subTest(viewset=viewset.__name__):
+                queryset = viewset.queryset.order_by("pk")
+                expected = viewset.serializer_class(queryset, many=True).data
+                serializer = viewset.values_serializer_class()
+                items = serializer.to_representation(serializer.values(queryset))
+
+                self.assertEqual(
+                    JSONRenderer().render(items), JSONRenderer().render(expected)
+                )
+
+    def test_list_pages_use_values_rows(self):
+        """
+        An asset page costs its count, the rows and one query for the nested
+        applications.
+        """
+        self.client.force_authenticate(user=self.staff_user)
+
+        with self.assertNumQueries(3):
+            response = self.client.get("/api/assets/?ordering=name")
+
+        expected = AssetSerializer(
+            Asset.objects.order_by("name"), many=True, context={"request": None}
+        ).data
+        self.assertEqual(
+            response.json()["results"], json.loads(JSONRenderer().render(expected))
+        )
+
+    def test_fields_that_need_the_instance_are_refused(self):
+        class OSValuesSerializer(ValuesSerializer):
+            serializer_class = OSSerializer
+
+        with self.assertRaises(ImproperlyConfigured):
+            OSValuesSerializer()
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command("benchmark_serializers", "--rows=30", "--repeat=1", stdout=out)
+        self.assertEqual(out.getvalue().count("faster"), 3)
+        self.assertFalse(Workspace.objects.filter(slug__startswith="serializer-"))
+
+
+class SparseFieldsetTest(APITestSetup):
+    """?fields= and ?expand= cut down both the payload and the queries."""
+
+    def setUp(self):
+        super().setUp()
+        self.os = OS.objects.create(name="Debian", version="12", slug="debian-12")
+        self.project = Project.objects.create(
+            workspace=self.workspace1, name="Homelab", slug="homelab"
+        )
+        self.pi = Asset.objects.create(
+            workspace=self.workspace1,
+            name="Pi-001",
+            kind="PI",
+            os=self.os,
+            project=self.project,
+        )
+        Asset.objects.create(workspace=self.workspace1, name="Srv-1", kind="SRV")
+        self.pi.applications.set(
+            [Application.objects.create(name="Docker", slug="docker")]
+        )
+        self.client.force_authenticate(user=self.staff_user)
+
+    def test_fields_trim_the_items_and_skip_unused_prefetches(self):
+        """The count and the rows; no applications query."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/assets/?fields=id,name")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json()["results"],
+            [{"id": self.pi.pk, "name": "Pi-001"}, {"id": ANY, "name": "Srv-1"}],
+        )
+        self.assertEqual(len(queries), 2)
+        self.assertNotIn("assets_application", queries[-1]["sql"])
+
+    def test_expand_nests_the_related_objects(self):
+        with self.assertNumQueries(5):
+            response = self.client.get("/api/assets/?expand=os,project&ordering=name")
+
+        pi, srv = response.json()["results"]
+        self.assertEqual(
+            pi["os"], json.loads(JSONRenderer().render(OSSerializer(self.os).data))
+        )
+        self.assertEqual(pi["project"]["slug"], "homelab")
+        self.assertEqual(pi["applications"][0]["slug"], "docker")
+        self.assertIsNone(srv["os"])
+        self.assertIsNone(srv["project"])
+
+    def test_values_items_match_the_model_serializer(self):
+        serializer = AssetSerializer(
+            fields=["id", "name", "form_factor"], expand=["os", "project"]
+        )
+        queryset = Asset.objects.order_by("pk")
+        values = ValuesSerializer(serializer=serializer)
+        items = values.to_representation(values.values(queryset))
+        expected = AssetSerializer(
+            queryset,
+            many=True,
+            fields=["id", "name", "form_factor"],
+            expand=["os", "project"],
+        ).data
+
+        self.assertEqual(JSONRenderer().render(items), JSONRenderer().render(expected))
+        self.assertEqual(list(items[0]), ["id", "project", "name", "form_factor", "os"])
+
+    def test_retrieve_loads_only_the_fields_asked_for(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                f"/api/assets/{self.pi.pk}/?fields=id,name&expand=os"
+            )
+
+        self.assertEqual(
+            response.json(),
+            {"id": self.pi.pk, "name": "Pi-001", "os": ANY},
+        )
+        self.assertEqual(response.json()["os"]["slug"], "debian-12")
+        sql = queries[-1]["sql"]
+        self.assertIn('JOIN "assets_os"', sql)
+        self.assertNotIn('"assets_asset"."notes"', sql)
+
+    def test_cursor_pages_keep_their_keyset(self):
+        task = MaintenanceTask.objects.create(
+            workspace=self.workspace1, name="Patch OS", cadence="monthly"
+        )
+        due = timezone.now()
+        WorkOrder.objects.bulk_create(
+            WorkOrder(
+                workspace=self.workspace1,
+                asset=self.pi,
+                task=task,
+                due=due - timedelta(hours=i),
+            )
+            for i in range(25)
+        )
+        expected = WorkOrder.objects.order_by("-due", "-id")
+
+        first = self.client.get("/api/work-orders/?pagination=cursor&fields=id")
+        second = self.client.get(first.json()["next"])
+
+        items = first.json()["results"] + second.json()["results"]
+        self.assertEqual({tuple(item) for item in items}, {("id",)})
+        self.assertEqual(
+            [item["id"] for item in items],
+            list(expected.values_list("id", flat=True)),
+        )
+        self.assertIsNone(second.json()["next"])
+
+    def test_unknown_names_are_rejected(self):
+        response = self.client.get("/api/assets/?fields=id,secret&expand=workspace")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.json(),
+            {
+                "fields": ["Unknown fields: secret."],
+                "expand": ["Cannot expand: workspace."],
+            },
+        )
+
+    def test_writes_ignore_the_parameters(self):
+        self.client.force_authenticate(user=self.manager_user)
+        response = self.client.patch(
+            f"/api/assets/{self.pi.pk}/?fields=id", {"name": "Pi-002"}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["name"], "Pi-002")
+
+
+@override_settings(API_COUNT_ESTIMATE_THRESHOLD=3, API_COUNT_CACHE_TIMEOUT=60)
+class EstimatedCountTest(APITestSetup):
+    """Large lists are counted once, then served with the cached count."""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self._applications(25)
+        self.client.force_authenticate(user=self.viewer_user)
+
+    def _applications(self, n):
+        start = Application.objects.count()
+        Application.objects.bulk_create(
+            Application(name=f"App {i:03d}", slug=f"app-{i:03d}")
+            for i in range(start, start + n)
+        )
+
+    @override_settings(API_COUNT_ESTIMATE_THRESHOLD=100)
+    def test_small_lists_are_counted_exactly(self):
+        for _ in range(2):
+            response = self.client.get("/api/applications/")
+
+            self.assertEqual(response.data["count"], 25)
+            self.assertIs(response.data["count_is_estimate"], False)
+
+    def test_large_counts_are_cached_and_flagged(self):
+        first = self.client.get("/api/applications/")
+        self._applications(1)
+        second = self.client.get("/api/applications/")
+        last = self.client.get(second.data["next"])
+
+        self.assertEqual(
+            [first.data["count"], second.data["count"], last.data["count"]],
+            [25, 25, 26],
+        )
+        self.assertIs(first.data["count_is_estimate"], False)
+        self.assertIs(second.data["count_is_estimate"], True)
+        # The last page knows the real count.
+        self.assertIs(last.data["count_is_estimate"], False)
+        self.assertEqual(len(last.data["results"]), 6)
+        self.assertIsNone(last.data["next"])
+
+    def test_pages_past_a_stale_count_are_served(self):
+        queryset = Application.objects.order_by("pk")
+        EstimatedCountPaginator(queryset, 10).count
+        self._applications(20)
+        paginator = EstimatedCountPaginator(queryset, 10)
+
+        self.assertEqual(paginator.count, 25)
+        self.assertTrue(paginator.count_is_estimate)
+        self.assertTrue(paginator.page(3).has_next())
+        page = paginator.page(5)
+        self.assertEqual(len(page), 5)
+        self.assertFalse(page.has_next())
+        self.assertEqual(paginator.count, 45)
+        self.assertFalse(paginator.count_is_estimate)
+        with self.assertRaises(EmptyPage):
+            EstimatedCountPaginator(queryset, 10).page(6)
+
+    def test_lists_with_an_etag_estimate_large_counts(self):
+        Asset.objects.bulk_create(
+            Asset(workspace=self.workspace1, name=f"Pi-{i}", kind="PI")
+            for i in range(25)
+        )
+        self.client.get("/api/assets/")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/assets/")
+
+        self.assertEqual(response.data["count"], 25)
+        self.assertIs(response.data["count_is_estimate"], True)
+        self.assertFalse([q for q in queries if "COUNT(" in q["sql"]])
+
+    @skipUnless(connection.vendor == "postgresql", "planner estimates need Postgres")
+    @override_settings(API_COUNT_ESTIMATE_THRESHOLD=1)
+    def test_postgres_uses_the_planner_estimate(self):
+        paginator = EstimatedCountPaginator(Application.objects.all(), 10)
+
+        self.assertGreater(paginator.count, 0)
+        self.assertTrue(paginator.count_is_estimate)
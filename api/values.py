@@ -0,0 +1,169 @@
+# api/values.py
+
+"""
+Read-only list serializers that build the items from ``QuerySet.values()``
+rows instead of model instances.
+
+On a list page most of DRF's cost is per row and per field: instantiating
+the model, ``get_attribute`` through ``source``, related-object access and
+the ``ReturnDict`` per item. A ``ValuesSerializer`` reads exactly the columns
+the ``serializer_class`` outputs (following relations in the same query) and
+formats each value with that serializer's own field, so the items, and the
+JSON, are the same as ``serializer_class(page, many=True).data``:
+
+- a slug related field reads ``<source>__<slug_field>``, a primary key
+  related field the foreign key column;
+- a ``get_<field>_display`` source maps the choice value to its label;
+- a nested ``many=True`` serializer over a many-to-many field is loaded for
+  the whole page with one query, like ``prefetch_related``, and serialized
+  by the nested serializer;
+- a nested serializer over a foreign key (an ``?expand=`` field) is loaded
+  the same way, one query for the distinct related rows of the page;
+- any other field reads its ``source`` column and formats it with its
+  ``to_representation``.
+
+Fields that need the instance (method fields, other dotted or callable
+sources) are refused when the serializer is built.
+"""
+
+from collections import defaultdict
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db.models import F, ForeignKey, ManyToManyField
+from rest_framework import serializers
+
+from .planning import query_plan
+from .serializers import (ActivityInstanceSerializer, AssetSerializer,
+                          WorkOrderSerializer)
+
+
+def _choice_labels(model, name):
+    field = model._meta.get_field(name)
+    return {value: str(label) for value, label in field.flatchoices}
+
+
+class ValuesSerializer:
+    serializer_class = None
+
+    def __init__(self, context=None, serializer=None):
+        """
+        Built from ``serializer``, a ``serializer_class`` instance (with its
+        sparse fieldset), or from a new one with ``context``.
+        """
+        if serializer is None:
+            serializer = self.serializer_class(context=context or {})
+        self.model = serializer.Meta.model
+        self.columns = []
+        self.nested = {}
+        self.related = {}
+        for name, field in serializer.fields.items():
+            if not field.write_only:
+                self.columns.append((name, *self._column(field)))
+
+    def _column(self, field):
+        """``(values() lookup, formatter or None)`` for ``field``."""
+        source = field.source
+        if isinstance(field, serializers.ListSerializer):
+            model_field = self.model._meta.get_field(source)
+            if not isinstance(model_field, ManyToManyField):
+                raise ImproperlyConfigured(f"{source!r} is not a many-to-many field.")
+            self.nested[field.field_name] = (model_field, field.child)
+            return self.model._meta.pk.attname, None
+        if isinstance(field, serializers.BaseSerializer):
+            model_field = self.model._meta.get_field(source)
+            if not isinstance(model_field, ForeignKey):
+                raise ImproperlyConfigured(f"{source!r} is not a foreign key.")
+            self.related[field.field_name] = (model_field, field)
+            return model_field.attname, None
+        if isinstance(field, serializers.SlugRelatedField):
+            return f"{source.replace('.', '__')}__{field.slug_field}", None
+        if isinstance(field, serializers.PrimaryKeyRelatedField):
+            formatter = field.pk_field and field.pk_field.to_representation
+            return source.replace(".", "__"), formatter
+        if source.startswith("get_") and source.endswith("_display"):
+            name = source[len("get_") : -len("_display")]
+            labels = _choice_labels(self.model, name)
+            return name, lambda value: labels.get(value, value)
+        if isinstance(field, serializers.RelatedField) or not self._is_column(source):
+            raise ImproperlyConfigured(
+                f"{type(self).__name__} cannot read {field.field_name!r} "
+                "from values()."
+            )
+        return source, field.to_representation
+
+    def _is_column(self, name):
+        try:
+            return self.model._meta.get_field(name).concrete
+        except FieldDoesNotExist:
+            return False
+
+    def values(self, queryset, extra=()):
+        """
+        ``queryset`` reduced to the columns the items are built from, and the
+        ``extra`` ones (a cursor page's keyset).
+        """
+        lookups = dict.fromkeys([*(lookup for _, lookup, _ in self.columns), *extra])
+        return queryset.prefetch_related(None).values(*lookups)
+
+    def to_representation(self, rows):
+        """The list items for ``rows`` of ``values(queryset)``."""
+        rows = list(rows)
+        nested = {name: self._load_nested(name, rows) for name in self.nested}
+        related = {name: self._load_related(name, rows) for name in self.related}
+        items = []
+        for row in rows:
+            item = {}
+            for name, lookup, formatter in self.columns:
+                value = row[lookup]
+                if name in nested:
+                    value = nested[name].get(value, [])
+                elif name in related:
+                    value = related[name].get(value)
+                elif value is not None and formatter is not None:
+                    value = formatter(value)
+                item[name] = value
+            items.append(item)
+        return items
+
+    def _load_nested(self, name, rows):
+        """``{pk: [items]}`` of nested field ``name``, with one query."""
+        if not rows:
+            return {}
+        model_field, child = self.nested[name]
+        owner = model_field.related_query_name()
+        related = model_field.related_model._default_manager.filter(
+            **{f"{owner}__in": [row[self.model._meta.pk.attname] for row in rows]}
+        ).annotate(_values_owner=F(owner))
+        items = defaultdict(list)
+        for obj in related:
+            items[obj._values_owner].append(child.to_representation(obj))
+        return items
+
+    def _load_related(self, name, rows):
+        """``{key: item}`` of expanded field ``name``, with one query."""
+        model_field, serializer = self.related[name]
+        keys = {row[model_field.attname] for row in rows} - {None}
+        if not keys:
+            return {}
+        target = model_field.target_field
+        related = query_plan(serializer).apply(
+            model_field.related_model._default_manager.filter(
+                **{f"{target.name}__in": keys}
+            )
+        )
+        return {
+            getattr(obj, target.attname): serializer.to_representation(obj)
+            for obj in related
+        }
+
+
+class AssetValuesSerializer(ValuesSerializer):
+    serializer_class = AssetSerializer
+
+
+class WorkOrderValuesSerializer(ValuesSerializer):
+    serializer_class = WorkOrderSerializer
+
+
+class ActivityInstanceValuesSerializer(ValuesSerializer):
+    serializer_class = ActivityInstanceSerializer
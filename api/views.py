@@ -1,19 +1,44 @@
 # api/views.py
 
+from datetime import timedelta
+from functools import cached_property
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date, quote_etag
 from django_filters import rest_framework as filters
+from django_filters.fields import IsoDateTimeField
 from rest_framework import filters as drf_filters
-from rest_framework import viewsets
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import APIException, NotFound, ValidationError
+from rest_framework.response import Response
 
 from assets.models import OS, Application, Asset, FormFactor, Project
-from core.models import Membership, Workspace
+from core.models import Membership, Tombstone, Workspace
+from core.versions import ALL, SHARED, bump_workspace_versions, get_versions
 from work.models import ActivityInstance, MaintenanceTask, WorkOrder
+from work.rollups import deferred_rollups, refresh_asset_rollups
 
+from .pagination import (ActivityInstanceCursorPagination,
+                         ChangeFeedPagination, KeysetPagination,
+                         WorkOrderCursorPagination)
 from .permissions import IsAuthenticatedReadOnlyOrManager
+from .planning import query_plan
+from .renderers import CSVRenderer, NDJSONRenderer
+from .roles import get_roles
 from .serializers import (ActivityInstanceSerializer, ApplicationSerializer,
                           AssetSerializer, FormFactorSerializer,
                           MaintenanceTaskSerializer, MembershipSerializer,
                           OSSerializer, ProjectSerializer, WorkOrderSerializer,
                           WorkspaceSerializer)
+from .values import (ActivityInstanceValuesSerializer, AssetValuesSerializer,
+                     WorkOrderValuesSerializer)
 
 # ---------- FilterSets ----------
 
@@ -23,6 +48,14 @@ class AssetFilter(filters.FilterSet):
         field_name="warranty_expires", lookup_expr="lt"
     )
     name__icontains = filters.CharFilter(field_name="name", lookup_expr="icontains")
+    # Rollup columns: no aggregation over the work tables.
+    next_due_at__lt = filters.IsoDateTimeFilter(
+        field_name="next_due_at", lookup_expr="lt"
+    )
+    open_workorder_count__gte = filters.NumberFilter(
+        field_name="open_workorder_count", lookup_expr="gte"
+    )
+    updated_since = filters.IsoDateTimeFilter(field_name="updated", lookup_expr="gte")
 
     class Meta:
         model = Asset
@@ -33,12 +66,24 @@ class AssetFilter(filters.FilterSet):
             "location",
             "warranty_expires__lt",
             "name__icontains",
+            "next_due_at__lt",
+            "open_workorder_count__gte",
+            "updated_since",
         ]
 
 
+class MaintenanceTaskFilter(filters.FilterSet):
+    updated_since = filters.IsoDateTimeFilter(field_name="updated", lookup_expr="gte")
+
+    class Meta:
+        model = MaintenanceTask
+        fields = ["updated_since"]
+
+
 class WorkOrderFilter(filters.FilterSet):
     # date range for 'due'
     due__date = filters.DateFromToRangeFilter(field_name="due")
+    updated_since = filters.IsoDateTimeFilter(field_name="updated", lookup_expr="gte")
 
     class Meta:
         model = WorkOrder
@@ -47,11 +92,13 @@ class WorkOrderFilter(filters.FilterSet):
             "task",
             "status",
             "due__date",
+            "updated_since",
         ]
 
 
 class ActivityInstanceFilter(filters.FilterSet):
     occurred_at = filters.DateFromToRangeFilter()
+    updated_since = filters.IsoDateTimeFilter(field_name="updated", lookup_expr="gte")
 
     class Meta:
         model = ActivityInstance
@@ -59,6 +106,7 @@ class ActivityInstanceFilter(filters.FilterSet):
             "asset",
             "kind",
             "occurred_at",
+            "updated_since",
         ]
 
 
@@ -72,12 +120,372 @@ class WorkspaceScopedMixin:
     models we override get_queryset appropriately.
     """
 
+    def member_workspace_ids(self):
+        """
+        The user's workspace ids, from the roles shared with the permission
+        class. Filtering with ``workspace_id IN (...)`` instead of joining
+        memberships keeps one row per object, so no DISTINCT is needed and
+        the workspace indexes apply.
+        """
+        return get_roles(self.request).workspace_ids
+
     def filter_by_membership(self, qs):
         user = self.request.user
         if not user.is_authenticated or user.is_staff:
             return qs
 
-        return qs.filter(workspace__memberships__user=user).distinct()
+        return qs.filter(workspace_id__in=self.member_workspace_ids())
+
+
+class CursorPaginationOptInMixin:
+    """
+    Keep page-number pagination by default, but switch to
+    ``cursor_pagination_class`` when the client asks for it with
+    ``?pagination=cursor`` (or follows a link carrying ``?cursor=``).
+    """
+
+    cursor_pagination_class = None
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator") and self.action == "list":
+            params = self.request.query_params
+            if self.cursor_pagination_class is not None and (
+                params.get("pagination") == "cursor" or "cursor" in params
+            ):
+                self._paginator = self.cursor_pagination_class()
+        return super().paginator
+
+
+def scoped_versions(request):
+    """
+    The workspaces ``request.user`` sees, with their roles, and the current
+    tokens of the versions (see ``core.versions``) their data depends on.
+    """
+    if request.user.is_staff:
+        return "staff", get_versions([ALL, SHARED])
+    roles = get_roles(request)
+    scope = sorted(roles.workspaces.items())
+    return scope, get_versions([*roles.workspace_ids, SHARED])
+
+
+class ConditionalGetMixin:
+    """
+    ``ETag`` on ``list`` and ``retrieve``, plus ``Last-Modified`` on
+    ``retrieve``, so clients that poll get a 304 without the rows being read
+    or serialized.
+
+    A list is validated by the versions of the workspaces the user sees,
+    which every save and delete in them bumps, so building its ETag reads the
+    cache, not the database. The ETag also covers the user, the URL (page,
+    filters, ordering) and the response format. Cursor pages get none: they
+    are walked once, not polled.
+    """
+
+    def list(self, request, *args, **kwargs):
+        if isinstance(self.paginator, KeysetPagination):
+            return super().list(request, *args, **kwargs)
+        return self.conditional_response(
+            request,
+            None,
+            scoped_versions(request),
+            lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        return self.conditional_response(
+            request,
+            instance.updated,
+            instance.pk,
+            lambda: Response(self.get_serializer(instance).data),
+        )
+
+    def conditional_response(self, request, updated, version, respond):
+        """``respond()`` unless the client's copy is current (304)."""
+        validator = "|".join(
+            [
+                str(request.user.pk),
+                request.get_full_path(),
+                request.accepted_media_type,
+                updated.isoformat() if updated else "",
+                str(version),
+            ]
+        )
+        etag = quote_etag(md5(validator.encode(), usedforsecurity=False).hexdigest())
+        last_modified = int(updated.timestamp()) if updated else None
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = respond()
+        response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified)
+        return response
+
+
+class ResponseCacheMixin:
+    """
+    Keep rendered ``list`` responses in the default cache for
+    ``API_RESPONSE_CACHE_TIMEOUT`` seconds, shared by users with the same
+    role set.
+
+    The key holds the versions of the workspaces the user can see (see
+    ``core.versions``), their roles, the path, the accepted media type and
+    the normalized query parameters. Any write in one of those workspaces
+    bumps its version, so its cached pages are never served again and no key
+    has to be found or deleted. A hit still answers conditional requests
+    from the cached ``ETag``/``Last-Modified``.
+
+    Browsable API pages are never cached: they show the user's name and
+    CSRF token.
+    """
+
+    _response_cache_key = None
+
+    def list(self, request, *args, **kwargs):
+        if (
+            settings.API_RESPONSE_CACHE_TIMEOUT <= 0
+            or request.accepted_renderer.format == "api"
+        ):
+            return super().list(request, *args, **kwargs)
+        key = self.response_cache_key(request)
+        cached = cache.get(key)
+        if cached is None:
+            self._response_cache_key = key
+            return super().list(request, *args, **kwargs)
+
+        content, headers = cached
+        last_modified = headers.get("Last-Modified")
+        response = HttpResponse(content, headers=headers)
+        return get_conditional_response(
+            request,
+            etag=headers.get("ETag"),
+            last_modified=last_modified and parse_http_date(last_modified),
+            response=response,
+        )
+
+    def response_cache_key(self, request):
+        scope, versions = scoped_versions(request)
+        params = sorted(
+            (name, values)
+            for name, values in request.query_params.lists()
+            if any(values)
+        )
+        parts = [
+            # The next/previous links are absolute URLs.
+            request.scheme,
+            request.get_host(),
+            request.path,
+            request.accepted_media_type,
+            scope,
+            params,
+            versions,
+        ]
+        digest = md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+        return f"api:response:{digest}"
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if self._response_cache_key is not None and response.status_code == 200:
+            response.render()
+            headers = {
+                name: response[name]
+                for name in ("Content-Type", "ETag", "Last-Modified", "Vary")
+                if response.has_header(name)
+            }
+            cache.set(
+                self._response_cache_key,
+                (response.content, headers),
+                settings.API_RESPONSE_CACHE_TIMEOUT,
+            )
+        return response
+
+
+def _names(value):
+    """The names of a comma-separated query parameter, in order, once each."""
+    names = (name.strip() for name in (value or "").split(","))
+    return list(dict.fromkeys(name for name in names if name))
+
+
+class SparseFieldsetMixin:
+    """
+    Sparse fieldsets on reads:
+
+    - ``?fields=id,name,next_due_at`` keeps only those fields of each object;
+    - ``?expand=os,project`` renders the relations listed in the serializer's
+      ``expandable_fields`` as nested objects instead of ids (an expanded
+      field is kept even when ``fields`` leaves it out).
+
+    Unknown names are a 400. When either parameter is given, the queryset is
+    cut down to what the output reads (see ``api.planning``): ``only()`` the
+    columns, ``select_related()`` the expanded and slug relations, and only
+    the prefetches of the kept fields, so ``?fields=id,name`` on assets skips
+    the applications query.
+    """
+
+    @cached_property
+    def sparse_fieldset(self):
+        """``(fields, expand)``; ``fields`` is None when all are wanted."""
+        if self.request.method not in ("GET", "HEAD"):
+            return None, []
+        params = self.request.GET
+        fields, expand = _names(params.get("fields")), _names(params.get("expand"))
+        serializer_class = self.get_serializer_class()
+        readable = [
+            name
+            for name, field in serializer_class().fields.items()
+            if not field.write_only
+        ]
+        expandable = getattr(serializer_class, "expandable_fields", {})
+        errors = {}
+        unknown = [name for name in fields if name not in readable]
+        if unknown:
+            errors["fields"] = [f"Unknown fields: {', '.join(unknown)}."]
+        unknown = [name for name in expand if name not in expandable]
+        if unknown:
+            errors["expand"] = [f"Cannot expand: {', '.join(unknown)}."]
+        if errors:
+            raise ValidationError(errors)
+        return fields or None, expand
+
+    def sparse_extra_columns(self):
+        """
+        Columns read besides the serializer's: ``updated`` for the
+        validators of ``ConditionalGetMixin`` and the keyset of a cursor page.
+        """
+        columns = ["updated"]
+        if isinstance(self.paginator, KeysetPagination):
+            columns += [name.lstrip("-") for name in self.paginator.ordering]
+        return columns
+
+    def get_serializer(self, *args, **kwargs):
+        fields, expand = self.sparse_fieldset
+        if fields is not None:
+            kwargs.setdefault("fields", fields)
+        if expand:
+            kwargs.setdefault("expand", expand)
+        return super().get_serializer(*args, **kwargs)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields, expand = self.sparse_fieldset
+        if fields is None and not expand:
+            return queryset
+        plan = query_plan(self.get_serializer())
+        return plan.apply(queryset, extra_columns=self.sparse_extra_columns())
+
+
+class ValuesListMixin:
+    """
+    Build ``list`` pages with ``values_serializer_class`` (see ``api.values``)
+    from ``values()`` rows: the same items as ``get_serializer()``, sparse
+    fieldsets included, without a model instance or DRF field lookup per
+    row. Other actions are unchanged.
+    """
+
+    values_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.values_serializer_class(serializer=self.get_serializer())
+        queryset = serializer.values(
+            self.filter_queryset(self.get_queryset()),
+            extra=self.sparse_extra_columns(),
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serializer.to_representation(page))
+        return Response(serializer.to_representation(queryset))
+
+
+class ExportMixin:
+    """
+    ``<list>/export/?format=ndjson|csv``: every row the list endpoint would
+    return (same scoping, filters, search and ordering) without pagination,
+    streamed from ``QuerySet.iterator()`` so memory stays flat whatever the
+    table size. Related objects are prefetched per chunk.
+    """
+
+    @action(
+        detail=False,
+        methods=["get"],
+        renderer_classes=[NDJSONRenderer, CSVRenderer],
+        pagination_class=None,
+    )
+    def export(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer = self.get_serializer()
+        fields = [
+            name for name, field in serializer.fields.items() if not field.write_only
+        ]
+        rows = (
+            serializer.to_representation(obj)
+            for obj in queryset.iterator(chunk_size=settings.API_EXPORT_CHUNK_SIZE)
+        )
+        renderer = request.accepted_renderer
+        response = StreamingHttpResponse(
+            renderer.stream(rows, fields),
+            content_type=f"{renderer.media_type}; charset={renderer.charset}",
+        )
+        filename = f"{self.basename}.{renderer.format}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+class ResyncRequired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = (
+        "Deletions that old are no longer recorded; sync again without "
+        "updated_since."
+    )
+    default_code = "resync_required"
+
+
+class ChangeFeedMixin:
+    """
+    ``<list>/changes/?updated_since=<ISO 8601>``: the rows changed since a
+    point in time, for clients that sync incrementally. Same scoping and
+    filters as the list, ordered by ``(updated, id)`` with keyset pages (see
+    ``ChangeFeedPagination``); backed by the ``(workspace, updated, id)``
+    indexes.
+
+    The last page also lists under ``deleted`` the ids of the rows deleted
+    since then, from ``core.Tombstone``. Those are only kept for
+    ``TOMBSTONE_RETENTION_DAYS``, so an older ``updated_since`` gets a 410.
+    """
+
+    @action(detail=False, methods=["get"], pagination_class=ChangeFeedPagination)
+    def changes(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        since = IsoDateTimeField(required=False).clean(
+            request.query_params.get("updated_since")
+        )
+        horizon = timezone.now() - timedelta(days=settings.TOMBSTONE_RETENTION_DAYS)
+        if since is not None and since < horizon:
+            raise ResyncRequired()
+
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        response = self.get_paginated_response(serializer.data)
+        deleted = []
+        if since is not None and response.data["next"] is None:
+            deleted = self.deleted_since(since)
+        response.data["deleted"] = deleted
+        return response
+
+    def deleted_since(self, since):
+        tombstones = Tombstone.objects.filter(
+            model=self.get_queryset().model._meta.label_lower,
+            deleted_at__gte=since,
+        )
+        tombstones = self.filter_by_membership(tombstones)
+        return list(
+            tombstones.order_by("deleted_at", "object_id").values_list(
+                "object_id", flat=True
+            )
+        )
 
 
 # ---------- Core ViewSets ----------
@@ -100,7 +508,7 @@ class WorkspaceViewSet(WorkspaceScopedMixin, viewsets.ModelViewSet):
         if not user.is_authenticated or user.is_staff:
             return super().get_queryset()
         # For Workspace, filter by membership directly
-        return super().get_queryset().filter(memberships__user=user).distinct()
+        return super().get_queryset().filter(pk__in=self.member_workspace_ids())
 
 
 class MembershipViewSet(viewsets.ModelViewSet):
@@ -179,11 +587,21 @@ class ProjectViewSet(WorkspaceScopedMixin, viewsets.ModelViewSet):
         return self.filter_by_membership(super().get_queryset())
 
 
-class AssetViewSet(WorkspaceScopedMixin, viewsets.ModelViewSet):
+class AssetViewSet(
+    ResponseCacheMixin,
+    ConditionalGetMixin,
+    SparseFieldsetMixin,
+    ValuesListMixin,
+    ChangeFeedMixin,
+    ExportMixin,
+    WorkspaceScopedMixin,
+    viewsets.ModelViewSet,
+):
     queryset = Asset.objects.select_related(
         "workspace", "project", "form_factor", "os"
     ).prefetch_related("applications")
     serializer_class = AssetSerializer
+    values_serializer_class = AssetValuesSerializer
     permission_classes = [IsAuthenticatedReadOnlyOrManager]
     filter_backends = [
         filters.DjangoFilterBackend,
@@ -192,7 +610,14 @@ class AssetViewSet(WorkspaceScopedMixin, viewsets.ModelViewSet):
     ]
     filterset_class = AssetFilter
     search_fields = ["name", "location", "notes"]
-    ordering_fields = ["name", "purchase_date", "warranty_expires"]
+    ordering_fields = [
+        "name",
+        "purchase_date",
+        "warranty_expires",
+        "next_due_at",
+        "open_workorder_count",
+        "last_activity_at",
+    ]
     ordering = ["name"]
 
     def get_queryset(self):
@@ -202,14 +627,105 @@ class AssetViewSet(WorkspaceScopedMixin, viewsets.ModelViewSet):
 # ---------- Work ViewSets ----------
 
 
-class MaintenanceTaskViewSet(WorkspaceScopedMixin, viewsets.ModelViewSet):
+class BulkWriteMixin:
+    """
+    ``<list>/bulk/`` for agents and scripts that write hundreds of rows:
+
+    - POST a list of new objects,
+    - PATCH a list of partial updates, each with the ``id`` it changes,
+    - DELETE ``{"ids": [...]}``.
+
+    Every row is validated first (errors come back keyed by row index) and
+    related objects are resolved with one query per field; then everything is
+    written in one transaction with ``bulk_create``/``bulk_update``, followed
+    by one rollup refresh for the touched assets.
+    """
+
+    @action(detail=False, methods=["post", "patch", "delete"], url_path="bulk")
+    def bulk(self, request):
+        handler = {
+            "POST": self.bulk_create,
+            "PATCH": self.bulk_update,
+            "DELETE": self.bulk_destroy,
+        }[request.method]
+        return handler(request)
+
+    def get_bulk_serializer(self, *args, **kwargs):
+        return self.get_serializer(
+            *args, many=True, max_length=settings.API_BULK_MAX_ROWS, **kwargs
+        )
+
+    def get_bulk_objects(self, ids):
+        """The scoped objects for ``ids``; 404 unless all exist and may be written."""
+        try:
+            ids = {int(pk) for pk in ids}
+        except (TypeError, ValueError):
+            raise ValidationError({"ids": ["Expected a list of integer ids."]})
+        if len(ids) > settings.API_BULK_MAX_ROWS:
+            raise ValidationError(
+                {"ids": [f"At most {settings.API_BULK_MAX_ROWS} ids per request."]}
+            )
+        objs = list(self.get_queryset().filter(pk__in=ids))
+        missing = ids - {obj.pk for obj in objs}
+        if missing:
+            raise NotFound(f"Not found: {sorted(missing)}")
+        for obj in objs:
+            self.check_object_permissions(self.request, obj)
+        return objs
+
+    def bulk_create(self, request):
+        serializer = self.get_bulk_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            objs = serializer.save()
+            refresh_asset_rollups({obj.asset_id for obj in objs})
+            bump_workspace_versions({obj.workspace_id for obj in objs})
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    def bulk_update(self, request):
+        rows = request.data if isinstance(request.data, list) else []
+        ids = [row.get("id") for row in rows if isinstance(row, dict) and "id" in row]
+        objs = self.get_bulk_objects(ids)
+        before = {obj.asset_id for obj in objs}
+        workspaces_before = {obj.workspace_id for obj in objs}
+        serializer = self.get_bulk_serializer(objs, data=request.data, partial=True)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            objs = serializer.save()
+            refresh_asset_rollups(before | {obj.asset_id for obj in objs})
+            bump_workspace_versions(
+                workspaces_before | {obj.workspace_id for obj in objs}
+            )
+        return Response(serializer.data)
+
+    def bulk_destroy(self, request):
+        ids = request.data.get("ids") if isinstance(request.data, dict) else None
+        if not isinstance(ids, list):
+            raise ValidationError({"ids": ["Expected a list of integer ids."]})
+        objs = self.get_bulk_objects(ids)
+        # delete() refreshes the rollups per row; refresh them once instead.
+        with transaction.atomic(), deferred_rollups():
+            self.get_queryset().filter(pk__in=[obj.pk for obj in objs]).delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class MaintenanceTaskViewSet(
+    ResponseCacheMixin,
+    ConditionalGetMixin,
+    SparseFieldsetMixin,
+    ChangeFeedMixin,
+    WorkspaceScopedMixin,
+    viewsets.ModelViewSet,
+):
     queryset = MaintenanceTask.objects.select_related("workspace")
     serializer_class = MaintenanceTaskSerializer
     permission_classes = [IsAuthenticatedReadOnlyOrManager]
     filter_backends = [
+        filters.DjangoFilterBackend,
         drf_filters.SearchFilter,
         drf_filters.OrderingFilter,
     ]
+    filterset_class = MaintenanceTaskFilter
     search_fields = ["name", "cadence", "workspace__name"]
     ordering_fields = ["name", "cadence"]
     ordering = ["name"]
@@ -218,11 +734,24 @@ class MaintenanceTaskViewSet(WorkspaceScopedMixin, viewsets.ModelViewSet):
         return self.filter_by_membership(super().get_queryset())
 
 
-class WorkOrderViewSet(WorkspaceScopedMixin, viewsets.ModelViewSet):
+class WorkOrderViewSet(
+    ResponseCacheMixin,
+    ConditionalGetMixin,
+    SparseFieldsetMixin,
+    ValuesListMixin,
+    BulkWriteMixin,
+    ChangeFeedMixin,
+    ExportMixin,
+    CursorPaginationOptInMixin,
+    WorkspaceScopedMixin,
+    viewsets.ModelViewSet,
+):
     queryset = WorkOrder.objects.select_related(
         "workspace", "asset", "task", "assigned_to", "requested_by"
     )
     serializer_class = WorkOrderSerializer
+    values_serializer_class = WorkOrderValuesSerializer
+    cursor_pagination_class = WorkOrderCursorPagination
     permission_classes = [IsAuthenticatedReadOnlyOrManager]
     filter_backends = [
         filters.DjangoFilterBackend,
@@ -243,11 +772,24 @@ class WorkOrderViewSet(WorkspaceScopedMixin, viewsets.ModelViewSet):
         return self.filter_by_membership(super().get_queryset())
 
 
-class ActivityInstanceViewSet(WorkspaceScopedMixin, viewsets.ModelViewSet):
+class ActivityInstanceViewSet(
+    ResponseCacheMixin,
+    ConditionalGetMixin,
+    SparseFieldsetMixin,
+    ValuesListMixin,
+    BulkWriteMixin,
+    ChangeFeedMixin,
+    ExportMixin,
+    CursorPaginationOptInMixin,
+    WorkspaceScopedMixin,
+    viewsets.ModelViewSet,
+):
     queryset = ActivityInstance.objects.select_related(
         "workspace", "work_order", "asset", "performed_by"
     )
     serializer_class = ActivityInstanceSerializer
+    values_serializer_class = ActivityInstanceValuesSerializer
+    cursor_pagination_class = ActivityInstanceCursorPagination
     permission_classes = [IsAuthenticatedReadOnlyOrManager]
     filter_backends = [
         filters.DjangoFilterBackend,
@@ -1,5 +1,7 @@
 # assets/admin.py
 
+from datetime import timedelta
+
 from django.contrib import admin
 from django.utils import timezone
 
@@ -40,6 +42,39 @@ class ProjectAdmin(admin.ModelAdmin):
     ordering = ("workspace", "name")
 
 
+class NextDueFilter(admin.SimpleListFilter):
+    """
+    Filter assets by their next open WorkOrder (the ``next_due_at`` rollup).
+    """
+
+    title = "next work"
+    parameter_name = "next_due"
+
+    def lookups(self, request, model_admin):
+        return (
+            ("overdue", "Overdue"),
+            ("next_7_days", "Next 7 days"),
+            ("later", "Beyond 7 days"),
+            ("none", "No open work"),
+        )
+
+    def queryset(self, request, queryset):
+        value = self.value()
+        now = timezone.now()
+
+        if value == "overdue":
+            return queryset.filter(next_due_at__lt=now)
+        if value == "next_7_days":
+            return queryset.filter(
+                next_due_at__gte=now, next_due_at__lt=now + timedelta(days=7)
+            )
+        if value == "later":
+            return queryset.filter(next_due_at__gte=now + timedelta(days=7))
+        if value == "none":
+            return queryset.filter(next_due_at__isnull=True)
+        return queryset
+
+
 @admin.register(Asset)
 class AssetAdmin(admin.ModelAdmin):
     list_display = (
@@ -64,6 +99,7 @@ class AssetAdmin(admin.ModelAdmin):
         "location",
         "purchase_date",
         "warranty_expires",
+        NextDueFilter,
     )
     search_fields = (
         "name",
@@ -121,15 +157,15 @@ class AssetAdmin(admin.ModelAdmin):
         - 'Scheduled' (> 7 days)
         """
         now = timezone.now()
-        next_order = obj.workorders.filter(status="open").order_by("due").first()
+        next_due = obj.next_due_at  # rollup kept current by work.rollups
 
-        if not next_order:
+        if not next_due:
             return "No open work"
 
-        if next_order.due < now:
+        if next_due < now:
             return "Overdue"
 
-        days = (next_order.due.date() - now.date()).days
+        days = (next_due.date() - now.date()).days
         if days == 0:
             return "Due today"
         if days <= 7:
@@ -137,3 +173,4 @@ class AssetAdmin(admin.ModelAdmin):
         return "Scheduled"
 
     next_due_status.short_description = "Next work"
+    next_due_status.admin_order_field = "next_due_at"
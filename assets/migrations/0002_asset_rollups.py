@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:55
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_rollups(apps, schema_editor):
+    # Same computation as work.rollups.rollup_values(), on historical models.
+    Asset = apps.get_model("assets", "Asset")
+    WorkOrder = apps.get_model("work", "WorkOrder")
+    ActivityInstance = apps.get_model("work", "ActivityInstance")
+
+    open_orders = WorkOrder.objects.filter(asset=OuterRef("pk"), status="open")
+    open_count = (
+        open_orders.order_by().values("asset").annotate(n=Count("pk")).values("n")
+    )
+    last_activity = ActivityInstance.objects.filter(asset=OuterRef("pk")).order_by(
+        "-occurred_at"
+    )
+    Asset.objects.update(
+        next_due_at=Subquery(open_orders.order_by("due").values("due")[:1]),
+        open_workorder_count=Coalesce(Subquery(open_count), 0),
+        last_activity_at=Subquery(last_activity.values("occurred_at")[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assets", "0001_initial"),
+        ("work", "0004_alter_maintenancetask_cadence"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="asset",
+            name="last_activity_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="asset",
+            name="next_due_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="asset",
+            name="open_workorder_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:11
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assets", "0002_asset_rollups"),
+        ("core", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="asset",
+            name="created",
+            field=models.DateTimeField(
+                auto_now_add=True,
+                default=django.utils.timezone.now,
+                help_text="The date and time this object was created.",
+                verbose_name="Created",
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="asset",
+            name="updated",
+            field=models.DateTimeField(
+                auto_now=True,
+                help_text="The date and time this object was last updated.",
+                verbose_name="Updated",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="asset",
+            index=models.Index(
+                fields=["workspace", "updated", "id"], name="asset_ws_updated"
+            ),
+        ),
+    ]
@@ -2,6 +2,7 @@
 
 from django.db import models
 
+from base.models import CreatedUpdatedBase
 from core.models import Workspace
 
 
@@ -55,7 +56,7 @@ class Project(models.Model):
         return f"{self.workspace}: {self.name}"
 
 
-class Asset(models.Model):
+class Asset(CreatedUpdatedBase):
     workspace = models.ForeignKey(
         Workspace, on_delete=models.CASCADE, related_name="assets"
     )
@@ -73,7 +74,33 @@ class Asset(models.Model):
     warranty_expires = models.DateField(null=True, blank=True)
     notes = models.TextField(blank=True)
 
+    # Rollups of the asset's work, kept current by work.rollups (signals and
+    # the bulk paths); rebuild with `manage.py rebuild_asset_rollups`.
+    next_due_at = models.DateTimeField(null=True, blank=True, editable=False)
+    open_workorder_count = models.PositiveIntegerField(default=0, editable=False)
+    last_activity_at = models.DateTimeField(null=True, blank=True, editable=False)
+    ROLLUP_FIELDS = ("next_due_at", "open_workorder_count", "last_activity_at")
+
+    class Meta:
+        indexes = [
+            # Change feed: a workspace's rows by (updated, id).
+            models.Index(
+                fields=["workspace", "updated", "id"], name="asset_ws_updated"
+            ),
+        ]
+
     def __str__(self) -> str:
         # e.g. "Remote Lamp (PI) @ Homelab"
         kind_display = dict(self.KIND_CHOICES).get(self.kind, self.kind)
         return f"{self.name} ({kind_display}) @ {self.workspace}"
+
+    def save(self, *args, **kwargs):
+        # An instance loaded before its work changed must not write stale
+        # rollups back; only work.rollups updates those columns.
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.ROLLUP_FIELDS
+            ]
+        super().save(*args, **kwargs)
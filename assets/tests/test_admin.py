@@ -4,12 +4,16 @@ from datetime import date, datetime, timedelta
 
 import pytest
 from django.contrib import admin as dj_admin
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from assets.admin import (
     ApplicationAdmin,
     AssetAdmin,
     FormFactorAdmin,
+    NextDueFilter,
     OSAdmin,
     ProjectAdmin,
 )
@@ -185,8 +189,13 @@ def test_next_due_status_variants(monkeypatch):
     ma = AssetAdmin(Asset, dj_admin.site)
     now = fixed_now
 
+    def next_due_status():
+        # The chip reads the rollup column, which is updated in the database.
+        asset.refresh_from_db()
+        return ma.next_due_status(asset)
+
     # No work orders
-    assert ma.next_due_status(asset) == "No open work"
+    assert next_due_status() == "No open work"
 
     # Overdue
     overdue = WorkOrder.objects.create(
@@ -196,7 +205,7 @@ def test_next_due_status_variants(monkeypatch):
         due=now - timedelta(days=1),
         status="open",
     )
-    assert ma.next_due_status(asset) == "Overdue"
+    assert next_due_status() == "Overdue"
 
     # Due today (same calendar date, later in the day)
     overdue.status = "done"
@@ -208,7 +217,7 @@ def test_next_due_status_variants(monkeypatch):
         due=now + timedelta(hours=1),
         status="open",
     )
-    assert ma.next_due_status(asset) == "Due today"
+    assert next_due_status() == "Due today"
 
     # Due soon (within a week)
     due_today.status = "done"
@@ -220,7 +229,7 @@ def test_next_due_status_variants(monkeypatch):
         due=now + timedelta(days=3),
         status="open",
     )
-    assert ma.next_due_status(asset) == "Due soon"
+    assert next_due_status() == "Due soon"
 
     # Scheduled (> 7 days)
     due_soon.status = "done"
@@ -232,4 +241,84 @@ def test_next_due_status_variants(monkeypatch):
         due=now + timedelta(days=10),
         status="open",
     )
-    assert ma.next_due_status(asset) == "Scheduled"
+    assert next_due_status() == "Scheduled"
+
+
+@pytest.fixture
+def due_fleet(workspace, now):
+    """Three assets: overdue, due in three days, and without open work."""
+    task = MaintenanceTask.objects.create(
+        workspace=workspace, name="Task", cadence="monthly"
+    )
+    assets = {}
+    for name, delta in (("late", -1), ("soon", 3), ("idle", None)):
+        assets[name] = asset = Asset.objects.create(
+            workspace=workspace, name=name, kind="PI"
+        )
+        if delta is not None:
+            WorkOrder.objects.create(
+                workspace=workspace,
+                asset=asset,
+                task=task,
+                due=now + timedelta(days=delta),
+                status="open",
+            )
+            WorkOrder.objects.create(
+                workspace=workspace,
+                asset=asset,
+                task=task,
+                due=now + timedelta(days=delta - 5),
+                status="done",
+            )
+    return assets
+
+
+@pytest.mark.django_db
+def test_next_due_status_reads_the_rollup_column(
+    due_fleet, django_assert_num_queries
+):
+    ma = AssetAdmin(Asset, dj_admin.site)
+    request = RequestFactory().get("/admin/assets/asset/")
+
+    with django_assert_num_queries(1):
+        statuses = {a.name: ma.next_due_status(a) for a in ma.get_queryset(request)}
+
+    assert statuses == {"late": "Overdue", "soon": "Due soon", "idle": "No open work"}
+    assert AssetAdmin.next_due_status.admin_order_field == "next_due_at"
+
+
+@pytest.mark.django_db
+def test_asset_changelist_queries_do_not_grow_with_rows(
+    admin_client, workspace, due_fleet
+):
+    def changelist_queries():
+        with CaptureQueriesContext(connection) as ctx:
+            response = admin_client.get("/admin/assets/asset/")
+        assert response.status_code == 200
+        return len(ctx.captured_queries)
+
+    before = changelist_queries()
+    for i in range(5):
+        Asset.objects.create(workspace=workspace, name=f"extra-{i}", kind="PI")
+
+    assert changelist_queries() == before
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("overdue", {"late"}),
+        ("next_7_days", {"soon"}),
+        ("later", set()),
+        ("none", {"idle"}),
+    ],
+)
+def test_next_due_filter(due_fleet, value, expected):
+    ma = AssetAdmin(Asset, dj_admin.site)
+    request = RequestFactory().get("/admin/assets/asset/")
+    list_filter = NextDueFilter(request, {"next_due": [value]}, Asset, ma)
+
+    queryset = list_filter.queryset(request, ma.get_queryset(request))
+
+    assert set(queryset.values_list("name", flat=True)) == expected
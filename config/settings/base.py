@@ -182,8 +182,21 @@ REST_FRAMEWORK = {
         # Custom project-wide API permission.
         "api.permissions.IsAuthenticatedReadOnlyOrManager",
     ],
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    # orjson-backed JSON (same bytes as DRF's); plain DRF without orjson.
+    "DEFAULT_RENDERER_CLASSES": [
+        "api.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "api.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+    # Page numbers; large lists get an approximate count (see below).
+    "DEFAULT_PAGINATION_CLASS": "api.pagination.EstimatedCountPagination",
     "PAGE_SIZE": 20,
+    # Bulk endpoints report row errors as {row_index: errors}.
+    "LIST_SERIALIZER_ERRORS_AS_DICT": True,
     "DEFAULT_FILTER_BACKENDS": [
         "django_filters.rest_framework.DjangoFilterBackend",
         "rest_framework.filters.OrderingFilter",
@@ -199,6 +212,23 @@ REST_FRAMEWORK = {
     },
 }
 
+# Most rows accepted by one request to the <list>/bulk/ endpoints.
+API_BULK_MAX_ROWS = int(os.getenv("API_BULK_MAX_ROWS", "1000"))
+# Rows fetched per round trip by the <list>/export/ endpoints.
+API_EXPORT_CHUNK_SIZE = int(os.getenv("API_EXPORT_CHUNK_SIZE", "2000"))
+# Seconds a rendered API list page stays in the cache (api.views
+# .ResponseCacheMixin); writes invalidate it sooner. 0 turns the cache off.
+API_RESPONSE_CACHE_TIMEOUT = int(os.getenv("API_RESPONSE_CACHE_TIMEOUT", "60"))
+# From this many rows on, list pages may report an approximate count
+# (api.pagination.EstimatedCountPaginator): the planner's estimate on
+# PostgreSQL, elsewhere an exact count cached for API_COUNT_CACHE_TIMEOUT
+# seconds. 0 always counts exactly.
+API_COUNT_ESTIMATE_THRESHOLD = int(os.getenv("API_COUNT_ESTIMATE_THRESHOLD", "10000"))
+API_COUNT_CACHE_TIMEOUT = int(os.getenv("API_COUNT_CACHE_TIMEOUT", "300"))
+# Days deletions stay visible to the <list>/changes/ feeds (core.Tombstone).
+# Clients that last synced before that must sync from scratch.
+TOMBSTONE_RETENTION_DAYS = int(os.getenv("TOMBSTONE_RETENTION_DAYS", "30"))
+
 # ---------------------------------------------------------------------------
 # Email
 # ---------------------------------------------------------------------------
@@ -253,6 +283,17 @@ CELERY_TASK_ALWAYS_EAGER = (
     os.getenv("CELERY_TASK_ALWAYS_EAGER", "False").lower() == "true"
 )
 
+# Work-order generation (work.tasks.generate_workorders).
+# How far ahead to create WorkOrders, and how many rows go into one INSERT.
+WORKORDER_HORIZON_DAYS = int(os.getenv("WORKORDER_HORIZON_DAYS", "30"))
+WORKORDER_BATCH_SIZE = int(os.getenv("WORKORDER_BATCH_SIZE", "1000"))
+# "upsert" relies on the (task, asset, due) unique constraint (ON CONFLICT DO
+# NOTHING); "diff" pre-reads the window and only inserts missing rows.
+WORKORDER_GENERATOR_MODE = os.getenv("WORKORDER_GENERATOR_MODE", "upsert")
+# Workspaces with more assets than this are split into asset-id ranges that
+# are generated by separate subtasks.
+WORKORDER_SHARD_SIZE = int(os.getenv("WORKORDER_SHARD_SIZE", "5000"))
+
 # ---------------------------------------------------------------------------
 # Caching / sessions
 # ---------------------------------------------------------------------------
@@ -283,6 +324,10 @@ CACHES = {
 SESSION_ENGINE = "django.contrib.sessions.backends.cache"
 SESSION_CACHE_ALIAS = "default"
 
+# Seconds a user's groups and workspace roles stay in the cache between API
+# requests (api.roles); 0 loads them from the database on every request.
+API_ROLES_CACHE_TIMEOUT = int(os.getenv("API_ROLES_CACHE_TIMEOUT", "300"))
+
 # ---------------------------------------------------------------------------
 # Logging
 # ---------------------------------------------------------------------------
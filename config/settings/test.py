@@ -14,3 +14,19 @@ EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
 
 # Run Celery tasks synchronously during tests so you don't need a worker.
 CELERY_TASK_ALWAYS_EAGER = True  # run tasks inline during tests
+
+# Keep Celery results in memory; chords register their results with the
+# backend even when eager, and tests must not need Redis.
+CELERY_RESULT_BACKEND = "cache+memory://"
+
+# Test transactions roll back and reuse primary keys, so a user's cached roles
+# could outlive the test that created them. Tests that exercise the cache
+# turn it on with override_settings.
+API_ROLES_CACHE_TIMEOUT = 0
+
+# Workspace versions live in the cache too and would outlive a test's
+# rolled-back rows the same way.
+API_RESPONSE_CACHE_TIMEOUT = 0
+
+# Cached counts would outlive the rows too.
+API_COUNT_CACHE_TIMEOUT = 0
@@ -2,6 +2,7 @@
 
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
 
 class Workspace(models.Model):
@@ -29,3 +30,30 @@ class Membership(models.Model):
 
     def __str__(self) -> str:
         return f"{self.user} → {self.workspace} ({self.role})"
+
+
+class Tombstone(models.Model):
+    """
+    A deleted workspace-scoped row, so the API change feeds can report it.
+
+    Written by ``core.signals``; ``workspace_id`` is a plain column rather
+    than a foreign key, so the tombstones of a deleted workspace's rows
+    outlive it. ``core.tasks.prune_tombstones`` drops them after
+    ``TOMBSTONE_RETENTION_DAYS``.
+    """
+
+    model = models.CharField(max_length=100)  # label_lower, e.g. "work.workorder"
+    object_id = models.BigIntegerField()
+    workspace_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["model", "workspace_id", "deleted_at"],
+                name="tombstone_model_ws_deleted",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.model} #{self.object_id} (deleted {self.deleted_at:%Y-%m-%d})"
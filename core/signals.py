@@ -0,0 +1,207 @@
+# core/signals.py
+
+from django.apps import apps
+from django.conf import settings
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete, pre_save)
+
+from .models import Tombstone
+from .versions import SHARED, bump_versions, bump_workspace_versions
+
+# Workspace-scoped models whose deletions are reported by the change feeds.
+TOMBSTONED_MODELS = (
+    "assets.Asset",
+    "work.MaintenanceTask",
+    "work.WorkOrder",
+    "work.ActivityInstance",
+)
+# Workspace-scoped models whose writes bump their workspace's version.
+VERSIONED_MODELS = TOMBSTONED_MODELS + ("assets.Project",)
+# Lookup models shown by every workspace; their writes bump ``SHARED``.
+SHARED_MODELS = (
+    "core.Workspace",
+    "assets.OS",
+    "assets.FormFactor",
+    "assets.Application",
+)
+
+
+class _PendingTombstones:
+    __slots__ = ("remaining", "rows")
+
+    def __init__(self):
+        self.remaining = 0
+        self.rows = []
+
+
+def count_tombstone(sender, instance, origin=None, **kwargs) -> None:
+    """
+    A delete sends ``pre_delete`` for every collected row (cascades
+    included) before it deletes anything, then ``post_delete`` for the same
+    rows, all with the ``origin`` of the delete: the instance or queryset it
+    was called on. Counting the rows here lets ``record_tombstone`` tell
+    which ``post_delete`` is the last one of that delete.
+    """
+    if origin is None:
+        return
+    pending = getattr(origin, "_pending_tombstones", None)
+    if pending is None:
+        pending = origin._pending_tombstones = _PendingTombstones()
+    pending.remaining += 1
+
+
+def record_tombstone(sender, instance, origin=None, **kwargs) -> None:
+    """
+    Buffer a tombstone for the deleted row and write the whole delete's
+    tombstones with one ``bulk_create`` after its last row, inside the
+    delete's transaction.
+    """
+    tombstone = Tombstone(
+        model=sender._meta.label_lower,
+        object_id=instance.pk,
+        workspace_id=instance.workspace_id,
+    )
+    pending = getattr(origin, "_pending_tombstones", None)
+    if pending is None:
+        tombstone.save()
+        bump_workspace_versions({tombstone.workspace_id})
+        return
+    pending.rows.append(tombstone)
+    pending.remaining -= 1
+    if pending.remaining <= 0:
+        del origin._pending_tombstones
+        Tombstone.objects.bulk_create(pending.rows)
+        bump_workspace_versions({row.workspace_id for row in pending.rows})
+
+
+def remember_previous_workspace(sender, instance, raw=False, **kwargs) -> None:
+    """
+    Before an existing row is saved, note the workspace it belonged to, so a
+    row moved to another workspace also bumps the one it left.
+    """
+    if raw or instance.pk is None:
+        return
+    instance._previous_workspace_id = (
+        sender.objects.filter(pk=instance.pk)
+        .values_list("workspace_id", flat=True)
+        .first()
+    )
+
+
+def bump_version_on_save(sender, instance, **kwargs) -> None:
+    previous = getattr(instance, "_previous_workspace_id", None)
+    bump_workspace_versions({instance.workspace_id, previous})
+
+
+def bump_version_on_delete(sender, instance, **kwargs) -> None:
+    bump_workspace_versions({instance.workspace_id})
+
+
+def bump_shared_version(sender, **kwargs) -> None:
+    bump_versions([SHARED])
+
+
+def remember_previous_username(
+    sender, instance, raw=False, update_fields=None, **kwargs
+) -> None:
+    """
+    Work orders and activities show their users by username: note it before
+    a save that may change it. Logins only save ``last_login``.
+    """
+    if raw or instance.pk is None:
+        return
+    if update_fields is not None and "username" not in update_fields:
+        return
+    instance._previous_username = (
+        sender.objects.filter(pk=instance.pk).values_list("username", flat=True).first()
+    )
+
+
+def bump_shared_version_on_rename(sender, instance, **kwargs) -> None:
+    previous = instance.__dict__.pop("_previous_username", None)
+    if previous is not None and previous != instance.username:
+        bump_versions([SHARED])
+
+
+def bump_version_on_applications_changed(
+    sender, instance, action, reverse, **kwargs
+) -> None:
+    """``asset.applications`` changed; from the application side, any asset."""
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse:
+        bump_versions([SHARED])
+    else:
+        bump_workspace_versions({instance.workspace_id})
+
+
+def connect_signals():
+    for label in TOMBSTONED_MODELS:
+        model = apps.get_model(label)
+        uid = model._meta.label_lower
+        pre_delete.connect(
+            count_tombstone,
+            sender=model,
+            dispatch_uid=f"{uid}_count_tombstone",
+        )
+        post_delete.connect(
+            record_tombstone,
+            sender=model,
+            dispatch_uid=f"{uid}_record_tombstone",
+        )
+    for label in VERSIONED_MODELS:
+        model = apps.get_model(label)
+        uid = model._meta.label_lower
+        pre_save.connect(
+            remember_previous_workspace,
+            sender=model,
+            dispatch_uid=f"{uid}_remember_previous_workspace",
+        )
+        post_save.connect(
+            bump_version_on_save,
+            sender=model,
+            dispatch_uid=f"{uid}_bump_version_on_save",
+        )
+        if label not in TOMBSTONED_MODELS:
+            # Tombstoned models bump once per delete in record_tombstone.
+            post_delete.connect(
+                bump_version_on_delete,
+                sender=model,
+                dispatch_uid=f"{uid}_bump_version_on_delete",
+            )
+    for label in SHARED_MODELS:
+        model = apps.get_model(label)
+        uid = model._meta.label_lower
+        post_save.connect(
+            bump_shared_version,
+            sender=model,
+            dispatch_uid=f"{uid}_bump_shared_version_on_save",
+        )
+        post_delete.connect(
+            bump_shared_version,
+            sender=model,
+            dispatch_uid=f"{uid}_bump_shared_version_on_delete",
+        )
+    # A user's rename changes the pages that show them; deleting one nulls
+    # their work orders and activities with an UPDATE that sends no signals.
+    user = apps.get_model(settings.AUTH_USER_MODEL)
+    pre_save.connect(
+        remember_previous_username,
+        sender=user,
+        dispatch_uid="user_remember_previous_username",
+    )
+    post_save.connect(
+        bump_shared_version_on_rename,
+        sender=user,
+        dispatch_uid="user_bump_shared_version_on_rename",
+    )
+    post_delete.connect(
+        bump_shared_version,
+        sender=user,
+        dispatch_uid="user_bump_shared_version_on_delete",
+    )
+    m2m_changed.connect(
+        bump_version_on_applications_changed,
+        sender=apps.get_model("assets.Asset").applications.through,
+        dispatch_uid="asset_applications_bump_version",
+    )
@@ -0,0 +1,97 @@
+# core/tasks.py
+
+import logging
+from datetime import datetime, time, timedelta
+
+from celery import shared_task
+from django.conf import settings
+from django.db.models import Count, Exists, Min, OuterRef
+from django.utils import timezone
+
+from work.models import ActivityInstance, WorkOrder
+from work.rollups import refresh_asset_rollups
+
+from .models import Tombstone, Workspace
+from .versions import bump_workspace_versions
+
+logger = logging.getLogger(__name__)
+
+
+def _overdue_by_asset(workspace_id, now):
+    """
+    One aggregate query: ``(asset_id, overdue, oldest_due)`` for every asset
+    of the workspace with open WorkOrders past due that has not been checked
+    yet today.
+    """
+    day_start = datetime.combine(timezone.localdate(now), time.min)
+    checked_today = ActivityInstance.objects.filter(
+        asset_id=OuterRef("asset_id"),
+        kind="checked",
+        occurred_at__gte=timezone.make_aware(day_start),
+    )
+    return (
+        WorkOrder.objects.filter(workspace_id=workspace_id, status="open", due__lt=now)
+        .filter(~Exists(checked_today))
+        .values("asset_id")
+        .annotate(overdue=Count("id"), oldest_due=Min("due"))
+        .values_list("asset_id", "overdue", "oldest_due")
+        .order_by("asset_id")
+    )
+
+
+@shared_task(bind=True)
+def daily_asset_healthcheck(self, workspace_id=None):
+    """
+    Flag assets with overdue work by recording an
+    ``ActivityInstance(kind="checked")`` with the overdue count and the oldest
+    due date in its note.
+
+    Runs one aggregate query per workspace (or only ``workspace_id``) and a
+    single ``bulk_create`` for all activities, then refreshes the rollups of
+    the flagged assets. Assets already checked today are skipped, so the task
+    can safely run more than once a day.
+    """
+    now = timezone.now()
+    workspace_ids = Workspace.objects.values_list("id", flat=True)
+    if workspace_id is not None:
+        workspace_ids = workspace_ids.filter(id=workspace_id)
+
+    activities = []
+    totals = {"workspaces": 0, "assets": 0, "overdue": 0}
+    for ws_id in workspace_ids:
+        totals["workspaces"] += 1
+        for asset_id, overdue, oldest_due in _overdue_by_asset(ws_id, now):
+            activities.append(
+                ActivityInstance(
+                    workspace_id=ws_id,
+                    asset_id=asset_id,
+                    kind="checked",
+                    occurred_at=now,
+                    note=(
+                        f"Healthcheck: {overdue} overdue work order(s), oldest due "
+                        f"{timezone.localtime(oldest_due):%Y-%m-%d}."
+                    ),
+                )
+            )
+            totals["overdue"] += overdue
+
+    ActivityInstance.objects.bulk_create(activities)
+    refresh_asset_rollups({activity.asset_id for activity in activities})
+    bump_workspace_versions({activity.workspace_id for activity in activities})
+    totals["assets"] = len(activities)
+
+    logger.info(
+        "daily_asset_healthcheck finished. Task id=%s totals=%s",
+        self.request.id,
+        totals,
+    )
+    return totals
+
+
+@shared_task
+def prune_tombstones():
+    """Delete tombstones older than ``TOMBSTONE_RETENTION_DAYS``."""
+    cutoff = timezone.now() - timedelta(days=settings.TOMBSTONE_RETENTION_DAYS)
+    deleted, _ = Tombstone.objects.filter(deleted_at__lt=cutoff).delete()
+    logger.info("prune_tombstones removed %s tombstone(s)", deleted)
+    return deleted
@@ -0,0 +1,79 @@
+# core/tests/test_tasks.py
+
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from assets.models import Asset
+from core.tasks import daily_asset_healthcheck
+from work.models import ActivityInstance, MaintenanceTask, WorkOrder
+
+
+@pytest.fixture
+def overdue_fleet(workspace, another_workspace, now):
+    task = MaintenanceTask.objects.create(
+        workspace=workspace, name="Patch OS", cadence="monthly"
+    )
+    late, fine, other = (
+        Asset.objects.create(workspace=workspace, name="late", kind="PI"),
+        Asset.objects.create(workspace=workspace, name="fine", kind="PI"),
+        Asset.objects.create(workspace=another_workspace, name="other", kind="PI"),
+    )
+    other_task = MaintenanceTask.objects.create(
+        workspace=another_workspace, name="Patch OS", cadence="monthly"
+    )
+
+    def order(asset, due, status="open", task=task):
+        WorkOrder.objects.create(
+            workspace=asset.workspace, asset=asset, task=task, due=due, status=status
+        )
+
+    order(late, now - timedelta(days=10))
+    order(late, now - timedelta(days=3))
+    order(late, now + timedelta(days=3))
+    order(fine, now - timedelta(days=5), status="done")
+    order(fine, now + timedelta(days=1))
+    order(other, now - timedelta(days=1), task=other_task)
+    return late, fine, other
+
+
+@pytest.mark.django_db
+def test_healthcheck_records_one_checked_activity_per_overdue_asset(overdue_fleet, now):
+    late, fine, other = overdue_fleet
+
+    totals = daily_asset_healthcheck.delay().get()
+
+    assert totals == {"workspaces": 2, "assets": 2, "overdue": 3}
+    checked = ActivityInstance.objects.filter(kind="checked")
+    assert set(checked.values_list("asset_id", flat=True)) == {late.id, other.id}
+    note = checked.get(asset=late).note
+    assert "2 overdue work order(s)" in note
+    assert f"{timezone.localtime(now - timedelta(days=10)):%Y-%m-%d}" in note
+    assert checked.get(asset=late).workspace_id == late.workspace_id
+
+
+@pytest.mark.django_db
+def test_healthcheck_uses_one_query_per_workspace(
+    overdue_fleet, django_assert_num_queries
+):
+    # workspaces + 1 aggregate per workspace + 1 bulk insert + asset rollups
+    with django_assert_num_queries(5):
+        daily_asset_healthcheck.delay().get()
+
+
+@pytest.mark.django_db
+def test_healthcheck_skips_assets_already_checked_today(overdue_fleet):
+    daily_asset_healthcheck.delay().get()
+
+    totals = daily_asset_healthcheck.delay().get()
+
+    assert totals == {"workspaces": 2, "assets": 0, "overdue": 0}
+    assert ActivityInstance.objects.filter(kind="checked").count() == 2
+
+
+@pytest.mark.django_db
+def test_healthcheck_single_workspace(overdue_fleet, another_workspace):
+    totals = daily_asset_healthcheck.delay(workspace_id=another_workspace.id).get()
+
+    assert totals == {"workspaces": 1, "assets": 1, "overdue": 1}
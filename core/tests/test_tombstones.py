@@ -0,0 +1,108 @@
+# core/tests/test_tombstones.py
+
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from assets.models import Asset
+from core.models import Tombstone
+from core.tasks import prune_tombstones
+from work.models import ActivityInstance, MaintenanceTask, WorkOrder
+
+
+@pytest.fixture
+def fleet(workspace, now):
+    task = MaintenanceTask.objects.create(
+        workspace=workspace, name="Patch OS", cadence="monthly"
+    )
+    assets = [
+        Asset.objects.create(workspace=workspace, name=f"Pi-{i}", kind="PI")
+        for i in range(3)
+    ]
+    for asset in assets:
+        WorkOrder.objects.create(workspace=workspace, asset=asset, task=task, due=now)
+        ActivityInstance.objects.create(
+            workspace=workspace, asset=asset, kind="checked", occurred_at=now
+        )
+    return task, assets
+
+
+def _tombstones():
+    return sorted(Tombstone.objects.values_list("model", "object_id", "workspace_id"))
+
+
+def _inserts(queries):
+    return [q for q in queries if q["sql"].startswith('INSERT INTO "core_tombstone"')]
+
+
+@pytest.mark.django_db
+def test_instance_delete_writes_a_tombstone(workspace, fleet):
+    task, assets = fleet
+    order = WorkOrder.objects.filter(asset=assets[0]).get()
+    pk = order.pk
+
+    order.delete()
+
+    assert _tombstones() == [("work.workorder", pk, workspace.pk)]
+
+
+@pytest.mark.django_db
+def test_queryset_delete_writes_tombstones_in_one_insert(workspace, fleet):
+    ids = list(WorkOrder.objects.values_list("pk", flat=True))
+
+    with CaptureQueriesContext(connection) as ctx:
+        WorkOrder.objects.all().delete()
+
+    assert _tombstones() == [("work.workorder", pk, workspace.pk) for pk in ids]
+    assert len(_inserts(ctx.captured_queries)) == 1
+
+
+@pytest.mark.django_db
+def test_cascades_are_tombstoned(workspace, fleet):
+    """Deleting assets tombstones the work orders and activities they cascade to."""
+    task, assets = fleet
+    expected = {("assets.asset", asset.pk) for asset in assets[:2]}
+    expected |= {
+        ("work.workorder", pk)
+        for pk in WorkOrder.objects.filter(asset__in=assets[:2]).values_list(
+            "pk", flat=True
+        )
+    }
+    expected |= {
+        ("work.activityinstance", pk)
+        for pk in ActivityInstance.objects.filter(asset__in=assets[:2]).values_list(
+            "pk", flat=True
+        )
+    }
+
+    with CaptureQueriesContext(connection) as ctx:
+        Asset.objects.filter(pk__in=[asset.pk for asset in assets[:2]]).delete()
+
+    assert {row[:2] for row in _tombstones()} == expected
+    assert {row[2] for row in _tombstones()} == {workspace.pk}
+    assert len(_inserts(ctx.captured_queries)) == 1
+
+
+@pytest.mark.django_db
+def test_prune_tombstones_drops_old_rows(settings, workspace):
+    settings.TOMBSTONE_RETENTION_DAYS = 30
+    now = timezone.now()
+    old = Tombstone.objects.create(
+        model="work.workorder",
+        object_id=1,
+        workspace_id=workspace.pk,
+        deleted_at=now - timedelta(days=31),
+    )
+    recent = Tombstone.objects.create(
+        model="work.workorder",
+        object_id=2,
+        workspace_id=workspace.pk,
+        deleted_at=now - timedelta(days=29),
+    )
+
+    assert prune_tombstones() == 1
+    assert list(Tombstone.objects.all()) == [recent]
+    assert not Tombstone.objects.filter(pk=old.pk).exists()
@@ -0,0 +1,56 @@
+# core/tests/test_versions.py
+
+import pytest
+from django.core.cache import cache
+
+from assets.models import OS, Asset
+from core.versions import ALL, SHARED, get_versions
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.mark.django_db
+def test_versions_are_stable_until_bumped(workspace):
+    assert get_versions([workspace.pk, ALL]) == get_versions([workspace.pk, ALL])
+
+
+@pytest.mark.django_db
+def test_saves_and_deletes_bump_their_workspace(workspace, another_workspace):
+    names = [workspace.pk, another_workspace.pk, ALL, SHARED]
+    before = get_versions(names)
+
+    asset = Asset.objects.create(workspace=workspace, name="Pi-001", kind="PI")
+    after_save = get_versions(names)
+    asset.delete()
+    after_delete = get_versions(names)
+
+    assert after_save[0] != before[0] and after_save[2] != before[2]
+    assert after_save[1::2] == before[1::2]
+    assert after_delete[0] != after_save[0]
+
+
+@pytest.mark.django_db
+def test_moving_a_row_bumps_both_workspaces(workspace, another_workspace):
+    asset = Asset.objects.create(workspace=workspace, name="Pi-001", kind="PI")
+    before = get_versions([workspace.pk, another_workspace.pk])
+
+    asset.workspace = another_workspace
+    asset.save()
+
+    after = get_versions([workspace.pk, another_workspace.pk])
+    assert after[0] != before[0] and after[1] != before[1]
+
+
+@pytest.mark.django_db
+def test_lookup_tables_bump_the_shared_version(workspace):
+    before = get_versions([workspace.pk, SHARED])
+
+    OS.objects.create(name="Debian", version="12", slug="debian-12")
+
+    after = get_versions([workspace.pk, SHARED])
+    assert after[0] == before[0] and after[1] != before[1]
@@ -0,0 +1,66 @@
+# core/versions.py
+
+"""
+Workspace versions: opaque tokens in the default cache that change whenever
+data of a workspace changes.
+
+Caches of derived data (the API response cache) put the versions they depend
+on into their keys, so a bump makes the old entries unreachable at once,
+without finding or deleting them; they expire on their own. Besides one
+version per workspace there are two shared ones: ``ALL`` changes with every
+workspace bump (for views that span all workspaces) and ``SHARED`` with the
+lookup tables every workspace shows (workspaces, OS, form factors,
+applications).
+
+``core.signals`` bumps on saves and deletes; bulk writes that skip signals
+(``bulk_create``, ``bulk_update``, ``QuerySet.update``) call
+``bump_workspace_versions`` themselves.
+"""
+
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db import transaction
+
+ALL = "all"
+SHARED = "shared"
+
+
+def version_key(name) -> str:
+    return f"core:version:{name}"
+
+
+def get_versions(names) -> list:
+    """The current token of each version in ``names``, in one cache read."""
+    keys = [version_key(name) for name in names]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # Never bumped, or evicted: start with a fresh token, never with
+            # one an older entry may have been keyed on.
+            cache.add(key, uuid4().hex, None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def _set_new_tokens(keys) -> None:
+    cache.set_many({key: uuid4().hex for key in keys}, None)
+
+
+def bump_versions(names) -> None:
+    """
+    Give ``names`` new tokens now and again once the transaction commits: a
+    reader that caches the old rows between the two still keys its entry on
+    the first new token, which the second bump leaves behind.
+    """
+    keys = sorted({version_key(name) for name in names})
+    if not keys:
+        return
+    _set_new_tokens(keys)
+    transaction.on_commit(lambda: _set_new_tokens(keys))
+
+
+def bump_workspace_versions(workspace_ids) -> None:
+    ids = {pk for pk in workspace_ids if pk is not None}
+    if ids:
+        bump_versions([*ids, ALL])
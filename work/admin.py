@@ -1,11 +1,26 @@
 # work/admin.py
 
 from datetime import timedelta
+from itertools import chain, islice
+from urllib.parse import urlencode
 
 from django.contrib import admin
+from django.core.exceptions import PermissionDenied
+from django.core.paginator import Paginator
+from django.http import HttpResponseRedirect, StreamingHttpResponse
+from django.template.loader import render_to_string
+from django.urls import path, reverse
 from django.utils import timezone
+from django.utils.formats import date_format
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
 
+from assets.models import Asset
+from core.versions import bump_workspace_versions
+
+from .cadence import ANCHOR_FIELDS, CadenceError
 from .models import ActivityInstance, MaintenanceTask, WorkOrder
+from .rollups import refresh_asset_rollups
 
 
 class WorkOrderInline(admin.TabularInline):
@@ -83,17 +98,155 @@ class MaintenanceTaskAdmin(admin.ModelAdmin):
     # Admin polish: "Generate Preview" action
     actions = ("generate_preview",)
 
-    # TODO: implement preview generation
+    # Schedule preview: assets per page, occurrences per asset, and how far
+    # ahead to look for them (a cadence may never produce a date).
+    preview_page_size = 100
+    preview_occurrences = 5
+    preview_max_occurrences = 52
+    preview_horizon = timedelta(days=366 * preview_max_occurrences)
+
+    def get_urls(self):
+        info = self.opts.app_label, self.opts.model_name
+        preview = path(
+            "preview/",
+            self.admin_site.admin_view(self.preview_view),
+            name="%s_%s_preview" % info,
+        )
+        return [preview] + super().get_urls()
+
     @admin.action(description="Generate preview schedule (no DB changes)")
     def generate_preview(self, request, queryset):
         """
-        Admin action stub that can be extended to generate a preview schedule.
+        Send the user to the schedule preview of the selected tasks.
+
+        The preview only reads; nothing is written to the database.
+        """
+        ids = ",".join(str(pk) for pk in queryset.values_list("pk", flat=True))
+        url = reverse(f"{self.admin_site.name}:work_maintenancetask_preview")
+        return HttpResponseRedirect(f"{url}?{urlencode({'ids': ids})}")
+
+    def preview_view(self, request):
+        """
+        Stream the next N occurrences of each selected task for every asset
+        of its workspace, one page of assets at a time.
 
-        Currently a no-op, but wired up so users can select tasks and
-        trigger a preview without mutating the database.
+        Query params: ``ids`` (comma-separated task ids), ``n`` (occurrences
+        per asset) and ``page``. Rows are rendered while the response is sent,
+        so a fleet-wide task does not have to fit into one string.
         """
-        # Intentionally left as a no-op (safe to call in tests/demo).
-        return None
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+
+        ids = [pk for pk in request.GET.get("ids", "").split(",") if pk.isdigit()]
+        count = _bounded_int(
+            request.GET.get("n"), self.preview_occurrences, self.preview_max_occurrences
+        )
+        tasks = (
+            self.get_queryset(request)
+            .filter(pk__in=ids)
+            .select_related("workspace")
+            .order_by("workspace__name", "name")
+        )
+        paginators = [
+            (task, Paginator(_preview_assets(task), self.preview_page_size))
+            for task in tasks
+        ]
+        num_pages = max((p.num_pages for _, p in paginators), default=1)
+        page = _bounded_int(request.GET.get("page"), 1, num_pages)
+        # Tasks with fewer assets drop out of the later pages.
+        pages = [
+            (task, paginator.page(page))
+            for task, paginator in paginators
+            if page <= paginator.num_pages
+        ]
+
+        def page_url(number):
+            if not 1 <= number <= num_pages:
+                return None
+            return "?" + urlencode({"ids": ",".join(ids), "n": count, "page": number})
+
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.opts,
+            "title": "Schedule preview",
+            "count": count,
+            "page": page,
+            "num_pages": num_pages,
+            "previous_url": page_url(page - 1),
+            "next_url": page_url(page + 1),
+            "rows": mark_safe(_PREVIEW_ROWS),
+        }
+        html = render_to_string(
+            "admin/work/maintenancetask/preview.html", context, request
+        )
+        head, tail = html.split(_PREVIEW_ROWS)
+        rows = _preview_rows(pages, count, timezone.now(), self.preview_horizon)
+        return StreamingHttpResponse(chain([head], rows, [tail]))
+
+
+# Stands in for the preview rows while the page shell is rendered.
+_PREVIEW_ROWS = "<!-- preview rows -->"
+
+
+def _bounded_int(value, default, high):
+    try:
+        return min(max(int(value), 1), high)
+    except (TypeError, ValueError):
+        return default
+
+
+def _preview_assets(task):
+    return (
+        Asset.objects.filter(workspace_id=task.workspace_id)
+        .order_by("name", "id")
+        .values_list("name", *ANCHOR_FIELDS)
+    )
+
+
+def _preview_rows(pages, count, now, horizon):
+    """
+    Yield the HTML of one table per task, one row per asset, with the
+    occurrences in ``[now, now + horizon)``.
+    """
+    for task, page in pages:
+        yield format_html(
+            "<h2>{} <small>({} &middot; {})</small></h2>",
+            task.name,
+            task.workspace,
+            task.cadence,
+        )
+        try:
+            rule = task.cadence_rule
+        except CadenceError as exc:
+            yield format_html('<p class="errornote">{}</p>', exc)
+            continue
+
+        yield '<table class="preview"><tbody>'
+        error = None
+        try:
+            end = now + horizon
+            for name, *anchors in page.object_list:
+                anchor = None
+                if rule.anchor_field:
+                    anchor = anchors[ANCHOR_FIELDS.index(rule.anchor_field)]
+                dues = islice(rule.anchored(anchor).occurrences(now, end), count)
+                cells = format_html_join(
+                    "",
+                    "<td>{}</td>",
+                    [
+                        (date_format(timezone.localtime(due), "DATETIME_FORMAT"),)
+                        for due in dues
+                    ],
+                )
+                yield format_html("<tr><th>{}</th>{}</tr>", name, cells)
+        except (OverflowError, ValueError) as exc:
+            # Dates past the end of the calendar.
+            error = exc
+        yield "</tbody></table>"
+        if error is not None:
+            yield format_html(
+                '<p class="errornote">Cannot preview this cadence: {}</p>', error
+            )
 
 
 @admin.register(WorkOrder)
@@ -149,21 +302,30 @@ class WorkOrderAdmin(admin.ModelAdmin):
         """
         Bulk action: set status='open' for selected work orders.
         """
-        queryset.update(status="open")
+        _set_status(queryset, "open")
 
     @admin.action(description="Mark selected work orders as Done")
     def mark_done(self, request, queryset):
         """
         Bulk action: set status='done' for selected work orders.
         """
-        queryset.update(status="done")
+        _set_status(queryset, "done")
 
     @admin.action(description="Mark selected work orders as Cancelled")
     def mark_cancelled(self, request, queryset):
         """
         Bulk action: set status='cancelled' for selected work orders.
         """
-        queryset.update(status="cancelled")
+        _set_status(queryset, "cancelled")
+
+
+def _set_status(queryset, status):
+    # queryset.update() skips the signals that keep asset rollups and
+    # workspace versions current, and auto_now.
+    rows = set(queryset.values_list("asset_id", "workspace_id"))
+    queryset.update(status=status, updated=timezone.now())
+    refresh_asset_rollups({asset_id for asset_id, _ in rows})
+    bump_workspace_versions({workspace_id for _, workspace_id in rows})
 
 
 @admin.register(ActivityInstance)
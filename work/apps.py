@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class WorkConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "work"
+
+    def ready(self):
+        from . import signals
+
+        signals.connect_signals()
@@ -0,0 +1,461 @@
+# work/cadence.py
+
+"""
+Cadence rules for ``MaintenanceTask.cadence``.
+
+A cadence is either a plain alias (``"weekly"``, ``"monthly"``...) or an
+RRULE-like list of ``KEY=VALUE`` parts separated by ``;``. An alias may be
+followed by parts that override its defaults::
+
+    monthly
+    weekly;BYDAY=MO,TH
+    FREQ=WEEKLY;INTERVAL=2;BYDAY=FR;BYHOUR=17
+    FREQ=MONTHLY;BYDAY=2TU;BYHOUR=9;TZ=Europe/Berlin
+    FREQ=MONTHLY;BYMONTHDAY=-1;SHIFT=PREVIOUS
+    FREQ=YEARLY;BYMONTH=1,7;BYMONTHDAY=15
+
+Supported keys:
+
+- ``FREQ``: ``DAILY``, ``WEEKLY``, ``MONTHLY`` or ``YEARLY`` (required).
+- ``INTERVAL``: every N periods, counted from ``DTSTART`` (default 1).
+- ``BYDAY``: weekdays (``MO``..``SU``); ``MONTHLY``/``YEARLY`` also accept
+  the nth weekday of the month (``2TU``, ``-1FR``).
+- ``BYMONTHDAY``: days of the month, negative values count from the end.
+- ``BYMONTH``: months of the year (``YEARLY`` only).
+- ``BYHOUR``/``BYMINUTE``: local time of day (default midnight).
+- ``SHIFT``: move weekend dates to a business day: ``NEXT`` (Monday),
+  ``PREVIOUS`` (Friday) or ``NEAREST``.
+- ``TZ``: IANA time zone the rule is evaluated in (default ``TIME_ZONE``).
+- ``DTSTART``: ``YYYY-MM-DD`` date that intervals are counted from. No
+  occurrences fall before it.
+- ``ANCHOR``: an asset date field (``PURCHASE_DATE``, ``WARRANTY_EXPIRES``)
+  that replaces ``DTSTART`` per asset, e.g. every 6 months after purchase:
+  ``FREQ=MONTHLY;INTERVAL=6;ANCHOR=PURCHASE_DATE``. Assets without a value
+  fall back to ``DTSTART``.
+
+``compile_cadence`` parses a string once and caches the resulting
+``CadenceRule``; ``CadenceRule.occurrences`` yields due datetimes lazily.
+``CadenceRule.anchored`` returns the rule as seen by one asset.
+Local times that fall into a DST gap are moved forward by the gap, and
+ambiguous local times resolve to their first occurrence.
+"""
+
+import calendar
+import re
+from datetime import date, datetime, time, timedelta
+from datetime import timezone as dt_timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+
+DAILY = "DAILY"
+WEEKLY = "WEEKLY"
+MONTHLY = "MONTHLY"
+YEARLY = "YEARLY"
+FREQUENCIES = (DAILY, WEEKLY, MONTHLY, YEARLY)
+
+SHIFT_NONE = "NONE"
+SHIFT_NEXT = "NEXT"
+SHIFT_PREVIOUS = "PREVIOUS"
+SHIFT_NEAREST = "NEAREST"
+# weekday -> days to add, for Saturday (5) and Sunday (6)
+SHIFTS = {
+    SHIFT_NONE: {},
+    SHIFT_NEXT: {5: 2, 6: 1},
+    SHIFT_PREVIOUS: {5: -1, 6: -2},
+    SHIFT_NEAREST: {5: -1, 6: 1},
+}
+
+WEEKDAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+
+ALIASES = {
+    "daily": "FREQ=DAILY",
+    "weekly": "FREQ=WEEKLY;BYDAY=MO",
+    "biweekly": "FREQ=WEEKLY;INTERVAL=2;BYDAY=MO",
+    "monthly": "FREQ=MONTHLY;BYMONTHDAY=1",
+    "quarterly": "FREQ=MONTHLY;INTERVAL=3;BYMONTHDAY=1",
+    "yearly": "FREQ=YEARLY;BYMONTH=1;BYMONTHDAY=1",
+    "annually": "FREQ=YEARLY;BYMONTH=1;BYMONTHDAY=1",
+}
+
+# Intervals are counted from this Monday unless the rule sets DTSTART.
+DEFAULT_DTSTART = date(2000, 1, 3)
+
+# Asset fields a rule may be anchored to with ANCHOR=.
+ANCHOR_FIELDS = ("purchase_date", "warranty_expires")
+
+_BYDAY_RE = re.compile(r"^([+-]?[1-5])?(MO|TU|WE|TH|FR|SA|SU)$")
+
+
+class CadenceError(ValueError):
+    """Raised for cadence strings that cannot be parsed."""
+
+
+class CadenceRule:
+    """
+    A parsed cadence. Instances are immutable and shared through the
+    ``compile_cadence`` cache.
+    """
+
+    __slots__ = (
+        "source",
+        "freq",
+        "interval",
+        "weekdays",
+        "nth_weekdays",
+        "monthdays",
+        "months",
+        "at",
+        "shift",
+        "tz",
+        "dtstart",
+        "anchor_field",
+    )
+
+    def __init__(
+        self,
+        freq,
+        *,
+        interval=1,
+        weekdays=(),
+        nth_weekdays=(),
+        monthdays=(),
+        months=(),
+        at=time.min,
+        shift=SHIFT_NONE,
+        tz=None,
+        dtstart=DEFAULT_DTSTART,
+        anchor_field=None,
+        source="",
+    ):
+        self.source = source
+        self.freq = freq
+        self.interval = interval
+        self.weekdays = tuple(weekdays)
+        self.nth_weekdays = tuple(nth_weekdays)
+        self.monthdays = tuple(monthdays)
+        self.months = tuple(months)
+        self.at = at
+        self.shift = shift
+        self.tz = tz
+        self.dtstart = dtstart
+        self.anchor_field = anchor_field
+
+    def __repr__(self) -> str:
+        return f"<CadenceRule {self.source or self.freq}>"
+
+    def anchored(self, day):
+        """Return a copy counted from ``day`` (an asset's anchor date)."""
+        if day is None or day == self.dtstart:
+            return self
+        options = {name: getattr(self, name) for name in self.__slots__}
+        options["dtstart"] = day
+        return CadenceRule(options.pop("freq"), **options)
+
+    @property
+    def vectorizable(self):
+        """
+        True when every period holds exactly one date at a fixed offset from
+        the anchor, which is what ``work.expansion`` can compute in bulk.
+        """
+        return (
+            not (self.weekdays or self.nth_weekdays or self.months)
+            and len(self.monthdays) <= 1
+        )
+
+    # ---------- Occurrences ----------
+
+    def occurrences(self, start, end=None):
+        """
+        Yield the aware due datetimes in ``[start, end)`` in ascending order.
+        Without ``end`` the generator is unbounded.
+        """
+        tz = self.tz or timezone.get_current_timezone()
+        last_day = timezone.localtime(end, tz).date() if end is not None else None
+        # Start one period early: SHIFT=NEXT can move its dates into this one.
+        k = self._period_index(timezone.localtime(start, tz).date()) - 1
+        previous = None
+
+        while True:
+            period = self._period_start(k)
+            if last_day is not None and period - timedelta(days=3) > last_day:
+                return
+            for day in self._dates_in_period(period):
+                # SHIFT can land dates of consecutive periods on the same day
+                # (Saturday and Sunday both move to Monday).
+                if previous is not None and day <= previous:
+                    continue
+                previous = day
+                due = self.localize(day, tz)
+                if end is not None and due >= end:
+                    return
+                if due >= start:
+                    yield due
+            k += 1
+
+    def localize(self, day, tz):
+        """Return ``day`` at the rule's time of day as an aware datetime."""
+        # Round-tripping through UTC moves times inside a DST gap forward.
+        local = datetime.combine(day, self.at, tzinfo=tz)
+        return local.astimezone(dt_timezone.utc).astimezone(tz)
+
+    def _period_index(self, day):
+        anchor = self.dtstart
+        if self.freq == DAILY:
+            steps = (day - anchor).days
+        elif self.freq == WEEKLY:
+            steps = (_monday(day) - _monday(anchor)).days // 7
+        elif self.freq == MONTHLY:
+            steps = _month_index(day) - _month_index(anchor)
+        else:
+            steps = day.year - anchor.year
+        return steps // self.interval
+
+    def _period_start(self, k):
+        anchor = self.dtstart
+        steps = k * self.interval
+        if self.freq == DAILY:
+            return anchor + timedelta(days=steps)
+        if self.freq == WEEKLY:
+            return _monday(anchor) + timedelta(weeks=steps)
+        if self.freq == MONTHLY:
+            year, month = divmod(_month_index(anchor) + steps, 12)
+            return date(year, month + 1, 1)
+        return date(anchor.year + steps, 1, 1)
+
+    def _dates_in_period(self, period):
+        if self.freq == DAILY:
+            days = [period] if self._day_matches(period) else []
+        elif self.freq == WEEKLY:
+            weekdays = self.weekdays or (self.dtstart.weekday(),)
+            days = [period + timedelta(days=wd) for wd in weekdays]
+        elif self.freq == MONTHLY:
+            days = self._dates_in_month(period.year, period.month)
+        else:
+            months = self.months or (self.dtstart.month,)
+            days = [d for m in months for d in self._dates_in_month(period.year, m)]
+        days = [d for d in days if d >= self.dtstart]
+
+        offsets = SHIFTS[self.shift]
+        return sorted({d + timedelta(days=offsets.get(d.weekday(), 0)) for d in days})
+
+    def _day_matches(self, day):
+        return not self.weekdays or day.weekday() in self.weekdays
+
+    def _dates_in_month(self, year, month):
+        length = calendar.monthrange(year, month)[1]
+        first_weekday = date(year, month, 1).weekday()
+
+        def every(weekday):
+            return list(range((weekday - first_weekday) % 7 + 1, length + 1, 7))
+
+        days = [min(d if d > 0 else length + 1 + d, length) for d in self.monthdays]
+        for weekday in self.weekdays:
+            days.extend(every(weekday))
+        for nth, weekday in self.nth_weekdays:
+            matches = every(weekday)
+            if abs(nth) <= len(matches):
+                days.append(matches[nth - 1 if nth > 0 else nth])
+        if not (self.monthdays or self.weekdays or self.nth_weekdays):
+            days = [min(self.dtstart.day, length)]
+        return [date(year, month, d) for d in days if d >= 1]
+
+
+def _monday(day):
+    return day - timedelta(days=day.weekday())
+
+
+def _month_index(day):
+    return day.year * 12 + day.month - 1
+
+
+# ---------- Parsing ----------
+
+
+def _int(value, key, low, high):
+    try:
+        number = int(value)
+    except ValueError:
+        raise CadenceError(f"{key} must be an integer, got {value!r}") from None
+    if not low <= number <= high or (number == 0 and low < 0):
+        raise CadenceError(f"{key} must be between {low} and {high}, got {number}")
+    return number
+
+
+def _int_list(value, key, low, high):
+    return tuple(_int(v, key, low, high) for v in value.split(","))
+
+
+def _byday(value):
+    weekdays, nth_weekdays = [], []
+    for token in value.split(","):
+        match = _BYDAY_RE.match(token)
+        if not match:
+            raise CadenceError(f"Invalid BYDAY value {token!r}")
+        weekday = WEEKDAYS.index(match.group(2))
+        if match.group(1):
+            nth_weekdays.append((_int(match.group(1), "BYDAY", -5, 5), weekday))
+        else:
+            weekdays.append(weekday)
+    return {"weekdays": weekdays, "nth_weekdays": nth_weekdays}
+
+
+def _tz(value):
+    try:
+        return {"tz": ZoneInfo(value)}
+    except (ZoneInfoNotFoundError, ValueError):
+        raise CadenceError(f"Unknown time zone {value!r}") from None
+
+
+def _dtstart(value):
+    try:
+        return {"dtstart": date.fromisoformat(value)}
+    except ValueError:
+        raise CadenceError(f"DTSTART must be YYYY-MM-DD, got {value!r}") from None
+
+
+def _anchor(value):
+    field = value.lower()
+    if field not in ANCHOR_FIELDS:
+        choices = ", ".join(ANCHOR_FIELDS).upper()
+        raise CadenceError(f"ANCHOR must be one of {choices}")
+    return {"anchor_field": field}
+
+
+def _shift(value):
+    if value not in SHIFTS:
+        raise CadenceError(f"SHIFT must be one of {', '.join(SHIFTS)}")
+    return {"shift": value}
+
+
+def _freq(value):
+    if value not in FREQUENCIES:
+        raise CadenceError(f"FREQ must be one of {', '.join(FREQUENCIES)}")
+    return {"freq": value}
+
+
+_PARSERS = {
+    "FREQ": _freq,
+    "INTERVAL": lambda v: {"interval": _int(v, "INTERVAL", 1, 1000)},
+    "BYDAY": _byday,
+    "BYMONTHDAY": lambda v: {"monthdays": _int_list(v, "BYMONTHDAY", -31, 31)},
+    "BYMONTH": lambda v: {"months": _int_list(v, "BYMONTH", 1, 12)},
+    "BYHOUR": lambda v: {"hour": _int(v, "BYHOUR", 0, 23)},
+    "BYMINUTE": lambda v: {"minute": _int(v, "BYMINUTE", 0, 59)},
+    "SHIFT": _shift,
+    "TZ": _tz,
+    "DTSTART": _dtstart,
+    "ANCHOR": _anchor,
+}
+
+
+def _parse_parts(parts):
+    params = {}
+    for part in parts:
+        key, sep, value = part.partition("=")
+        key = key.strip().upper()
+        if not sep or key not in _PARSERS:
+            raise CadenceError(f"Invalid cadence part {part!r}")
+        if key in params:
+            raise CadenceError(f"{key} given more than once")
+        params[key] = value.strip() if key == "TZ" else value.strip().upper()
+    return params
+
+
+def _split(text):
+    """Return the ``{KEY: VALUE}`` parts of ``text``, expanding a leading alias."""
+    parts = [p.strip() for p in text.split(";") if p.strip()]
+    if not parts:
+        raise CadenceError("Cadence is empty")
+    if "=" in parts[0]:
+        return _parse_parts(parts)
+
+    alias = parts.pop(0).lower()
+    if alias not in ALIASES:
+        raise CadenceError(f"Unknown cadence {alias!r}")
+    params = _parse_parts(ALIASES[alias].split(";"))
+    explicit = _parse_parts(parts)
+    # "monthly;BYDAY=2TU" means the second Tuesday instead of the first.
+    if explicit.keys() & {"BYDAY", "BYMONTHDAY"}:
+        params.pop("BYDAY", None)
+        params.pop("BYMONTHDAY", None)
+    params.update(explicit)
+    return params
+
+
+def _check(options):
+    freq = options.get("freq")
+    if freq is None:
+        raise CadenceError("FREQ is required")
+    if options.get("nth_weekdays") and freq not in (MONTHLY, YEARLY):
+        raise CadenceError("BYDAY with a position needs FREQ=MONTHLY or YEARLY")
+    if options.get("monthdays") and freq not in (MONTHLY, YEARLY):
+        raise CadenceError("BYMONTHDAY needs FREQ=MONTHLY or YEARLY")
+    if options.get("months") and freq != YEARLY:
+        raise CadenceError("BYMONTH needs FREQ=YEARLY")
+    _check_has_dates(options)
+
+
+# The longest each month can be; February has 29 days in leap years.
+_MONTH_DAYS = {month: calendar.monthrange(2000, month)[1] for month in range(1, 13)}
+
+
+def _check_has_dates(options):
+    """Reject rules that can never produce a date."""
+    freq = options["freq"]
+    weekdays = options.get("weekdays")
+    dtstart = options.get("dtstart", DEFAULT_DTSTART)
+    anchored = options.get("anchor_field") is not None
+    if freq == DAILY and weekdays and options.get("interval", 1) % 7 == 0:
+        # Every period starts on the weekday of DTSTART (or of the anchor).
+        if anchored or dtstart.weekday() not in weekdays:
+            raise CadenceError(
+                "BYDAY never matches: every INTERVAL days fall on one weekday"
+            )
+
+    monthdays = options.get("monthdays")
+    if not monthdays or weekdays or options.get("nth_weekdays"):
+        return
+    if freq == MONTHLY:
+        months = range(1, 13)
+    elif options.get("months"):
+        months = options["months"]
+    elif not anchored:
+        months = (dtstart.month,)
+    else:
+        return
+    longest = max(_MONTH_DAYS[month] for month in months)
+    # Positive days past the month end fall on its last day.
+    if all(day < 0 and -day > longest for day in monthdays):
+        raise CadenceError("BYMONTHDAY never matches a day of BYMONTH")
+
+
+def parse_cadence(text):
+    """Parse ``text`` into a new ``CadenceRule``; raises ``CadenceError``."""
+    options = {}
+    for key, value in _split(text or "").items():
+        options.update(_PARSERS[key](value))
+    _check(options)
+
+    at = time(options.pop("hour", 0), options.pop("minute", 0))
+    return CadenceRule(at=at, source=text.strip(), **options)
+
+
+@lru_cache(maxsize=512)
+def _compile(text):
+    return parse_cadence(text)
+
+
+def compile_cadence(text):
+    """Return the cached ``CadenceRule`` for ``text``; raises ``CadenceError``."""
+    return _compile((text or "").strip())
+
+
+def validate_cadence(value):
+    """Model/serializer validator for ``MaintenanceTask.cadence``."""
+    try:
+        compile_cadence(value)
+    except CadenceError as exc:
+        raise ValidationError(str(exc)) from exc
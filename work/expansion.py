@@ -0,0 +1,165 @@
+# work/expansion.py
+
+"""
+Occurrence expansion for many assets at once.
+
+``expand`` returns the due dates of one ``CadenceRule`` for a list of assets,
+each with its own anchor date (``ANCHOR=``) and window start. When every
+period of the rule holds one date at a fixed offset from the anchor
+(``CadenceRule.vectorizable``), the dates of all assets are computed with
+NumPy ``datetime64`` arithmetic, one block of assets at a time. Other rules,
+or an environment without NumPy, go through ``expand_scalar``, which walks
+``CadenceRule.occurrences`` per asset. Both return the same result.
+"""
+
+from datetime import timezone as dt_timezone
+
+from django.utils import timezone
+
+from .cadence import DAILY, MONTHLY, SHIFTS, WEEKLY
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None
+
+# Assets per NumPy pass; keeps the (assets x periods) grids small.
+BLOCK_SIZE = 8192
+
+# SHIFT moves dates by up to two days, so periods this close to the window
+# edges are looked at too.
+_SLACK = 3
+
+
+def expand_scalar(rule, anchors, starts, end):
+    """
+    Return ``(positions, dues)``: for the asset at position ``i`` of
+    ``anchors``/``starts`` its due datetimes in ``[starts[i], end)``, ordered
+    by position, then due. An anchor of ``None`` means the rule's DTSTART.
+    """
+    positions, dues = [], []
+    for i, (anchor, start) in enumerate(zip(anchors, starts)):
+        for due in rule.anchored(anchor).occurrences(start, end):
+            positions.append(i)
+            dues.append(due)
+    return positions, dues
+
+
+def expand(rule, anchors, starts, end):
+    """Same as ``expand_scalar``, vectorized when NumPy and the rule allow it."""
+    if np is None or not rule.vectorizable or not anchors:
+        return expand_scalar(rule, anchors, starts, end)
+
+    tz = rule.tz or timezone.get_current_timezone()
+    anchor = np.array(anchors, dtype="datetime64[D]")
+    anchor[np.isnat(anchor)] = np.datetime64(rule.dtstart, "D")
+    start_utc, start_day = _window_starts(starts, tz)
+    end_utc = np.datetime64(_naive_utc(end), "us")
+    last_day = np.datetime64(timezone.localtime(end, tz).date(), "D")
+    localized = {}
+
+    positions, dues = [], []
+    for lo in range(0, len(anchor), BLOCK_SIZE):
+        block = slice(lo, lo + BLOCK_SIZE)
+        rows, days = _block_dates(rule, anchor[block], start_day[block], last_day)
+        aware, utc = _localize(rule, tz, days, localized)
+        keep = (utc >= start_utc[block][rows]) & (utc < end_utc)
+        positions.append(rows[keep] + lo)
+        dues.extend(aware[keep].tolist())
+    return np.concatenate(positions).tolist(), dues
+
+
+def _naive_utc(value):
+    return value.astimezone(dt_timezone.utc).replace(tzinfo=None)
+
+
+def _window_starts(starts, tz):
+    """Return the starts as UTC instants and local dates, converting each
+    distinct value once (most assets share ``now`` or a watermark)."""
+    index = {}
+    slots = np.array([index.setdefault(s, len(index)) for s in starts])
+    utc = np.array([_naive_utc(s) for s in index], dtype="datetime64[us]")
+    days = [timezone.localtime(s, tz).date() for s in index]
+    return utc[slots], np.array(days, dtype="datetime64[D]")[slots]
+
+
+def _weekday(days):
+    # 1970-01-01 was a Thursday.
+    return (days.astype(np.int64) + 3) % 7
+
+
+def _monday(days):
+    return days - _weekday(days).astype("timedelta64[D]")
+
+
+def _ordinal(days, unit):
+    return days.astype(unit).astype(np.int64)
+
+
+def _period_index(rule, anchor, day):
+    if rule.freq == DAILY:
+        steps = (day - anchor).astype(np.int64)
+    elif rule.freq == WEEKLY:
+        steps = (_monday(day) - _monday(anchor)).astype(np.int64) // 7
+    else:
+        unit = "datetime64[M]" if rule.freq == MONTHLY else "datetime64[Y]"
+        steps = _ordinal(day, unit) - _ordinal(anchor, unit)
+    return steps // rule.interval
+
+
+def _period_dates(rule, anchor, k):
+    """Return the date of period ``k`` for each anchor and whether it exists
+    (``BYMONTHDAY=-31`` has no date in a 30-day month)."""
+    steps = k * rule.interval
+    if rule.freq in (DAILY, WEEKLY):
+        days = steps * (7 if rule.freq == WEEKLY else 1)
+        return anchor + days.astype("timedelta64[D]"), np.ones(k.shape, bool)
+
+    anchor_month = anchor.astype("datetime64[M]")
+    months = steps * (1 if rule.freq == MONTHLY else 12)
+    month = anchor_month + months.astype("timedelta64[M]")
+    first = month.astype("datetime64[D]")
+    length = ((month + 1).astype("datetime64[D]") - first).astype(np.int64)
+    if rule.monthdays:
+        wanted = rule.monthdays[0]
+        day = np.minimum(wanted, length) if wanted > 0 else length + 1 + wanted
+    else:
+        anchor_day = (anchor - anchor_month.astype("datetime64[D]")).astype(np.int64)
+        day = np.minimum(anchor_day + 1, length)
+    offset = (np.maximum(day, 1) - 1).astype("timedelta64[D]")
+    return first + offset, day >= 1
+
+
+def _block_dates(rule, anchor, start_day, last_day):
+    """
+    Return ``(rows, days)`` for every candidate date of a block of assets:
+    the asset's row in the block and the (shifted) local date. Mirrors the
+    period walk of ``CadenceRule.occurrences``.
+    """
+    first = _period_index(rule, anchor, start_day) - 1
+    last = _period_index(rule, anchor, last_day + _SLACK)
+    width = max(int((last - first).max()) + 1, 0)
+    k = first[:, None] + np.arange(width)
+
+    days, exists = _period_dates(rule, anchor[:, None], k)
+    keep = exists & (k <= last[:, None]) & (days >= anchor[:, None])
+
+    offsets = [SHIFTS[rule.shift].get(weekday, 0) for weekday in range(7)]
+    days = days + np.array(offsets, dtype="timedelta64[D]")[_weekday(days)]
+    rows, _ = np.nonzero(keep)
+    days = days[keep]
+    # Shifted dates of consecutive periods can fall on the same day; keep
+    # the first, as the scalar walk does.
+    repeated = np.zeros(len(days), dtype=bool)
+    repeated[1:] = (rows[1:] == rows[:-1]) & (days[1:] == days[:-1])
+    return rows[~repeated], days[~repeated]
+
+
+def _localize(rule, tz, days, cache):
+    """Return aware datetimes and their UTC instants for ``days``; each
+    distinct date is localized once."""
+    unique, inverse = np.unique(days, return_inverse=True)
+    aware = [cache.get(day) or rule.localize(day, tz) for day in unique.tolist()]
+    cache.update(zip(unique.tolist(), aware))
+    utc = np.array([_naive_utc(due) for due in aware], dtype="datetime64[us]")
+    return np.array(aware, dtype=object)[inverse], utc[inverse]
@@ -0,0 +1,211 @@
+# work/generator.py
+
+"""
+Set-based work-order generation.
+
+For one workspace, every (MaintenanceTask, Asset) pair is expanded into the
+due dates between its ``GenerationWatermark`` (or ``now`` on the first run)
+and the horizon, and the resulting rows are written with one ``bulk_create``
+per chunk. Afterwards the watermarks are moved up to the horizon, so each run
+only touches the rows that are new since the previous one. The number of
+queries depends on the number of chunks, not on the number of assets or tasks.
+Cadences anchored to an asset date are expanded for all assets of a task in
+one pass (see ``work.expansion``).
+"""
+
+import logging
+from datetime import timedelta
+from itertools import islice, repeat
+
+from django.conf import settings
+from django.utils import timezone
+
+from assets.models import Asset
+from core.versions import bump_workspace_versions
+
+from .cadence import ANCHOR_FIELDS, CadenceError, compile_cadence
+from .expansion import expand
+from .models import GenerationWatermark, MaintenanceTask, WorkOrder
+from .rollups import refresh_asset_rollups
+
+logger = logging.getLogger(__name__)
+
+
+# ---------- Generation ----------
+
+# "diff": read the keys already in the window and only insert the missing rows.
+# "upsert": insert every candidate and let the (task, asset, due) unique
+# constraint drop duplicates (ON CONFLICT DO NOTHING). No pre-read and safe for
+# concurrent workers regenerating the same window.
+MODE_DIFF = "diff"
+MODE_UPSERT = "upsert"
+MODES = (MODE_DIFF, MODE_UPSERT)
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _load_rules(workspace_id):
+    """Map task id -> compiled cadence, dropping (and logging) invalid ones."""
+    rules = {}
+    for task_id, cadence in MaintenanceTask.objects.filter(
+        workspace_id=workspace_id
+    ).values_list("id", "cadence"):
+        try:
+            rules[task_id] = compile_cadence(cadence)
+        except CadenceError as exc:
+            logger.warning("Skipping task %s: %s", task_id, exc)
+    return rules
+
+
+def _plan(rules, assets, watermarks, now, horizon):
+    """
+    Return ``(pairs, streams)``: the (task_id, asset_id) pairs that are behind
+    the horizon, and ``(task_id, asset_ids, dues)`` triples of parallel
+    sequences covering their due dates.
+
+    Pairs sharing a task and a start share one list of due dates. Anchored
+    rules differ per asset and are expanded for all assets of the task at once.
+    """
+    pairs, streams, dues_cache = [], [], {}
+    for task_id, rule in rules.items():
+        behind = [
+            (asset, start)
+            for asset in assets
+            if (start := watermarks.get((task_id, asset[0]), now)) < horizon
+        ]
+        pairs.extend((task_id, asset[0]) for asset, _ in behind)
+        if rule.anchor_field:
+            streams.append(_expand_anchored(task_id, rule, behind, horizon))
+            continue
+        for (asset_id, *_), start in behind:
+            key = (task_id, start)
+            if key not in dues_cache:
+                dues_cache[key] = list(rule.occurrences(start, horizon))
+            dues = dues_cache[key]
+            streams.append((task_id, repeat(asset_id, len(dues)), dues))
+    return pairs, streams
+
+
+def _expand_anchored(task_id, rule, behind, horizon):
+    column = 1 + ANCHOR_FIELDS.index(rule.anchor_field)
+    anchors = [asset[column] for asset, _ in behind]
+    starts = [start for _, start in behind]
+    positions, dues = expand(rule, anchors, starts, horizon)
+    return task_id, [behind[i][0][0] for i in positions], dues
+
+
+def _insert(model, rows, batch_size, **options):
+    inserted = 0
+    for chunk in _chunks(rows, batch_size):
+        model.objects.bulk_create(chunk, **options)
+        inserted += len(chunk)
+    return inserted
+
+
+def _advance_watermarks(pairs, horizon, batch_size):
+    rows = (
+        GenerationWatermark(task_id=t, asset_id=a, generated_through=horizon)
+        for t, a in pairs
+    )
+    _insert(
+        GenerationWatermark,
+        rows,
+        batch_size,
+        update_conflicts=True,
+        unique_fields=["task", "asset"],
+        update_fields=["generated_through"],
+    )
+
+
+def _asset_filter(asset_id_range, field="asset_id"):
+    """Filter kwargs limiting ``field`` to an inclusive ``(low, high)`` range;
+    either end may be ``None``."""
+    low, high = asset_id_range or (None, None)
+    bounds = {f"{field}__gte": low, f"{field}__lte": high}
+    return {key: value for key, value in bounds.items() if value is not None}
+
+
+def generate_for_workspace(
+    workspace_id,
+    *,
+    now=None,
+    horizon_days=None,
+    batch_size=None,
+    mode=None,
+    asset_id_range=None,
+):
+    """
+    Create the missing WorkOrders of one workspace up to ``now + horizon``.
+
+    ``asset_id_range`` (inclusive ``(low, high)``) restricts the run to a slice
+    of the workspace's assets, so a large workspace can be split across
+    workers. Slices do not share rows, watermarks or counts.
+
+    Each (task, asset) pair resumes at its watermark; pairs without one start
+    at ``now``. Watermarks are only advanced after the WorkOrders are written,
+    so an interrupted run is simply redone by the next one.
+
+    Returns a dict with ``created`` and ``skipped`` (already present) counts.
+    In upsert mode ``created`` is the change in the window's row count, so it
+    also includes rows inserted concurrently by another worker.
+    """
+    now = now or timezone.now()
+    if horizon_days is None:
+        horizon_days = settings.WORKORDER_HORIZON_DAYS
+    batch_size = batch_size or settings.WORKORDER_BATCH_SIZE
+    mode = mode or settings.WORKORDER_GENERATOR_MODE
+    if mode not in MODES:
+        raise ValueError(f"Unknown generator mode {mode!r}; expected one of {MODES}")
+    horizon = now + timedelta(days=horizon_days)
+
+    rules = _load_rules(workspace_id)
+    assets = list(
+        Asset.objects.filter(
+            workspace_id=workspace_id, **_asset_filter(asset_id_range, "id")
+        ).values_list("id", *ANCHOR_FIELDS)
+    )
+    watermarks = {
+        (task_id, asset_id): through
+        for task_id, asset_id, through in GenerationWatermark.objects.filter(
+            task__workspace_id=workspace_id, **_asset_filter(asset_id_range)
+        ).values_list("task_id", "asset_id", "generated_through")
+    }
+    pairs, streams = _plan(rules, assets, watermarks, now, horizon)
+    if not pairs:
+        return {"created": 0, "skipped": 0}
+
+    window_start = min(now, *watermarks.values()) if watermarks else now
+    window = WorkOrder.objects.filter(
+        workspace_id=workspace_id,
+        due__gte=window_start,
+        due__lt=horizon,
+        **_asset_filter(asset_id_range),
+    )
+
+    candidates = (
+        (t, a, due) for t, asset_ids, dues in streams for a, due in zip(asset_ids, dues)
+    )
+    if mode == MODE_DIFF:
+        existing = set(window.values_list("task_id", "asset_id", "due"))
+        candidates = (key for key in candidates if key not in existing)
+    else:
+        before = window.count()
+
+    rows = (
+        WorkOrder(workspace_id=workspace_id, task_id=t, asset_id=a, due=d)
+        for t, a, d in candidates
+    )
+    created = _insert(WorkOrder, rows, batch_size, ignore_conflicts=True)
+    if mode == MODE_UPSERT:
+        created = window.count() - before
+    if created:
+        refresh_asset_rollups({a for _, a in pairs})
+        bump_workspace_versions({workspace_id})
+    _advance_watermarks(pairs, horizon, batch_size)
+
+    total = sum(len(dues) for _, _, dues in streams)
+    return {"created": created, "skipped": total - created}
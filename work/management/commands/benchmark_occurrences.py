@@ -0,0 +1,72 @@
+# work/management/commands/benchmark_occurrences.py
+
+from datetime import date, timedelta
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from work import expansion
+from work.cadence import CadenceError, compile_cadence
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the vectorized and the scalar occurrence expansion for an "
+        "anchored cadence on a synthetic fleet (no database access)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--assets", type=int, default=100_000)
+        parser.add_argument("--weeks", type=int, default=52)
+        parser.add_argument("--cadence", default="FREQ=WEEKLY;ANCHOR=PURCHASE_DATE")
+        parser.add_argument(
+            "--repeat", type=int, default=1, help="Runs per path; the best counts"
+        )
+
+    def handle(self, *args, **options):
+        if expansion.np is None:
+            raise CommandError("NumPy is not installed; nothing to compare.")
+        try:
+            rule = compile_cadence(options["cadence"])
+        except CadenceError as exc:
+            raise CommandError(str(exc)) from exc
+        if not rule.vectorizable:
+            raise CommandError(f"{rule!r} has no vectorized path.")
+
+        # Purchase dates spread over five years, a few assets without one.
+        first = date(2020, 1, 1)
+        anchors = [
+            None if i % 50 == 0 else first + timedelta(days=i % 1826)
+            for i in range(options["assets"])
+        ]
+        now = timezone.now()
+        starts = [now] * len(anchors)
+        end = now + timedelta(weeks=options["weeks"])
+
+        results = {}
+        for name, func in (
+            ("scalar", expansion.expand_scalar),
+            ("vectorized", expansion.expand),
+        ):
+            best = None
+            for _ in range(options["repeat"]):
+                began = perf_counter()
+                results[name] = func(rule, anchors, starts, end)
+                elapsed = perf_counter() - began
+                best = elapsed if best is None else min(best, elapsed)
+            results[f"{name}_seconds"] = best
+            self.stdout.write(
+                f"{name:>10}: {best:8.3f}s  {len(results[name][1])} occurrences"
+            )
+
+        if results["scalar"] != results["vectorized"]:
+            raise CommandError("Vectorized and scalar results differ.")
+
+        speedup = results["scalar_seconds"] / max(results["vectorized_seconds"], 1e-9)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(anchors)} assets x {options['weeks']} weeks, "
+                f"{rule.source}: {speedup:.1f}x faster"
+            )
+        )
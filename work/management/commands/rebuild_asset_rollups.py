@@ -0,0 +1,29 @@
+# work/management/commands/rebuild_asset_rollups.py
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Workspace
+from work.rollups import rebuild_asset_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute Asset.next_due_at, open_workorder_count and last_activity_at "
+        "from the work tables in one bulk UPDATE"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workspace", help="Slug of a single workspace to rebuild (default: all)"
+        )
+
+    def handle(self, *args, **options):
+        workspace_id = None
+        if options["workspace"]:
+            try:
+                workspace_id = Workspace.objects.get(slug=options["workspace"]).id
+            except Workspace.DoesNotExist:
+                raise CommandError(f"No workspace with slug {options['workspace']!r}")
+
+        updated = rebuild_asset_rollups(workspace_id)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt rollups for {updated} assets"))
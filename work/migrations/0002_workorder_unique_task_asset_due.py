@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:35
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assets", "0001_initial"),
+        ("work", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name="workorder",
+            unique_together={("task", "asset", "due")},
+        ),
+    ]
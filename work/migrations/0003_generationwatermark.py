@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assets", "0001_initial"),
+        ("work", "0002_workorder_unique_task_asset_due"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GenerationWatermark",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("generated_through", models.DateTimeField()),
+                (
+                    "asset",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="watermarks",
+                        to="assets.asset",
+                    ),
+                ),
+                (
+                    "task",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="watermarks",
+                        to="work.maintenancetask",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("task", "asset")},
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:39
+
+import work.cadence
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("work", "0003_generationwatermark"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="maintenancetask",
+            name="cadence",
+            field=models.CharField(
+                max_length=120, validators=[work.cadence.validate_cadence]
+            ),
+        ),
+    ]
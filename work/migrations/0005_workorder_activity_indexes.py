@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:57
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assets", "0002_asset_rollups"),
+        ("core", "0001_initial"),
+        ("work", "0004_alter_maintenancetask_cadence"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="activityinstance",
+            index=models.Index(
+                fields=["workspace", "-occurred_at"], name="activity_ws_occurred"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="activityinstance",
+            index=models.Index(
+                fields=["asset", "-occurred_at"], name="activity_asset_occurred"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="activityinstance",
+            index=models.Index(
+                fields=["asset", "kind", "-occurred_at"],
+                name="activity_asset_kind_occurred",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="workorder",
+            index=models.Index(
+                fields=["workspace", "status", "due"], name="workorder_ws_status_due"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="workorder",
+            index=models.Index(fields=["workspace", "-due"], name="workorder_ws_due"),
+        ),
+        migrations.AddIndex(
+            model_name="workorder",
+            index=models.Index(
+                condition=models.Q(("status", "open")),
+                fields=["asset", "due"],
+                name="workorder_open_asset_due",
+            ),
+        ),
+    ]
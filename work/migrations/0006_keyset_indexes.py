@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assets", "0002_asset_rollups"),
+        ("core", "0001_initial"),
+        ("work", "0005_workorder_activity_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="activityinstance",
+            name="activity_ws_occurred",
+        ),
+        migrations.RemoveIndex(
+            model_name="workorder",
+            name="workorder_ws_due",
+        ),
+        migrations.AddIndex(
+            model_name="activityinstance",
+            index=models.Index(
+                fields=["workspace", "-occurred_at", "-id"],
+                name="activity_ws_occurred_id",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="workorder",
+            index=models.Index(
+                fields=["workspace", "-due", "-id"], name="workorder_ws_due_id"
+            ),
+        ),
+    ]
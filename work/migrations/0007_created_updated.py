@@ -0,0 +1,96 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:11
+
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assets", "0003_created_updated"),
+        ("core", "0001_initial"),
+        ("work", "0006_keyset_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="activityinstance",
+            name="created",
+            field=models.DateTimeField(
+                auto_now_add=True,
+                default=django.utils.timezone.now,
+                help_text="The date and time this object was created.",
+                verbose_name="Created",
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="activityinstance",
+            name="updated",
+            field=models.DateTimeField(
+                auto_now=True,
+                help_text="The date and time this object was last updated.",
+                verbose_name="Updated",
+            ),
+        ),
+        migrations.AddField(
+            model_name="maintenancetask",
+            name="created",
+            field=models.DateTimeField(
+                auto_now_add=True,
+                default=django.utils.timezone.now,
+                help_text="The date and time this object was created.",
+                verbose_name="Created",
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="maintenancetask",
+            name="updated",
+            field=models.DateTimeField(
+                auto_now=True,
+                help_text="The date and time this object was last updated.",
+                verbose_name="Updated",
+            ),
+        ),
+        migrations.AddField(
+            model_name="workorder",
+            name="created",
+            field=models.DateTimeField(
+                auto_now_add=True,
+                default=django.utils.timezone.now,
+                help_text="The date and time this object was created.",
+                verbose_name="Created",
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="workorder",
+            name="updated",
+            field=models.DateTimeField(
+                auto_now=True,
+                help_text="The date and time this object was last updated.",
+                verbose_name="Updated",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="activityinstance",
+            index=models.Index(
+                fields=["workspace", "updated", "id"], name="activity_ws_updated"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="maintenancetask",
+            index=models.Index(
+                fields=["workspace", "updated", "id"], name="maintenancetask_ws_updated"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="workorder",
+            index=models.Index(
+                fields=["workspace", "updated", "id"], name="workorder_ws_updated"
+            ),
+        ),
+    ]
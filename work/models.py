@@ -3,15 +3,19 @@
 from django.conf import settings
 from django.db import models
 
+from base.models import CreatedUpdatedBase
 from core.models import Workspace
 
+from .cadence import compile_cadence, validate_cadence
 
-class MaintenanceTask(models.Model):
+
+class MaintenanceTask(CreatedUpdatedBase):
     workspace = models.ForeignKey(
         Workspace, on_delete=models.CASCADE, related_name="tasks"
     )
     name = models.CharField(max_length=120)  # unique per workspace
-    cadence = models.CharField(max_length=30)  # "monthly", "weekly"
+    # "monthly", "weekly", or an RRULE-like rule; see work/cadence.py
+    cadence = models.CharField(max_length=120, validators=[validate_cadence])
     description = models.TextField(blank=True)
     threshold_json = models.JSONField(
         blank=True,
@@ -25,12 +29,23 @@ class MaintenanceTask(models.Model):
 
     class Meta:
         unique_together = [("workspace", "name")]
+        indexes = [
+            # Change feed: a workspace's rows by (updated, id).
+            models.Index(
+                fields=["workspace", "updated", "id"], name="maintenancetask_ws_updated"
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.name} ({self.workspace}, {self.cadence})"
 
+    @property
+    def cadence_rule(self):
+        """The compiled (cached) ``CadenceRule``; raises ``CadenceError``."""
+        return compile_cadence(self.cadence)
+
 
-class WorkOrder(models.Model):
+class WorkOrder(CreatedUpdatedBase):
     workspace = models.ForeignKey(
         Workspace, on_delete=models.CASCADE, related_name="workorders"
     )
@@ -58,11 +73,57 @@ class WorkOrder(models.Model):
         related_name="requested_workorders",
     )
 
+    class Meta:
+        # One WorkOrder per task/asset/due date so generator runs are idempotent.
+        unique_together = [("task", "asset", "due")]
+        indexes = [
+            # API list: membership workspaces, optional status/due range,
+            # ordered by -due; healthcheck: open and due < now.
+            models.Index(
+                fields=["workspace", "status", "due"], name="workorder_ws_status_due"
+            ),
+            # Also the (due, id) keyset of the API's cursor pagination.
+            models.Index(
+                fields=["workspace", "-due", "-id"], name="workorder_ws_due_id"
+            ),
+            # Next open due per asset (rollups); only open rows are indexed.
+            models.Index(
+                fields=["asset", "due"],
+                condition=models.Q(status="open"),
+                name="workorder_open_asset_due",
+            ),
+            # Change feed: a workspace's rows by (updated, id).
+            models.Index(
+                fields=["workspace", "updated", "id"], name="workorder_ws_updated"
+            ),
+        ]
+
     def __str__(self) -> str:
         return f"{self.task} → {self.asset} [{self.status}]"
 
 
-class ActivityInstance(models.Model):
+class GenerationWatermark(models.Model):
+    """
+    How far ``work.tasks.generate_workorders`` has already created WorkOrders
+    for one task/asset pair; the next run starts from ``generated_through``.
+    """
+
+    task = models.ForeignKey(
+        MaintenanceTask, on_delete=models.CASCADE, related_name="watermarks"
+    )
+    asset = models.ForeignKey(
+        "assets.Asset", on_delete=models.CASCADE, related_name="watermarks"
+    )
+    generated_through = models.DateTimeField()
+
+    class Meta:
+        unique_together = [("task", "asset")]
+
+    def __str__(self) -> str:
+        return f"{self.task} → {self.asset} through {self.generated_through:%Y-%m-%d}"
+
+
+class ActivityInstance(CreatedUpdatedBase):
     workspace = models.ForeignKey(
         Workspace, on_delete=models.CASCADE, related_name="activities"
     )
@@ -92,6 +153,28 @@ class ActivityInstance(models.Model):
         related_name="performed_activities",
     )
 
+    class Meta:
+        indexes = [
+            # API list: membership workspaces ordered by -occurred_at, and
+            # the (occurred_at, id) keyset of the API's cursor pagination.
+            models.Index(
+                fields=["workspace", "-occurred_at", "-id"],
+                name="activity_ws_occurred_id",
+            ),
+            # Per-asset history (rollups) and asset/kind filters.
+            models.Index(
+                fields=["asset", "-occurred_at"], name="activity_asset_occurred"
+            ),
+            models.Index(
+                fields=["asset", "kind", "-occurred_at"],
+                name="activity_asset_kind_occurred",
+            ),
+            # Change feed: a workspace's rows by (updated, id).
+            models.Index(
+                fields=["workspace", "updated", "id"], name="activity_ws_updated"
+            ),
+        ]
+
     def __str__(self) -> str:
         return (
             f"{self.get_kind_display()} on {self.asset} at {self.occurred_at:%Y-%m-%d}"
@@ -0,0 +1,122 @@
+# work/rollups.py
+
+"""
+Asset rollup columns: ``next_due_at``, ``open_workorder_count`` and
+``last_activity_at``.
+
+They are recomputed from the work tables for just the assets that changed:
+``work.signals`` covers single-row saves and deletes, and the bulk paths
+(generator, admin actions, healthcheck), which skip signals, call
+``refresh_asset_rollups`` themselves. A queryset ``delete()`` sends the
+signals once per row, so bulk deletes run inside ``deferred_rollups()``.
+Each refresh is one UPDATE per chunk of assets, so readers never aggregate
+over WorkOrders or activities. It only touches the assets whose rollups
+changed, so the change feed does not report the others.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from datetime import timezone as dt_timezone
+
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from assets.models import Asset
+from core.versions import SHARED, bump_versions, bump_workspace_versions
+
+from .models import ActivityInstance, WorkOrder
+
+# Asset ids per UPDATE; keeps the IN (...) list well below database limits.
+CHUNK_SIZE = 500
+
+# The asset ids collected by the innermost ``deferred_rollups()`` block.
+_deferred = ContextVar("deferred_rollups", default=None)
+
+# Stands in for NULL when comparing the datetime rollups.
+_NEVER = datetime(1, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def rollup_values():
+    """``update()`` kwargs that compute the rollups of each updated asset."""
+    open_orders = WorkOrder.objects.filter(asset=OuterRef("pk"), status="open")
+    open_count = (
+        open_orders.order_by().values("asset").annotate(n=Count("pk")).values("n")
+    )
+    last_activity = ActivityInstance.objects.filter(asset=OuterRef("pk")).order_by(
+        "-occurred_at"
+    )
+    return {
+        "next_due_at": Subquery(open_orders.order_by("due").values("due")[:1]),
+        "open_workorder_count": Coalesce(Subquery(open_count), 0),
+        "last_activity_at": Subquery(last_activity.values("occurred_at")[:1]),
+        # The rollups are part of the API payload, so the change feed must
+        # see refreshed assets; update() skips auto_now.
+        "updated": timezone.now(),
+    }
+
+
+def _stale(assets):
+    """The ``assets`` whose stored rollups differ from ``rollup_values()``."""
+    values = rollup_values()
+    return assets.alias(
+        _next_due_at=Coalesce(values["next_due_at"], Value(_NEVER)),
+        _stored_next_due_at=Coalesce("next_due_at", Value(_NEVER)),
+        _open_workorder_count=values["open_workorder_count"],
+        _last_activity_at=Coalesce(values["last_activity_at"], Value(_NEVER)),
+        _stored_last_activity_at=Coalesce("last_activity_at", Value(_NEVER)),
+    ).exclude(
+        _stored_next_due_at=F("_next_due_at"),
+        open_workorder_count=F("_open_workorder_count"),
+        _stored_last_activity_at=F("_last_activity_at"),
+    )
+
+
+def refresh_asset_rollups(asset_ids):
+    """Recompute the rollups of ``asset_ids``; returns the number changed."""
+    asset_ids = sorted({pk for pk in asset_ids if pk is not None})
+    values = rollup_values()
+    updated = 0
+    for i in range(0, len(asset_ids), CHUNK_SIZE):
+        chunk = asset_ids[i : i + CHUNK_SIZE]
+        updated += _stale(Asset.objects.filter(pk__in=chunk)).update(**values)
+    return updated
+
+
+def queue_asset_rollups(asset_ids):
+    """``refresh_asset_rollups`` now, or at the end of ``deferred_rollups()``."""
+    pending = _deferred.get()
+    if pending is None:
+        refresh_asset_rollups(asset_ids)
+    else:
+        pending.update(asset_ids)
+
+
+@contextmanager
+def deferred_rollups():
+    """
+    Collect the refreshes the signal handlers queue inside the block and run
+    them as one ``refresh_asset_rollups`` when it exits without an error.
+    """
+    pending = set()
+    token = _deferred.set(pending)
+    try:
+        yield
+    finally:
+        _deferred.reset(token)
+    refresh_asset_rollups(pending)
+
+
+def rebuild_asset_rollups(workspace_id=None):
+    """
+    Recompute the rollups of every asset (of one workspace) in one UPDATE;
+    returns the number of assets whose rollups had drifted.
+    """
+    assets = Asset.objects.all()
+    if workspace_id is not None:
+        assets = assets.filter(workspace_id=workspace_id)
+        bump_workspace_versions({workspace_id})
+    else:
+        bump_versions([SHARED])
+    return _stale(assets).update(**rollup_values())
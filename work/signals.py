@@ -0,0 +1,52 @@
+# work/signals.py
+
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from .models import ActivityInstance, WorkOrder
+from .rollups import queue_asset_rollups
+
+
+def remember_previous_asset(sender, instance, raw=False, **kwargs) -> None:
+    """
+    Before an existing row is saved, note the asset it belonged to, so a row
+    moved to another asset also refreshes the one it left.
+    """
+    if raw or instance.pk is None:
+        return
+    instance._previous_asset_id = (
+        sender.objects.filter(pk=instance.pk)
+        .values_list("asset_id", flat=True)
+        .first()
+    )
+
+
+def refresh_rollups_on_save(sender, instance, raw=False, **kwargs) -> None:
+    """Refresh the rollup columns of the asset(s) a saved row touches."""
+    if raw:
+        return
+    previous = getattr(instance, "_previous_asset_id", None)
+    queue_asset_rollups({instance.asset_id, previous})
+
+
+def refresh_rollups_on_delete(sender, instance, **kwargs) -> None:
+    queue_asset_rollups({instance.asset_id})
+
+
+def connect_signals():
+    for model in (WorkOrder, ActivityInstance):
+        uid = model._meta.label_lower
+        pre_save.connect(
+            remember_previous_asset,
+            sender=model,
+            dispatch_uid=f"{uid}_remember_previous_asset",
+        )
+        post_save.connect(
+            refresh_rollups_on_save,
+            sender=model,
+            dispatch_uid=f"{uid}_refresh_rollups_on_save",
+        )
+        post_delete.connect(
+            refresh_rollups_on_delete,
+            sender=model,
+            dispatch_uid=f"{uid}_refresh_rollups_on_delete",
+        )
@@ -0,0 +1,101 @@
+# work/tasks.py
+
+import logging
+
+from celery import chord, shared_task
+from celery.result import allow_join_result
+from django.conf import settings
+from django.db.models import Count
+
+from assets.models import Asset
+from core.models import Workspace
+
+from .generator import generate_for_workspace
+
+logger = logging.getLogger(__name__)
+
+
+def _shards(workspaces, shard_size):
+    """
+    Return ``[(workspace_id, asset_id_range)]`` units of work. A workspace with
+    more than ``shard_size`` assets is cut into consecutive id ranges of
+    ``shard_size`` assets; the outer ranges are open so assets created in the
+    meantime are still covered. Other workspaces are one unit (range ``None``).
+    """
+    shards = []
+    for ws_id, asset_count in workspaces.annotate(
+        asset_count=Count("assets")
+    ).values_list("id", "asset_count"):
+        if asset_count <= shard_size:
+            shards.append((ws_id, None))
+            continue
+        ids = Asset.objects.filter(workspace_id=ws_id).order_by("id")
+        cuts = list(ids.values_list("id", flat=True)[shard_size::shard_size])
+        lows = [None] + cuts
+        highs = [cut - 1 for cut in cuts] + [None]
+        shards.extend((ws_id, [low, high]) for low, high in zip(lows, highs))
+    return shards
+
+
+@shared_task
+def generate_workorders_for_workspace(
+    workspace_id, horizon_days=None, mode=None, asset_id_range=None
+):
+    """
+    Create upcoming WorkOrders for one workspace, or for the assets of one
+    workspace whose ids fall in ``asset_id_range``. Part of the chord started
+    by ``generate_workorders``.
+    """
+    counts = generate_for_workspace(
+        workspace_id,
+        horizon_days=horizon_days,
+        mode=mode,
+        asset_id_range=asset_id_range,
+    )
+    return {"workspace": workspace_id, **counts}
+
+
+@shared_task(bind=True)
+def summarize_workorder_generation(self, results):
+    """Chord callback: add up the counts of all generation subtasks."""
+    totals = {
+        "workspaces": len({result["workspace"] for result in results}),
+        "created": sum(result["created"] for result in results),
+        "skipped": sum(result["skipped"] for result in results),
+    }
+    logger.info(
+        "generate_workorders finished. Task id=%s totals=%s", self.request.id, totals
+    )
+    return totals
+
+
+@shared_task(bind=True)
+def generate_workorders(self, workspace_id=None, horizon_days=None, mode=None):
+    """
+    Create upcoming WorkOrders from every MaintenanceTask's cadence.
+
+    Runs for a single workspace when ``workspace_id`` is given, otherwise for
+    all of them. ``mode`` overrides ``settings.WORKORDER_GENERATOR_MODE``.
+
+    The work is fanned out as a chord of ``generate_workorders_for_workspace``
+    subtasks (one per workspace, or per ``WORKORDER_SHARD_SIZE`` assets of a
+    large one) so it spreads over all workers. This task is replaced by the
+    chord, so its result is the aggregated ``created``/``skipped`` counts.
+    """
+    workspaces = Workspace.objects.all()
+    if workspace_id is not None:
+        workspaces = workspaces.filter(id=workspace_id)
+
+    header = [
+        generate_workorders_for_workspace.s(ws_id, horizon_days, mode, id_range)
+        for ws_id, id_range in _shards(workspaces, settings.WORKORDER_SHARD_SIZE)
+    ]
+    if not header:
+        return summarize_workorder_generation(results=[])
+
+    workflow = chord(header, summarize_workorder_generation.s())
+    if self.request.is_eager:
+        # Without workers (CELERY_TASK_ALWAYS_EAGER) the chord runs inline.
+        with allow_join_result():
+            return workflow.apply().get()
+    return self.replace(workflow)
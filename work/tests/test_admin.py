@@ -1,6 +1,6 @@
 # work/tests/test_admin.py
 
-from datetime import timedelta
+from datetime import datetime, timedelta
 
 import pytest
 from django.contrib import admin as dj_admin
@@ -72,18 +72,127 @@ def test_maintenance_task_admin_configuration():
 
 
 @pytest.mark.django_db
-def test_generate_preview_action_noop():
+def test_generate_preview_action_redirects_without_db_changes():
     """
-    MaintenanceTaskAdmin.generate_preview should be callable and side-effect free.
+    MaintenanceTaskAdmin.generate_preview should only point at the preview page.
     """
     workspace = Workspace.objects.create(name="WS", slug="ws")
-    MaintenanceTask.objects.create(workspace=workspace, name="Task", cadence="monthly")
+    task = MaintenanceTask.objects.create(
+        workspace=workspace, name="Task", cadence="monthly"
+    )
 
     ma = MaintenanceTaskAdmin(MaintenanceTask, dj_admin.site)
     qs = MaintenanceTask.objects.all()
 
-    # Should not raise
-    ma.generate_preview(request=None, queryset=qs)
+    response = ma.generate_preview(request=None, queryset=qs)
+
+    assert response.status_code == 302
+    assert response.url == f"/admin/work/maintenancetask/preview/?ids={task.pk}"
+    assert WorkOrder.objects.count() == 0
+
+
+def _preview(client, *tasks, **params):
+    ids = ",".join(str(task.pk) for task in tasks)
+    response = client.get(
+        "/admin/work/maintenancetask/preview/", {"ids": ids, **params}
+    )
+    assert response.status_code == 200
+    assert response.streaming
+    return b"".join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+def test_preview_streams_next_occurrences_per_asset(admin_client, monkeypatch):
+    workspace = Workspace.objects.create(name="WS", slug="ws")
+    for name in ("pi-a", "pi-b"):
+        Asset.objects.create(workspace=workspace, name=name, kind="PI")
+    task = MaintenanceTask.objects.create(
+        workspace=workspace, name="Backups", cadence="weekly"
+    )
+    monkeypatch.setattr(
+        "work.admin.timezone.now",
+        lambda: timezone.make_aware(datetime(2025, 1, 15, 10)),
+    )
+
+    html = _preview(admin_client, task, n=3)
+
+    assert "Backups" in html
+    table = html.split('<table class="preview">')[1].split("</table>")[0]
+    assert table.count("<tr>") == 2
+    assert table.count("<td>") == 6
+    assert "Jan. 20, 2025" in table and "Feb. 3, 2025" in table
+    assert "Feb. 10, 2025" not in table
+    assert WorkOrder.objects.count() == 0
+
+
+@pytest.mark.django_db
+def test_preview_is_paginated_by_asset(admin_client, monkeypatch):
+    monkeypatch.setattr(MaintenanceTaskAdmin, "preview_page_size", 1)
+    workspace = Workspace.objects.create(name="WS", slug="ws")
+    for name in ("pi-a", "pi-b"):
+        Asset.objects.create(workspace=workspace, name=name, kind="PI")
+    task = MaintenanceTask.objects.create(
+        workspace=workspace, name="Backups", cadence="weekly"
+    )
+
+    first = _preview(admin_client, task)
+    second = _preview(admin_client, task, page=2)
+
+    assert "pi-a" in first and "pi-b" not in first
+    assert "pi-b" in second and "pi-a" not in second
+    assert "page=2" in first and "Next assets" in first
+    assert "Next assets" not in second
+
+
+@pytest.mark.django_db
+def test_preview_reports_invalid_cadence(admin_client):
+    workspace = Workspace.objects.create(name="WS", slug="ws")
+    Asset.objects.create(workspace=workspace, name="pi-a", kind="PI")
+    task = MaintenanceTask.objects.create(
+        workspace=workspace, name="Someday", cadence="monthly"
+    )
+    MaintenanceTask.objects.filter(pk=task.pk).update(cadence="whenever")
+
+    html = _preview(admin_client, task)
+
+    assert "errornote" in html
+    assert "Unknown cadence" in html
+
+
+@pytest.mark.django_db
+def test_preview_stops_at_its_horizon(admin_client):
+    """Dates past the horizon are not looked for."""
+    workspace = Workspace.objects.create(name="WS", slug="ws")
+    Asset.objects.create(workspace=workspace, name="pi-a", kind="PI")
+    task = MaintenanceTask.objects.create(
+        workspace=workspace, name="Someday", cadence="FREQ=DAILY;DTSTART=2200-01-01"
+    )
+
+    html = _preview(admin_client, task)
+
+    table = html.split('<table class="preview">')[1].split("</table>")[0]
+    assert "pi-a" in table
+    assert "<td>" not in table
+    assert "errornote" not in html
+
+
+@pytest.mark.django_db
+def test_preview_reports_dates_past_the_calendar(admin_client, monkeypatch):
+    workspace = Workspace.objects.create(name="WS", slug="ws")
+    Asset.objects.create(workspace=workspace, name="pi-a", kind="PI")
+    task = MaintenanceTask.objects.create(
+        workspace=workspace, name="Backups", cadence="weekly"
+    )
+    monkeypatch.setattr(
+        "work.admin.timezone.now",
+        lambda: timezone.make_aware(datetime(9999, 12, 1)),
+    )
+
+    html = _preview(admin_client, task)
+
+    assert "errornote" in html
+    assert "Cannot preview this cadence" in html
+    assert html.rstrip().endswith("</html>")
 
 
 def test_work_order_admin_configuration():
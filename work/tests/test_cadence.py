@@ -0,0 +1,250 @@
+# work/tests/test_cadence.py
+
+from datetime import date, datetime, timedelta
+from itertools import islice
+from zoneinfo import ZoneInfo
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+
+from work.cadence import (CadenceError, compile_cadence, parse_cadence,
+                          validate_cadence)
+from work.models import MaintenanceTask
+
+
+def _aware(*args, tz=None):
+    return datetime(*args, tzinfo=tz or timezone.get_current_timezone())
+
+
+def _dues(cadence, start, days):
+    return list(compile_cadence(cadence).occurrences(start, start + timedelta(days)))
+
+
+# Wednesday, mid-morning local time
+NOW = _aware(2025, 1, 15, 10, 0)
+
+
+# --- Aliases ----------------------------------------------------------------
+
+
+def test_weekly_falls_on_local_mondays():
+    assert _dues("weekly", NOW, 21) == [
+        _aware(2025, 1, 20),
+        _aware(2025, 1, 27),
+        _aware(2025, 2, 3),
+    ]
+
+
+def test_monthly_falls_on_the_first():
+    assert _dues("Monthly ", NOW, 60) == [_aware(2025, 2, 1), _aware(2025, 3, 1)]
+
+
+def test_daily_and_quarterly():
+    assert _dues("daily", NOW, 3) == [
+        _aware(2025, 1, 16),
+        _aware(2025, 1, 17),
+        _aware(2025, 1, 18),
+    ]
+    assert _dues("quarterly", NOW, 365) == [
+        _aware(2025, 4, 1),
+        _aware(2025, 7, 1),
+        _aware(2025, 10, 1),
+        _aware(2026, 1, 1),
+    ]
+
+
+def test_window_start_is_inclusive_and_end_exclusive():
+    start = _aware(2025, 1, 20)
+    rule = compile_cadence("weekly")
+
+    assert list(rule.occurrences(start, _aware(2025, 1, 27))) == [start]
+
+
+def test_alias_parts_override_defaults():
+    assert _dues("weekly;BYDAY=TU,TH;BYHOUR=9", NOW, 7) == [
+        _aware(2025, 1, 16, 9),
+        _aware(2025, 1, 21, 9),
+    ]
+    # An explicit day selector replaces the alias' BYMONTHDAY=1.
+    assert _dues("monthly;BYDAY=2TU", NOW, 40) == [_aware(2025, 2, 11)]
+
+
+# --- RRULE-like parts -------------------------------------------------------
+
+
+def test_interval_is_counted_from_dtstart():
+    rule = "FREQ=WEEKLY;INTERVAL=2;BYDAY=FR;DTSTART=2025-01-10"
+
+    assert _dues(rule, NOW, 28) == [_aware(2025, 1, 24), _aware(2025, 2, 7)]
+
+
+def test_nth_and_last_weekday_of_month():
+    assert _dues("FREQ=MONTHLY;BYDAY=-1FR", NOW, 45) == [
+        _aware(2025, 1, 31),
+        _aware(2025, 2, 28),
+    ]
+    # January and February 2025 have no fifth Monday.
+    assert _dues("FREQ=MONTHLY;BYDAY=5MO", NOW, 80) == [_aware(2025, 3, 31)]
+
+
+def test_negative_monthday_counts_from_month_end():
+    assert _dues("FREQ=MONTHLY;BYMONTHDAY=-1", NOW, 45) == [
+        _aware(2025, 1, 31),
+        _aware(2025, 2, 28),
+    ]
+
+
+def test_yearly_by_month():
+    assert _dues("FREQ=YEARLY;BYMONTH=3,9;BYMONTHDAY=15", NOW, 365) == [
+        _aware(2025, 3, 15),
+        _aware(2025, 9, 15),
+    ]
+
+
+def test_daily_by_weekday_skips_weekends():
+    dues = _dues("FREQ=DAILY;BYDAY=MO,TU,WE,TH,FR", _aware(2025, 1, 17), 4)
+
+    assert dues == [_aware(2025, 1, 17), _aware(2025, 1, 20)]
+
+
+@pytest.mark.parametrize(
+    "shift, expected",
+    [
+        ("NEXT", _aware(2025, 3, 3)),  # Sat Mar 1 -> Mon
+        ("PREVIOUS", _aware(2025, 2, 28)),  # -> Fri
+        ("NEAREST", _aware(2025, 2, 28)),  # Saturday -> Fri
+    ],
+)
+def test_business_day_shift(shift, expected):
+    start = _aware(2025, 2, 15)
+
+    assert _dues(f"monthly;SHIFT={shift}", start, 20) == [expected]
+
+
+@pytest.mark.parametrize(
+    "cadence, days, expected",
+    [
+        # Sat Jan 4 and Sun Jan 5 both move to Mon Jan 6.
+        ("FREQ=DAILY;SHIFT=NEXT", 8, [2, 3, 6, 7, 8, 9]),
+        # Each Sunday moves onto the next week's Monday.
+        ("FREQ=WEEKLY;BYDAY=SU,MO;SHIFT=NEXT", 14, [6, 13]),
+    ],
+)
+def test_shifted_dates_are_not_repeated_across_periods(cadence, days, expected):
+    dues = _dues(cadence, _aware(2025, 1, 2), days)
+
+    assert dues == [_aware(2025, 1, day) for day in expected]
+
+
+def test_time_zone_and_dst():
+    berlin = ZoneInfo("Europe/Berlin")
+    rule = compile_cadence("FREQ=DAILY;BYHOUR=2;BYMINUTE=30;TZ=Europe/Berlin")
+
+    start = _aware(2025, 3, 29, tz=berlin)
+    dues = list(rule.occurrences(start, start + timedelta(days=3)))
+
+    # 02:30 does not exist on Mar 30 (clocks jump 02:00 -> 03:00).
+    assert [d.strftime("%m-%d %H:%M %Z") for d in dues] == [
+        "03-29 02:30 CET",
+        "03-30 03:30 CEST",
+        "03-31 02:30 CEST",
+    ]
+    # Wall-clock time stays put across the change, the UTC instant moves.
+    utc = ZoneInfo("UTC")
+    assert dues[2].astimezone(utc) - dues[0].astimezone(utc) == timedelta(
+        days=2, hours=-1
+    )
+
+
+def test_occurrences_are_lazy_without_end():
+    rule = compile_cadence("daily")
+
+    first = list(islice(rule.occurrences(NOW), 2))
+
+    assert first == [_aware(2025, 1, 16), _aware(2025, 1, 17)]
+
+
+def test_anchor_replaces_dtstart_per_asset():
+    rule = compile_cadence("FREQ=WEEKLY;INTERVAL=2;ANCHOR=PURCHASE_DATE")
+    anchored = rule.anchored(date(2025, 1, 17))
+
+    assert rule.anchor_field == "purchase_date"
+    assert rule.anchored(None) is rule
+    assert list(anchored.occurrences(NOW, NOW + timedelta(days=28))) == [
+        _aware(2025, 1, 17),
+        _aware(2025, 1, 31),
+    ]
+
+
+# --- Parsing / caching ------------------------------------------------------
+
+
+def test_compiled_rules_are_cached():
+    assert compile_cadence(" weekly ") is compile_cadence("weekly")
+    assert parse_cadence("weekly") is not compile_cadence("weekly")
+
+
+@pytest.mark.parametrize(
+    "cadence",
+    [
+        "",
+        "fortnightly-ish",
+        "FREQ=HOURLY",
+        "INTERVAL=2",
+        "FREQ=WEEKLY;INTERVAL=0",
+        "FREQ=WEEKLY;BYDAY=2MO",
+        "FREQ=WEEKLY;BYMONTHDAY=1",
+        "FREQ=MONTHLY;BYMONTH=1",
+        "FREQ=MONTHLY;BYMONTHDAY=0",
+        "FREQ=DAILY;BYHOUR=24",
+        "FREQ=DAILY;SHIFT=SIDEWAYS",
+        "FREQ=DAILY;TZ=Mars/Olympus",
+        "FREQ=DAILY;DTSTART=yesterday",
+        "FREQ=DAILY;FREQ=WEEKLY",
+        "FREQ=DAILY;COLOR=RED",
+        "weekly;BYDAY=XX",
+        "FREQ=MONTHLY;ANCHOR=BIRTHDAY",
+        # Rules that never produce a date.
+        "FREQ=DAILY;INTERVAL=7;BYDAY=TU",
+        "FREQ=DAILY;INTERVAL=14;BYDAY=MO;ANCHOR=PURCHASE_DATE",
+        "FREQ=YEARLY;BYMONTH=2;BYMONTHDAY=-30",
+        "FREQ=YEARLY;BYMONTHDAY=-31;DTSTART=2025-04-01",
+    ],
+)
+def test_invalid_cadences_are_rejected(cadence):
+    with pytest.raises(CadenceError):
+        compile_cadence(cadence)
+
+    with pytest.raises(ValidationError):
+        validate_cadence(cadence)
+
+
+@pytest.mark.parametrize(
+    "cadence",
+    [
+        "FREQ=DAILY;INTERVAL=7;BYDAY=MO",
+        "FREQ=DAILY;INTERVAL=6;BYDAY=TU",
+        "FREQ=YEARLY;BYMONTH=2,3;BYMONTHDAY=-30",
+        "FREQ=YEARLY;BYMONTH=2;BYMONTHDAY=-29,31",
+        "FREQ=MONTHLY;BYMONTHDAY=-31",
+    ],
+)
+def test_rules_close_to_impossible_ones_produce_dates(cadence):
+    validate_cadence(cadence)
+    rule = compile_cadence(cadence)
+    start = timezone.make_aware(datetime(2025, 1, 1))
+
+    assert list(rule.occurrences(start, start + timedelta(days=366)))
+
+
+@pytest.mark.django_db
+def test_maintenance_task_validates_and_exposes_rule(workspace):
+    task = MaintenanceTask(workspace=workspace, name="Patch", cadence="weekly")
+    task.full_clean()
+    assert task.cadence_rule is compile_cadence("weekly")
+
+    task.cadence = "every now and then"
+    with pytest.raises(ValidationError) as excinfo:
+        task.full_clean()
+    assert "cadence" in excinfo.value.message_dict
@@ -0,0 +1,100 @@
+# work/tests/test_expansion.py
+
+from datetime import date, datetime, timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from work import expansion
+from work.cadence import compile_cadence
+from work.expansion import expand, expand_scalar
+
+
+def _aware(*args):
+    return datetime(*args, tzinfo=timezone.get_current_timezone())
+
+
+NOW = _aware(2025, 1, 15, 10, 0)
+
+ANCHORS = [
+    date(2024, 11, 29),  # Friday
+    date(2023, 1, 31),  # month end
+    None,  # falls back to DTSTART
+    date(2025, 3, 2),  # after the window start
+    date(2027, 1, 1),  # after the window end
+]
+
+
+def test_anchored_rule_counts_from_the_anchor():
+    rule = compile_cadence("FREQ=MONTHLY;INTERVAL=6;ANCHOR=PURCHASE_DATE")
+
+    positions, dues = expand_scalar(
+        rule, [date(2024, 8, 31), None], [NOW, NOW], NOW + timedelta(days=365)
+    )
+
+    # Feb has no 31st; the default DTSTART (2000-01-03) gives Jul 3 and Jan 3.
+    assert positions == [0, 0, 1, 1]
+    assert dues == [
+        _aware(2025, 2, 28),
+        _aware(2025, 8, 31),
+        _aware(2025, 7, 3),
+        _aware(2026, 1, 3),
+    ]
+
+
+def test_no_occurrences_before_the_anchor():
+    rule = compile_cadence("weekly;ANCHOR=PURCHASE_DATE")
+
+    _, dues = expand_scalar(rule, [date(2025, 1, 29)], [NOW], NOW + timedelta(21))
+
+    assert dues == [_aware(2025, 2, 3)]
+
+
+@pytest.mark.parametrize(
+    "cadence",
+    [
+        "FREQ=DAILY;INTERVAL=3;ANCHOR=PURCHASE_DATE",
+        "FREQ=DAILY;SHIFT=NEXT;ANCHOR=PURCHASE_DATE",
+        "FREQ=WEEKLY;ANCHOR=PURCHASE_DATE",
+        "FREQ=WEEKLY;INTERVAL=2;SHIFT=NEXT;ANCHOR=PURCHASE_DATE",
+        "FREQ=MONTHLY;ANCHOR=WARRANTY_EXPIRES;BYHOUR=9",
+        "FREQ=MONTHLY;BYMONTHDAY=-1;SHIFT=PREVIOUS;ANCHOR=PURCHASE_DATE",
+        "FREQ=MONTHLY;BYMONTHDAY=-31;ANCHOR=PURCHASE_DATE",
+        "FREQ=YEARLY;SHIFT=NEAREST;ANCHOR=PURCHASE_DATE",
+        "quarterly;ANCHOR=PURCHASE_DATE",
+        "FREQ=DAILY;BYHOUR=2;BYMINUTE=30;TZ=Europe/Berlin;ANCHOR=PURCHASE_DATE",
+    ],
+)
+def test_vectorized_matches_scalar(cadence, monkeypatch):
+    pytest.importorskip("numpy")
+    monkeypatch.setattr(expansion, "BLOCK_SIZE", 2)
+    rule = compile_cadence(cadence)
+    starts = [NOW, NOW, NOW + timedelta(days=40), NOW, NOW]
+    end = NOW + timedelta(days=500)
+
+    assert rule.vectorizable
+    vectorized = expand(rule, ANCHORS, starts, end)
+    assert vectorized == expand_scalar(rule, ANCHORS, starts, end)
+    assert vectorized[0]
+
+
+def test_rules_with_several_dates_per_period_use_the_scalar_path(monkeypatch):
+    rule = compile_cadence("weekly;BYDAY=MO,TH;ANCHOR=PURCHASE_DATE")
+    monkeypatch.setattr(expansion, "_block_dates", None)
+
+    assert not rule.vectorizable
+    assert expand(rule, ANCHORS, [NOW] * 5, NOW + timedelta(7)) == expand_scalar(
+        rule, ANCHORS, [NOW] * 5, NOW + timedelta(7)
+    )
+
+
+def test_benchmark_command_reports_speedup():
+    pytest.importorskip("numpy")
+    out = StringIO()
+
+    call_command("benchmark_occurrences", "--assets=200", "--weeks=8", stdout=out)
+
+    assert "200 assets x 8 weeks" in out.getvalue()
+    assert "1600 occurrences" in out.getvalue()
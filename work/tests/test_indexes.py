@@ -0,0 +1,203 @@
+# work/tests/test_indexes.py
+#
+# Guard the composite/partial indexes of WorkOrder and ActivityInstance: each
+# hot query must still be answered by the index it was designed for. Plans are
+# backend-specific: most checks run on SQLite (the default dev/test DB), and
+# the API list pages are also checked on PostgreSQL (production).
+
+import re
+from datetime import timedelta
+
+import pytest
+from django.db import connection, transaction
+from django.db.models import Q
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from assets.models import Asset
+from core.models import Membership
+from core.tasks import _overdue_by_asset
+from work.models import ActivityInstance, MaintenanceTask, WorkOrder
+
+pytestmark = pytest.mark.django_db
+
+sqlite_only = pytest.mark.skipif(
+    connection.vendor != "sqlite", reason="SQLite query plan"
+)
+postgres_only = pytest.mark.skipif(
+    connection.vendor != "postgresql", reason="PostgreSQL query plan"
+)
+
+
+@sqlite_only
+def test_workorder_list_uses_workspace_due_index(workspace):
+    orders = WorkOrder.objects.filter(workspace=workspace).order_by("-due")
+
+    plan = orders[:50].explain()
+
+    assert "workorder_ws_due_id" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+@sqlite_only
+def test_workorder_keyset_page_is_a_range_scan(workspace):
+    now = timezone.now()
+    after = Q(due__lte=now) & (Q(due__lt=now) | Q(pk__lt=100))
+    orders = WorkOrder.objects.filter(workspace=workspace).filter(after)
+
+    plan = orders.order_by("-due", "-id")[:21].explain()
+
+    assert "workorder_ws_due_id (workspace_id=? AND due<?)" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+@sqlite_only
+def test_open_workorders_past_due_use_workspace_status_due_index(workspace):
+    now = timezone.now()
+
+    plan = _overdue_by_asset(workspace.id, now).explain()
+
+    assert "workorder_ws_status_due (workspace_id=? AND status=? AND due<?)" in plan
+    assert "activity_asset_kind_occurred" in plan
+
+
+@sqlite_only
+def test_next_open_due_uses_partial_index():
+    open_orders = WorkOrder.objects.filter(asset_id=1, status="open")
+
+    plan = open_orders.order_by("due").values("due")[:1].explain()
+
+    assert "workorder_open_asset_due" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+@sqlite_only
+def test_activity_list_and_history_use_occurred_indexes(workspace):
+    activities = ActivityInstance.objects.order_by("-occurred_at")
+
+    listing = activities.filter(workspace=workspace)[:50].explain()
+    history = activities.filter(asset_id=1)[:1].explain()
+    by_kind = activities.filter(asset_id=1, kind="patched")[:50].explain()
+
+    assert "activity_ws_occurred_id" in listing
+    assert "activity_asset_occurred" in history
+    assert "activity_asset_kind_occurred" in by_kind
+    for plan in (listing, history, by_kind):
+        assert "TEMP B-TREE" not in plan
+
+
+# --- The API's list queries -------------------------------------------------
+
+
+@pytest.fixture
+def rows(workspace, another_workspace, now):
+    """25 work orders and activities in each workspace."""
+    for ws in (workspace, another_workspace):
+        asset = Asset.objects.create(workspace=ws, name="Pi", kind="PI")
+        task = MaintenanceTask.objects.create(
+            workspace=ws, name="Patch OS", cadence="monthly"
+        )
+        WorkOrder.objects.bulk_create(
+            WorkOrder(workspace=ws, asset=asset, task=task, due=now + timedelta(i))
+            for i in range(25)
+        )
+        ActivityInstance.objects.bulk_create(
+            ActivityInstance(
+                workspace=ws,
+                asset=asset,
+                kind="checked",
+                occurred_at=now - timedelta(hours=i),
+            )
+            for i in range(25)
+        )
+
+
+def _page_query(user, url, table):
+    """The SQL that reads the rows of ``url``'s page, and the response."""
+    client = APIClient()
+    client.force_authenticate(user=user)
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == 200
+    sql = next(
+        q["sql"]
+        for q in queries
+        if q["sql"].startswith("SELECT")
+        and f'FROM "{table}"' in q["sql"]
+        and "LIMIT" in q["sql"]
+    )
+    return sql, response
+
+
+# Each list is served from its workspace-leading index, also for members of
+# several workspaces: any other plan reads the rows of every other tenant.
+LIST_PAGES = [
+    ("/api/work-orders/", "work_workorder", "workorder_ws_due_id"),
+    ("/api/work-orders/?status=open", "work_workorder", "workorder_ws_status_due"),
+    ("/api/work-orders/?pagination=cursor", "work_workorder", "workorder_ws_due_id"),
+    ("/api/activities/", "work_activityinstance", "activity_ws_occurred_id"),
+    (
+        "/api/activities/?pagination=cursor",
+        "work_activityinstance",
+        "activity_ws_occurred_id",
+    ),
+]
+
+
+@sqlite_only
+@pytest.mark.parametrize("url, table, index", LIST_PAGES)
+def test_api_list_pages_read_the_workspace_index(
+    url, table, index, rows, user, workspace, another_workspace
+):
+    Membership.objects.create(user=user, workspace=workspace, role="viewer")
+    sql, _ = _page_query(user, url, table)
+    plan = _sqlite_plan(sql)
+    assert index in plan
+    assert "TEMP B-TREE" not in plan
+
+    # Several workspaces: SQLite reads one workspace range each and sorts
+    # them; which workspace index it picks is up to its planner.
+    Membership.objects.create(user=user, workspace=another_workspace, role="viewer")
+    sql, response = _page_query(user, url, table)
+    plan = _sqlite_plan(sql)
+    assert f"SEARCH {table} USING INDEX" in plan
+    assert "(workspace_id=?" in plan
+    assert {item["workspace"] for item in response.json()["results"]} == {
+        workspace.slug,
+        another_workspace.slug,
+    }
+
+
+@postgres_only
+@pytest.mark.parametrize("url, table, index", LIST_PAGES)
+def test_api_list_pages_read_the_workspace_index_on_postgres(
+    url, table, index, rows, user, workspace, another_workspace
+):
+    Membership.objects.create(user=user, workspace=workspace, role="viewer")
+    Membership.objects.create(user=user, workspace=another_workspace, role="viewer")
+    for _ in range(2):
+        sql, response = _page_query(user, url, table)
+        plan = _postgres_plan(sql)
+        # workspace_id IN (...) is an index condition, not a filter on rows
+        # of every workspace.
+        assert re.search(r"Index Cond: .*workspace_id = ANY", plan)
+        assert "Seq Scan" not in plan
+        if "cursor" not in url:
+            break
+        # The next page seeks from the cursor on the same index.
+        url = response.json()["next"]
+
+
+def _sqlite_plan(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        return "\n".join(row[-1] for row in cursor.fetchall())
+
+
+def _postgres_plan(sql):
+    # The fixtures are tiny, so compare the index plans only.
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("SET LOCAL enable_seqscan = off")
+        cursor.execute(f"EXPLAIN {sql}")
+        return "\n".join(row[0] for row in cursor.fetchall())
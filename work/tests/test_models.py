@@ -1,5 +1,7 @@
 # work/tests/test_models.py
 
+from datetime import timedelta
+
 import pytest
 from django.contrib.auth import get_user_model
 from django.db import IntegrityError, transaction
@@ -136,7 +138,7 @@ def test_workorder_status_choices(workspace):
         workspace=workspace,
         asset=asset,
         task=task,
-        due=due,
+        due=due + timedelta(days=1),
         status="cancelled",
     )
 
@@ -144,6 +146,29 @@ def test_workorder_status_choices(workspace):
     assert wo_cancelled.status == "cancelled"
 
 
+@pytest.mark.django_db
+def test_workorder_unique_per_task_asset_and_due(workspace):
+    asset = _create_asset(workspace)
+    task = MaintenanceTask.objects.create(
+        workspace=workspace, name="Reboot", cadence="monthly"
+    )
+    due = timezone.now()
+    WorkOrder.objects.create(workspace=workspace, asset=asset, task=task, due=due)
+
+    # Same task/asset/due should violate unique_together
+    with pytest.raises(IntegrityError):
+        with transaction.atomic():
+            WorkOrder.objects.create(
+                workspace=workspace, asset=asset, task=task, due=due
+            )
+
+    # A different due date is fine
+    other = WorkOrder.objects.create(
+        workspace=workspace, asset=asset, task=task, due=due + timedelta(days=30)
+    )
+    assert other.pk is not None
+
+
 @pytest.mark.django_db
 def test_activity_instance_can_be_created_without_workorder(workspace, user):
     asset = _create_asset(workspace)
@@ -0,0 +1,176 @@
+# work/tests/test_rollups.py
+
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.contrib import admin as dj_admin
+from django.core.management import CommandError, call_command
+
+from assets.models import Asset
+from work.admin import WorkOrderAdmin
+from work.generator import generate_for_workspace
+from work.models import ActivityInstance, MaintenanceTask, WorkOrder
+
+
+@pytest.fixture
+def task(workspace):
+    return MaintenanceTask.objects.create(
+        workspace=workspace, name="Patch OS", cadence="monthly"
+    )
+
+
+@pytest.fixture
+def asset(workspace):
+    return Asset.objects.create(workspace=workspace, name="Pi-001", kind="PI")
+
+
+def _order(asset, task, due, status="open"):
+    return WorkOrder.objects.create(
+        workspace=asset.workspace, asset=asset, task=task, due=due, status=status
+    )
+
+
+def _rollups(asset):
+    asset.refresh_from_db()
+    return asset.next_due_at, asset.open_workorder_count, asset.last_activity_at
+
+
+@pytest.mark.django_db
+def test_workorder_saves_and_deletes_keep_rollups_current(asset, task, now):
+    soon = _order(asset, task, now + timedelta(days=1))
+    later = _order(asset, task, now + timedelta(days=9))
+    _order(asset, task, now - timedelta(days=3), status="done")
+    assert _rollups(asset) == (soon.due, 2, None)
+
+    soon.status = "done"
+    soon.save()
+    assert _rollups(asset) == (later.due, 1, None)
+
+    later.delete()
+    assert _rollups(asset) == (None, 0, None)
+
+
+@pytest.mark.django_db
+def test_moving_a_workorder_refreshes_both_assets(workspace, asset, task, now):
+    other = Asset.objects.create(workspace=workspace, name="Pi-002", kind="PI")
+    order = _order(asset, task, now + timedelta(days=1))
+
+    order.asset = other
+    order.save()
+
+    assert _rollups(asset) == (None, 0, None)
+    assert _rollups(other) == (order.due, 1, None)
+
+
+@pytest.mark.django_db
+def test_activities_update_last_activity_at(workspace, asset, now):
+    for days in (5, 1, 3):
+        ActivityInstance.objects.create(
+            workspace=workspace,
+            asset=asset,
+            kind="patched",
+            occurred_at=now - timedelta(days=days),
+        )
+
+    assert _rollups(asset)[2] == now - timedelta(days=1)
+
+
+@pytest.mark.django_db
+def test_bulk_status_action_refreshes_rollups(asset, task, now):
+    _order(asset, task, now + timedelta(days=1))
+    _order(asset, task, now + timedelta(days=2))
+    ma = WorkOrderAdmin(WorkOrder, dj_admin.site)
+
+    ma.mark_done(request=None, queryset=WorkOrder.objects.all())
+
+    assert _rollups(asset) == (None, 0, None)
+
+
+@pytest.mark.django_db
+def test_status_action_and_rollups_stamp_updated(asset, task, now):
+    """queryset.update() skips auto_now; the admin action and rollups stamp it."""
+    order = _order(asset, task, now + timedelta(days=1))
+    before = now - timedelta(days=1)
+    WorkOrder.objects.update(updated=before)
+    Asset.objects.update(updated=before)
+    ma = WorkOrderAdmin(WorkOrder, dj_admin.site)
+
+    ma.mark_done(request=None, queryset=WorkOrder.objects.all())
+
+    order.refresh_from_db()
+    asset.refresh_from_db()
+    assert order.updated > before
+    assert asset.updated > before
+
+
+@pytest.mark.django_db
+def test_unchanged_rollups_keep_updated(asset, task, user, now):
+    """Saves that leave the rollups as they were do not reach the change feed."""
+    order = _order(asset, task, now + timedelta(days=1))
+    ActivityInstance.objects.create(
+        workspace=asset.workspace, asset=asset, kind="checked", occurred_at=now
+    )
+    before = now - timedelta(days=1)
+    Asset.objects.update(updated=before)
+
+    order.assigned_to = user
+    order.save()
+    # Older than the last activity.
+    ActivityInstance.objects.create(
+        workspace=asset.workspace,
+        asset=asset,
+        kind="checked",
+        occurred_at=now - timedelta(days=2),
+    )
+    asset.refresh_from_db()
+    assert asset.updated == before
+
+    order.delete()
+    asset.refresh_from_db()
+    assert asset.updated > before
+    assert _rollups(asset) == (None, 0, now)
+
+
+@pytest.mark.django_db
+def test_generator_refreshes_rollups(workspace, asset, task, now):
+    generate_for_workspace(workspace.id, now=now, horizon_days=70)
+
+    next_due, count, _ = _rollups(asset)
+    assert count == asset.workorders.count() >= 2
+    assert next_due == asset.workorders.order_by("due").first().due
+
+
+@pytest.mark.django_db
+def test_saving_a_stale_asset_keeps_rollups(asset, task, now):
+    stale = Asset.objects.get(pk=asset.pk)
+    order = _order(asset, task, now + timedelta(days=1))
+
+    stale.name = "Pi-001 (renamed)"
+    stale.save()
+
+    asset.refresh_from_db()
+    assert asset.name == "Pi-001 (renamed)"
+    assert _rollups(asset) == (order.due, 1, None)
+
+
+@pytest.mark.django_db
+def test_rebuild_command_fixes_drifted_rollups(
+    workspace, another_workspace, asset, task, now
+):
+    order = _order(asset, task, now + timedelta(days=1))
+    other = Asset.objects.create(workspace=another_workspace, name="x", kind="PI")
+    Asset.objects.update(open_workorder_count=42, next_due_at=None)
+    out = StringIO()
+
+    call_command("rebuild_asset_rollups", "--workspace", workspace.slug, stdout=out)
+
+    assert "Rebuilt rollups for 1 assets" in out.getvalue()
+    assert _rollups(asset) == (order.due, 1, None)
+    assert _rollups(other)[1] == 42
+
+    call_command("rebuild_asset_rollups", stdout=out)
+    assert _rollups(other)[1] == 0
+
+    with pytest.raises(CommandError):
+        call_command("rebuild_asset_rollups", "--workspace", "nope")
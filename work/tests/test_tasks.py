@@ -0,0 +1,300 @@
+# work/tests/test_tasks.py
+
+from datetime import date, datetime, timedelta
+
+import pytest
+from django.utils import timezone
+
+from assets.models import Asset
+from core.models import Workspace
+from work.generator import MODE_DIFF, MODE_UPSERT, generate_for_workspace
+from work.models import GenerationWatermark, MaintenanceTask, WorkOrder
+from work.tasks import _shards, generate_workorders
+
+
+def _aware(*args):
+    return timezone.make_aware(datetime(*args), timezone.get_current_timezone())
+
+
+@pytest.fixture
+def fixed_now():
+    # Wednesday, mid-morning local time
+    return _aware(2025, 1, 15, 10, 0)
+
+
+@pytest.fixture
+def fleet(workspace):
+    assets = [
+        Asset.objects.create(workspace=workspace, name=f"Pi-{i:03}", kind="PI")
+        for i in range(3)
+    ]
+    weekly = MaintenanceTask.objects.create(
+        workspace=workspace, name="Verify backups", cadence="weekly"
+    )
+    monthly = MaintenanceTask.objects.create(
+        workspace=workspace, name="Patch OS", cadence="monthly"
+    )
+    return assets, weekly, monthly
+
+
+# --- generate_for_workspace ------------------------------------------------
+
+
+@pytest.mark.django_db
+def test_generate_creates_every_task_asset_due_combination(workspace, fleet, fixed_now):
+    assets, weekly, monthly = fleet
+
+    counts = generate_for_workspace(workspace.id, now=fixed_now, horizon_days=30)
+
+    # 3 assets x (weekly: Jan 20, 27, Feb 3, 10 + monthly: Feb 1)
+    assert counts == {"created": 15, "skipped": 0}
+    assert WorkOrder.objects.filter(task=weekly).count() == 12
+    assert WorkOrder.objects.filter(task=monthly).count() == 3
+    assert set(WorkOrder.objects.values_list("status", flat=True)) == {"open"}
+    assert set(WorkOrder.objects.values_list("workspace_id", flat=True)) == {
+        workspace.id
+    }
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("mode", [MODE_DIFF, MODE_UPSERT])
+def test_generate_skips_existing_rows(workspace, fleet, fixed_now, mode):
+    assets, weekly, _ = fleet
+    WorkOrder.objects.create(
+        workspace=workspace,
+        asset=assets[0],
+        task=weekly,
+        due=_aware(2025, 1, 20),
+        status="done",
+    )
+
+    counts = generate_for_workspace(
+        workspace.id, now=fixed_now, horizon_days=30, mode=mode
+    )
+
+    assert counts == {"created": 14, "skipped": 1}
+    assert WorkOrder.objects.count() == 15
+
+    # Without watermarks (e.g. a concurrent worker) everything is found in place.
+    GenerationWatermark.objects.all().delete()
+    counts = generate_for_workspace(
+        workspace.id, now=fixed_now, horizon_days=30, mode=mode
+    )
+    assert counts == {"created": 0, "skipped": 15}
+    assert WorkOrder.objects.count() == 15
+
+
+@pytest.mark.django_db
+def test_diff_mode_uses_one_insert_per_chunk(
+    workspace, fleet, fixed_now, django_assert_num_queries
+):
+    # tasks + assets + watermarks + existing rows + 2 chunks of 10 and 5 rows
+    # + asset rollups + 1 chunk of 6 watermarks
+    with django_assert_num_queries(8):
+        counts = generate_for_workspace(
+            workspace.id, now=fixed_now, horizon_days=30, batch_size=10, mode=MODE_DIFF
+        )
+
+    assert counts["created"] == 15
+
+
+@pytest.mark.django_db
+def test_upsert_mode_does_not_read_existing_rows(
+    workspace, fleet, fixed_now, django_assert_num_queries
+):
+    generate_for_workspace(workspace.id, now=fixed_now, horizon_days=30)
+    GenerationWatermark.objects.all().delete()
+
+    # tasks + assets + watermarks + count before + 2 chunks + count after
+    # + watermarks
+    with django_assert_num_queries(8) as ctx:
+        counts = generate_for_workspace(
+            workspace.id,
+            now=fixed_now,
+            horizon_days=30,
+            batch_size=10,
+            mode=MODE_UPSERT,
+        )
+
+    assert counts == {"created": 0, "skipped": 15}
+    assert WorkOrder.objects.count() == 15
+    selects = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith("SELECT")]
+    # Only COUNTs hit the work-order table; no (task, asset, due) keys are read.
+    assert not any('"work_workorder"."task_id"' in sql for sql in selects)
+
+
+@pytest.mark.django_db
+def test_generate_records_watermark_per_task_and_asset(workspace, fleet, fixed_now):
+    generate_for_workspace(workspace.id, now=fixed_now, horizon_days=30)
+
+    horizon = fixed_now + timedelta(days=30)
+    assert GenerationWatermark.objects.count() == 6
+    assert set(
+        GenerationWatermark.objects.values_list("generated_through", flat=True)
+    ) == {horizon}
+
+
+@pytest.mark.django_db
+def test_generate_resumes_from_watermark(workspace, fleet, fixed_now):
+    assets, weekly, _ = fleet
+    generate_for_workspace(workspace.id, now=fixed_now, horizon_days=30)
+
+    # Rows behind the watermark are not looked at again: a work order removed
+    # from the already generated range is not recreated.
+    WorkOrder.objects.filter(
+        asset=assets[0], task=weekly, due=_aware(2025, 1, 20)
+    ).delete()
+
+    # A week later only the new week (Feb 17) is added for each asset.
+    counts = generate_for_workspace(
+        workspace.id, now=fixed_now + timedelta(days=7), horizon_days=30
+    )
+
+    assert counts == {"created": 3, "skipped": 0}
+    assert WorkOrder.objects.filter(due=_aware(2025, 2, 17)).count() == 3
+    assert not WorkOrder.objects.filter(
+        asset=assets[0], task=weekly, due=_aware(2025, 1, 20)
+    ).exists()
+    assert set(
+        GenerationWatermark.objects.values_list("generated_through", flat=True)
+    ) == {fixed_now + timedelta(days=37)}
+
+
+@pytest.mark.django_db
+def test_generate_picks_up_new_assets_from_now(workspace, fleet, fixed_now):
+    generate_for_workspace(workspace.id, now=fixed_now, horizon_days=30)
+    newcomer = Asset.objects.create(workspace=workspace, name="Pi-new", kind="PI")
+
+    counts = generate_for_workspace(workspace.id, now=fixed_now, horizon_days=30)
+
+    # Only the new asset has no watermark yet: 4 weekly + 1 monthly.
+    assert counts == {"created": 5, "skipped": 0}
+    assert newcomer.workorders.count() == 5
+
+
+@pytest.mark.django_db
+def test_generate_limits_run_to_asset_id_range(workspace, fleet, fixed_now):
+    assets, _, _ = fleet
+
+    counts = generate_for_workspace(
+        workspace.id,
+        now=fixed_now,
+        horizon_days=30,
+        asset_id_range=[assets[1].id, None],
+    )
+
+    assert counts == {"created": 10, "skipped": 0}
+    assert not assets[0].workorders.exists()
+    assert not GenerationWatermark.objects.filter(asset=assets[0]).exists()
+
+
+@pytest.mark.django_db
+def test_unknown_mode_is_rejected(workspace):
+    with pytest.raises(ValueError):
+        generate_for_workspace(workspace.id, mode="merge")
+
+
+@pytest.mark.django_db
+def test_generate_ignores_tasks_with_unknown_cadence(workspace, fleet, fixed_now):
+    MaintenanceTask.objects.create(
+        workspace=workspace, name="Someday", cadence="whenever"
+    )
+
+    counts = generate_for_workspace(workspace.id, now=fixed_now, horizon_days=30)
+
+    assert counts["created"] == 15
+
+
+@pytest.mark.django_db
+def test_generate_anchors_cadence_to_asset_dates(workspace, fleet, fixed_now):
+    assets, _, _ = fleet
+    MaintenanceTask.objects.all().delete()
+    task = MaintenanceTask.objects.create(
+        workspace=workspace,
+        name="Battery check",
+        cadence="FREQ=MONTHLY;INTERVAL=3;ANCHOR=PURCHASE_DATE",
+    )
+    Asset.objects.filter(pk=assets[0].pk).update(purchase_date=date(2024, 8, 20))
+    Asset.objects.filter(pk=assets[1].pk).update(purchase_date=date(2024, 9, 5))
+
+    counts = generate_for_workspace(workspace.id, now=fixed_now, horizon_days=60)
+
+    # assets[2] has no purchase date and counts from DTSTART (2000-01-03).
+    assert counts == {"created": 2, "skipped": 0}
+    assert dict(task.workorders.values_list("asset_id", "due")) == {
+        assets[0].id: _aware(2025, 2, 20),
+        assets[1].id: _aware(2025, 3, 5),
+    }
+    assert GenerationWatermark.objects.filter(task=task).count() == 3
+
+
+# --- generate_workorders task ----------------------------------------------
+
+
+@pytest.mark.django_db
+def test_generate_workorders_task_covers_all_workspaces(
+    workspace, another_workspace, fleet, monkeypatch, fixed_now
+):
+    monkeypatch.setattr("work.generator.timezone.now", lambda: fixed_now)
+    other_asset = Asset.objects.create(
+        workspace=another_workspace, name="Laptop", kind="LAP"
+    )
+    MaintenanceTask.objects.create(
+        workspace=another_workspace, name="Patch", cadence="monthly"
+    )
+
+    totals = generate_workorders.delay(horizon_days=30).get()
+
+    assert totals == {"workspaces": 2, "created": 16, "skipped": 0}
+    assert other_asset.workorders.count() == 1
+
+
+@pytest.mark.django_db
+def test_generate_workorders_task_single_workspace(
+    workspace, another_workspace, fleet, monkeypatch, fixed_now
+):
+    monkeypatch.setattr("work.generator.timezone.now", lambda: fixed_now)
+
+    totals = generate_workorders.delay(
+        workspace_id=another_workspace.id, horizon_days=30
+    ).get()
+
+    assert totals == {"workspaces": 1, "created": 0, "skipped": 0}
+    assert WorkOrder.objects.count() == 0
+
+
+@pytest.mark.django_db
+def test_generate_workorders_task_without_workspaces():
+    totals = generate_workorders.delay(workspace_id=404).get()
+
+    assert totals == {"workspaces": 0, "created": 0, "skipped": 0}
+
+
+@pytest.mark.django_db
+def test_large_workspaces_are_split_into_asset_id_ranges(
+    workspace, another_workspace, fleet
+):
+    assets, _, _ = fleet
+    Asset.objects.create(workspace=workspace, name="Pi-003", kind="PI")
+
+    shards = _shards(Workspace.objects.order_by("id"), shard_size=2)
+
+    assert shards == [
+        (workspace.id, [None, assets[2].id - 1]),
+        (workspace.id, [assets[2].id, None]),
+        (another_workspace.id, None),
+    ]
+
+
+@pytest.mark.django_db
+def test_generate_workorders_task_aggregates_shards(
+    workspace, fleet, monkeypatch, fixed_now, settings
+):
+    monkeypatch.setattr("work.generator.timezone.now", lambda: fixed_now)
+    settings.WORKORDER_SHARD_SIZE = 1
+
+    totals = generate_workorders.delay(horizon_days=30).get()
+
+    # Three single-asset subtasks, one workspace.
+    assert totals == {"workspaces": 1, "created": 15, "skipped": 0}
+    assert WorkOrder.objects.count() == 15